@@ -0,0 +1,47 @@
+"""Record real Stats API payloads for one season into `fixtures/` for the benchmarks.
+
+    uv run python -m benchmarks.record --season 2024
+
+Writes `teams_<season>.json.gz`, `seasons_<season>.json.gz` and
+`schedule_<season>.json.gz`; `replay.Replay` serves them instead of synthetic
+payloads when that season is requested. Full-season recordings are a few MB,
+so only commit the ones a baseline depends on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+
+from benchmarks.replay import recorded_path
+from cityscape.integrations.http import HttpClient
+from cityscape.integrations.mlb.statsapi import ENDPOINTS, MLB_STATSAPI_BASE_URL
+
+
+def record(season: int, *, game_types: str = "R") -> None:
+    params = {
+        "teams": {"sportId": 1, "season": season},
+        "seasons": {"sportId": 1, "season": season},
+        "schedule": {"sportId": 1, "season": season, "gameTypes": game_types},
+    }
+    with HttpClient(base_url=MLB_STATSAPI_BASE_URL) as http:
+        for endpoint, endpoint_params in params.items():
+            payload = http.get_json(ENDPOINTS[endpoint], params=endpoint_params)
+            path = recorded_path(endpoint, season)
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            print(f"recorded {endpoint} season={season} -> {path}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.record", description=__doc__.splitlines()[0])
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--game-types", default="R")
+    args = parser.parse_args(argv)
+    record(args.season, game_types=args.game_types)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
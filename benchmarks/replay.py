@@ -0,0 +1,190 @@
+"""Offline stand-in for the MLB Stats API used by the benchmarks.
+
+Serves recorded payloads from `fixtures/` (see `record.py`) when present for the
+requested season, otherwise synthetic payloads built from the committed
+`*_sample.json` fixtures (real response shapes, trimmed to a few objects). A
+synthetic season has `SEASON_GAMES * scale` games spread over the regular season.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from cityscape.integrations.http import HttpClient
+from cityscape.integrations.mlb.statsapi import ENDPOINTS, MLB_STATSAPI_BASE_URL
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# 30 clubs x 162 games / 2.
+SEASON_GAMES = 2430
+TEAM_IDS: tuple[int, ...] = tuple(range(108, 138))
+
+_PK = '"__PK__"'
+_AWAY = '"__AWAY__"'
+_HOME = '"__HOME__"'
+
+
+def load_fixture(name: str) -> dict[str, Any]:
+    path = FIXTURES / name
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def recorded_path(endpoint: str, season: int) -> Path:
+    return FIXTURES / f"{endpoint}_{season}.json.gz"
+
+
+def _game_templates() -> list[str]:
+    """Sample games as JSON text with placeholders for the fields that vary per game."""
+
+    templates = []
+    sample = load_fixture("schedule_sample.json")
+    for day in sample["dates"]:
+        for game in day["games"]:
+            game = json.loads(json.dumps(game))
+            game["gamePk"] = "__PK__"
+            game["gameGuid"] = "__GUID__"
+            game["link"] = "/api/v1.1/game/__PKTEXT__/feed/live"
+            game["content"]["link"] = "/api/v1/game/__PKTEXT__/content"
+            game["calendarEventID"] = "__EVENT__"
+            game["season"] = game["seasonDisplay"] = "__SEASON__"
+            game["officialDate"] = "__DATE__"
+            game["gameDate"] = "__DATE__T23:05:00Z"
+            game["teams"]["away"]["team"]["id"] = "__AWAY__"
+            game["teams"]["home"]["team"]["id"] = "__HOME__"
+            templates.append(json.dumps(game, separators=(",", ":")))
+    return templates
+
+
+class Replay:
+    """httpx handler answering teams/seasons/schedule requests for any season.
+
+    `prerender=True` keeps rendered response bodies so repeated requests cost
+    only a dict lookup (use it when the server side must stay out of a timing).
+    """
+
+    def __init__(self, *, scale: float = 1.0, prerender: bool = False) -> None:
+        self.scale = scale
+        self.prerender = prerender
+        self._templates = _game_templates()
+        self._bodies: dict[tuple[str, tuple[tuple[str, str], ...]], bytes] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def client(self, **kwargs: Any) -> HttpClient:
+        return HttpClient(
+            base_url=MLB_STATSAPI_BASE_URL,
+            transport=httpx.MockTransport(self.handler),
+            **kwargs,
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/api/", 1)[-1]
+        endpoint = next((name for name, p in ENDPOINTS.items() if p == path), None)
+        if endpoint is None:
+            return httpx.Response(404)
+        params = dict(request.url.params)
+        with self._lock:
+            self.requests += 1
+        key = (endpoint, tuple(sorted(params.items())))
+        body = self._bodies.get(key)
+        if body is None:
+            body = self.render(endpoint, params)
+            if self.prerender:
+                self._bodies[key] = body
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    def render(self, endpoint: str, params: dict[str, str]) -> bytes:
+        season = int(params.get("season") or params.get("seasonId") or 2024)
+        recorded = recorded_path(endpoint, season)
+        if recorded.exists():
+            payload = load_fixture(recorded.name)
+            if endpoint == "schedule":
+                payload = _filter_dates(payload, params.get("startDate"), params.get("endDate"))
+            return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        if endpoint == "teams":
+            return json.dumps(self.teams(season), separators=(",", ":")).encode("utf-8")
+        if endpoint == "seasons":
+            return json.dumps(self.seasons(season), separators=(",", ":")).encode("utf-8")
+        return self.schedule(season, params.get("startDate"), params.get("endDate"))
+
+    def seasons(self, season: int) -> dict[str, Any]:
+        payload = load_fixture("seasons_sample.json")
+        entry = payload["seasons"][0]
+        for k, v in list(entry.items()):
+            if isinstance(v, str) and v[:4].isdigit() and len(v) == 10:
+                entry[k] = f"{season}{v[4:]}"
+        entry["seasonId"] = str(season)
+        return payload
+
+    def teams(self, season: int) -> dict[str, Any]:
+        payload = load_fixture("teams_sample.json")
+        samples = payload["teams"]
+        teams = []
+        for i, team_id in enumerate(TEAM_IDS):
+            team = json.loads(json.dumps(samples[i % len(samples)]))
+            team["id"] = team_id
+            team["season"] = season
+            team["name"] = f"Team {team_id}"
+            team["abbreviation"] = f"T{team_id}"
+            teams.append(team)
+        payload["teams"] = teams
+        return payload
+
+    def season_dates(self, season: int) -> list[date]:
+        bounds = self.seasons(season)["seasons"][0]
+        start = date.fromisoformat(bounds["regularSeasonStartDate"])
+        end = date.fromisoformat(bounds["regularSeasonEndDate"])
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    def schedule(self, season: int, start: str | None = None, end: str | None = None) -> bytes:
+        days = self.season_dates(season)
+        total = int(SEASON_GAMES * self.scale)
+        lo = date.fromisoformat(start) if start else days[0]
+        hi = date.fromisoformat(end) if end else days[-1]
+
+        # Spread `total` games evenly: day d gets games ceil(d*total/n) .. ceil((d+1)*total/n) - 1.
+        parts = []
+        n_days = len(days)
+        for d_idx, day in enumerate(days):
+            if not lo <= day <= hi:
+                continue
+            first = -(-d_idx * total // n_days)
+            last = -(-(d_idx + 1) * total // n_days)
+            games = [self._game(season, i, day.isoformat()) for i in range(first, last)]
+            parts.append(
+                f'{{"date":"{day.isoformat()}","totalGames":{len(games)},"games":[{",".join(games)}],"events":[]}}'
+            )
+        return f'{{"copyright":"synthetic","dates":[{",".join(parts)}]}}'.encode()
+
+    def _game(self, season: int, i: int, day: str) -> str:
+        pk = season * 1_000_000 + i
+        away = TEAM_IDS[i % len(TEAM_IDS)]
+        home = TEAM_IDS[(i * 7 + 1) % len(TEAM_IDS)]
+        return (
+            self._templates[i % len(self._templates)]
+            .replace(_PK, str(pk))
+            .replace("__PKTEXT__", str(pk))
+            .replace("__GUID__", f"00000000-0000-4000-8000-{pk:012d}")
+            .replace("__EVENT__", f"14-{pk}-{day}")
+            .replace("__SEASON__", str(season))
+            .replace("__DATE__", day)
+            .replace(_AWAY, str(away))
+            .replace(_HOME, str(home))
+        )
+
+
+def _filter_dates(payload: dict[str, Any], start: str | None, end: str | None) -> dict[str, Any]:
+    if not start and not end:
+        return payload
+    lo, hi = start or "0000-00-00", end or "9999-99-99"
+    return {**payload, "dates": [d for d in payload.get("dates", []) if lo <= d["date"] <= hi]}
@@ -0,0 +1,373 @@
+"""Offline benchmarks for the MLB ingest hot paths.
+
+    uv run python -m benchmarks.run                  # run and compare with baseline.json
+    uv run python -m benchmarks.run --save-baseline  # record new baseline numbers
+    uv run python -m benchmarks.run --scales 1,10 --no-db
+
+Every benchmark reports a rate (higher is better) as the best of `--repeat` runs.
+A result more than `--tolerance` below its baseline is a regression and makes the
+run exit with status 1.
+
+Database benchmarks use the Postgres settings the ingest uses (POSTGRES_* / DBT_*),
+write synthetic seasons 9001+ into the raw tables and drop those partitions
+afterwards; they are skipped when Postgres is unreachable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from benchmarks.replay import SEASON_GAMES, Replay
+from cityscape.automations.ingest import mlb as ingest
+from cityscape.integrations.mlb import statsapi
+from cityscape.integrations.mlb.batches import GameBatch
+from cityscape.integrations.mlb.schedule import game_fields
+from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.utils.db import (
+    MLB_GAMES,
+    MLB_RAW_TARGETS,
+    connect,
+    ensure_mlb_season_partitions,
+    forget_mlb_storage,
+    upsert_columns,
+    upsert_mlb_games,
+)
+from cityscape.utils.partitions import partition_name
+from cityscape.utils.payloads import loads_json
+
+BASELINE = Path(__file__).parent / "baseline.json"
+BENCH_SEASON = 9001
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    rate: float
+    unit: str
+    items: int
+    seconds: float
+
+
+def _best_of(repeat: int, run: Callable[[], int]) -> tuple[int, float]:
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = run()
+        best = min(best, time.perf_counter() - started)
+    return items, best
+
+
+def _result(name: str, unit: str, items: int, seconds: float) -> Result:
+    return Result(
+        name=name,
+        rate=items / seconds if seconds > 0 else 0.0,
+        unit=unit,
+        items=items,
+        seconds=seconds,
+    )
+
+
+# parsing
+
+
+def bench_list_games(scale: float, repeat: int) -> Result:
+    """One schedule request, body pre-rendered: JSON decode + parse + dedupe."""
+
+    replay = Replay(scale=scale, prerender=True)
+    api = MlbStatsApi(http=replay.client())
+    api.list_games(season=2024)  # warm the rendered body
+
+    items, seconds = _best_of(repeat, lambda: len(api.list_games(season=2024)))
+    return _result(f"list_games[{scale:g}x]", "games/s", items, seconds)
+
+
+def bench_schedule_parse(scale: float, repeat: int) -> list[Result]:
+    """A season's schedule response: decoding its bytes, then extracting each game's fields."""
+
+    body = Replay(scale=scale).schedule(2024)
+    games = [g for d in loads_json(body)["dates"] for g in d["games"]]
+
+    def fields() -> int:
+        for g in games:
+            game_fields(g)
+        return len(games)
+
+    _, decode_s = _best_of(repeat, lambda: loads_json(body))
+    items, fields_s = _best_of(repeat, fields)
+    return [
+        _result(f"schedule_decode[{scale:g}x]", "games/s", len(games), decode_s),
+        _result(f"schedule_fields[{scale:g}x]", "games/s", items, fields_s),
+    ]
+
+
+def bench_iter_games(scale: float, repeat: int) -> Result:
+    """Streaming parse of month windows, fetched 4 at a time (stand-in render cost included)."""
+
+    replay = Replay(scale=scale)
+    api = MlbStatsApi(http=replay.client())
+
+    def run() -> int:
+        return sum(1 for _ in api.iter_games(season=2024, window="month", max_concurrency=4))
+
+    items, seconds = _best_of(repeat, run)
+    return _result(f"iter_games[{scale:g}x]", "games/s", items, seconds)
+
+
+def bench_game_batches(scale: float, repeat: int) -> list[Result]:
+    """Parsed schedule as rows (`MlbGame` + row dict) vs columnar `GameBatch`es.
+
+    Throughput covers decode, parse and building what the writer consumes;
+    memory is what a whole season of it keeps alive (reported as games/MiB).
+    """
+
+    replay = Replay(scale=scale, prerender=True)
+    api = MlbStatsApi(http=replay.client())
+    api.list_games(season=2024)  # warm the rendered body
+
+    def rows() -> list[dict[str, Any]]:
+        return [ingest.game_row(g) for g in api.iter_games(season=2024)]
+
+    def batches() -> list[GameBatch]:
+        built = list(api.iter_game_batches(season=2024))
+        for batch in built:
+            batch.columns()
+        return built
+
+    def count_batches(built: list[GameBatch]) -> int:
+        return sum(len(b) for b in built)
+
+    results = []
+    for name, build, count in (("game_rows", rows, len), ("game_batches", batches, count_batches)):
+        items, seconds = _best_of(repeat, lambda build=build, count=count: count(build()))
+        results.append(_result(f"{name}[{scale:g}x]", "games/s", items, seconds))
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            built = build()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        games = count(built)
+        del built
+        results.append(
+            Result(
+                name=f"{name}_memory[{scale:g}x]",
+                rate=games / (retained / 2**20),
+                unit="games/MiB",
+                items=games,
+                seconds=0.0,
+            )
+        )
+    return results
+
+
+# database
+
+
+def _drop_bench_partitions(conn, seasons: range) -> None:
+    with conn.cursor() as cur:
+        for season in seasons:
+            for target in MLB_RAW_TARGETS:
+                cur.execute(f"drop table if exists {partition_name(target.table, season)}")
+    conn.commit()
+    forget_mlb_storage()
+
+
+@contextmanager
+def _bench_seasons(conn, seasons: range) -> Iterator[None]:
+    ingest.prepare_mlb_seasons(seasons)
+    try:
+        yield
+    finally:
+        conn.rollback()
+        _drop_bench_partitions(conn, seasons)
+
+
+def bench_upsert(conn, season: int, scale: float, repeat: int) -> list[Result]:
+    """Upsert rows/s per load method, from row dicts and from `GameBatch` columns.
+
+    Each is timed into an empty partition, then again with unchanged rows.
+    """
+
+    api = MlbStatsApi(http=Replay(scale=scale).client())
+    rows = [ingest.game_row(g) for g in api.iter_games(season=season)]
+    (batch,) = api.iter_game_batches(season=season, batch_size=len(rows))
+    columns = batch.columns()
+
+    results = []
+    for method in ("batch", "copy"):
+        best = float("inf")
+        for _ in range(repeat):
+            # A fresh partition per run; its set-up stays out of the timing.
+            _drop_bench_partitions(conn, range(season, season + 1))
+            ensure_mlb_season_partitions(conn, season)
+            conn.commit()
+            started = time.perf_counter()
+            upsert_mlb_games(conn, rows, method=method)
+            conn.commit()
+            best = min(best, time.perf_counter() - started)
+        results.append(_result(f"upsert_mlb_games[{method},insert]", "rows/s", len(rows), best))
+
+        def unchanged(method: str = method) -> int:
+            counts = upsert_mlb_games(conn, rows, method=method)
+            conn.commit()
+            return counts.total
+
+        items, seconds = _best_of(repeat, unchanged)
+        results.append(_result(f"upsert_mlb_games[{method},unchanged]", "rows/s", items, seconds))
+
+        best = float("inf")
+        for _ in range(repeat):
+            _drop_bench_partitions(conn, range(season, season + 1))
+            ensure_mlb_season_partitions(conn, season)
+            conn.commit()
+            started = time.perf_counter()
+            upsert_columns(conn, MLB_GAMES, columns, method=method)
+            conn.commit()
+            best = min(best, time.perf_counter() - started)
+        results.append(_result(f"upsert_columns[{method},insert]", "rows/s", len(rows), best))
+
+        def unchanged_columns(method: str = method) -> int:
+            counts = upsert_columns(conn, MLB_GAMES, columns, method=method)
+            conn.commit()
+            return counts.total
+
+        items, seconds = _best_of(repeat, unchanged_columns)
+        results.append(_result(f"upsert_columns[{method},unchanged]", "rows/s", items, seconds))
+    return results
+
+
+def bench_ingest(season: int, scale: float, repeat: int) -> Result:
+    """ingest_mlb_season end to end against the stand-in API (COPY load, no response cache)."""
+
+    replay = Replay(scale=scale)
+    client = replay.client()
+    with (
+        mock.patch.object(statsapi, "_shared_http_client", lambda: client),
+        mock.patch.object(ingest, "default_response_cache", lambda: None),
+        mock.patch.object(ingest, "publish_metrics", lambda result: None),
+    ):
+        items, seconds = _best_of(
+            repeat,
+            lambda: ingest.ingest_mlb_season(season=season, load_method="copy").games.total,
+        )
+    return _result(f"ingest_mlb_season[{scale:g}x]", "games/s", items, seconds)
+
+
+# baseline
+
+
+def compare(results: list[Result], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Print results next to the baseline; return the names that regressed."""
+
+    known = baseline.get("results", {})
+    regressions = []
+    print(f"{'benchmark':<36} {'rate':>14} {'baseline':>14} {'change':>8}")
+    for r in results:
+        base = known.get(r.name)
+        if base:
+            change = r.rate / base - 1
+            flag = ""
+            if change < -tolerance:
+                flag = "  REGRESSION"
+                regressions.append(r.name)
+            rates = f"{r.rate:>10.0f} {r.unit:<3} {base:>10.0f} {r.unit:<3}"
+            print(f"{r.name:<36} {rates} {change:>+7.0%}{flag}")
+        else:
+            print(f"{r.name:<36} {r.rate:>10.0f} {r.unit:<3} {'(new)':>14}")
+    return regressions
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default="1,10,100",
+        help="Synthetic season sizes for parsing (default: 1,10,100)",
+    )
+    parser.add_argument(
+        "--db-scale", type=float, default=1, help="Season size for database benchmarks (default: 1)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per benchmark; the best counts (default: 3)"
+    )
+    parser.add_argument("--no-db", action="store_true", help="Skip benchmarks that need Postgres")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write results as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (default: 0.25)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    scales = [float(s) for s in args.scales.split(",") if s]
+
+    results: list[Result] = []
+    for scale in scales:
+        if scale <= 10:
+            results.append(bench_list_games(scale, args.repeat))
+            results += bench_schedule_parse(scale, args.repeat)
+            results += bench_game_batches(scale, args.repeat)
+        results.append(bench_iter_games(scale, args.repeat))
+
+    if not args.no_db:
+        seasons = range(BENCH_SEASON, BENCH_SEASON + 2)
+        try:
+            conn = connect(ingest._postgres_config())
+        except Exception as exc:
+            print(f"skipping database benchmarks: {exc!r}", file=sys.stderr)
+        else:
+            with conn, _bench_seasons(conn, seasons):
+                results += bench_upsert(conn, seasons[0], args.db_scale, args.repeat)
+                results.append(bench_ingest(seasons[1], args.db_scale, args.repeat))
+            conn.close()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "processor": platform.processor() or platform.machine(),
+                    },
+                    "season_games": SEASON_GAMES,
+                    "results": {r.name: round(r.rate, 1) for r in results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        names = ", ".join(regressions)
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {names}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+{#
+  Incremental filter on the raw `loaded_at` watermark, kept per season.
+
+  On incremental runs, keeps rows loaded after the newest `loaded_at` already in
+  the target ({{ this }}) for the same season, minus `incremental_lookback_minutes`
+  (default 60). `loaded_at` is set to now() at ingest, which is the *start* of the
+  writing transaction, so rows committed by a long transaction can carry a
+  timestamp older than the previous run's watermark. The lookback re-reads that
+  window, and the merge on the unique key makes the re-read idempotent.
+
+  The watermark is per season so that a run scoped to some seasons (see
+  `season_scope`) does not move it past rows of other seasons that were loaded
+  but not transformed yet. The model joins the watermarks once with
+  `season_watermarks`, which `loaded_at_watermark` then compares against:
+
+    from {{ ref('int_mlb__games_enriched') }} as i
+    {{ season_watermarks('i.season') }}
+    where {{ loaded_at_watermark('i.loaded_at') }}
+
+  On full refreshes (`dbt run --full-refresh` / `make dbt-full-refresh`) and first
+  builds, every row passes and no join is added.
+#}
+{% macro season_watermarks(season_column, alias='w') -%}
+  {%- if is_incremental() -%}
+    left join (
+      select
+        season,
+        {{ dbt.dateadd('minute', -1 * var('incremental_lookback_minutes', 60), 'max(loaded_at)') }} as watermark
+      from {{ this }}
+      group by season
+    ) as {{ alias }}
+      on {{ alias }}.season = {{ season_column }}
+  {%- endif -%}
+{%- endmacro %}
+
+{% macro loaded_at_watermark(column, watermarks='w') -%}
+  {%- if is_incremental() -%}
+    ({{ column }} > {{ watermarks }}.watermark or {{ watermarks }}.watermark is null)
+  {%- else -%}
+    1 = 1
+  {%- endif -%}
+{%- endmacro %}
+
+{#
+  Incremental filter on the seasons an ingest changed.
+
+  `dbt build --vars '{"seasons": [2026]}'` limits an incremental run to those
+  seasons, so Postgres only scans their raw partitions; rows of other seasons
+  in the target are left as they are. Without the var, and on full refreshes
+  and first builds (which must see every season), every row passes.
+#}
+{% macro season_scope(season_column) -%}
+  {%- set seasons = var('seasons', []) -%}
+  {%- if is_incremental() and seasons -%}
+    {{ season_column }} in ({{ seasons | map('int') | join(', ') }})
+  {%- else -%}
+    1 = 1
+  {%- endif -%}
+{%- endmacro %}
@@ -1,10 +1,24 @@
-{{ config(tags=["core", "mlb"]) }}
+{{
+  config(
+    materialized="incremental",
+    unique_key=["game_id", "season"],
+    incremental_strategy="merge",
+    on_schema_change="append_new_columns",
+    indexes=[{"columns": ["loaded_at"]}, {"columns": ["season", "game_date"]}],
+    tags=["core", "mlb"],
+  )
+}}
 
 select
-  game_id,
-  game_date,
-  home_team_id,
-  home_team_name,
-  away_team_id,
-  away_team_name
-from {{ ref('int_mlb__games_enriched') }}
+  i.game_id,
+  i.season,
+  i.game_date,
+  i.home_team_id,
+  i.home_team_name,
+  i.away_team_id,
+  i.away_team_name,
+  i.loaded_at
+from {{ ref('int_mlb__games_enriched') }} as i
+{{ season_watermarks('i.season') }}
+where {{ loaded_at_watermark('i.loaded_at') }}
+  and {{ season_scope('i.season') }}
@@ -1,14 +1,39 @@
-{{ config(tags=["int", "nba"]) }}
+{{
+  config(
+    materialized="incremental",
+    unique_key=["game_id", "season"],
+    incremental_strategy="merge",
+    on_schema_change="append_new_columns",
+    tags=["int", "nba"],
+  )
+}}
 
+-- A game is re-merged when the game row or either team row was reloaded.
 select
   g.game_id,
+  g.season,
   g.game_date,
   g.home_team_id,
   ht.team_name as home_team_name,
   g.away_team_id,
-  at.team_name as away_team_name
+  at.team_name as away_team_name,
+  case
+    when ht.loaded_at > g.loaded_at and ht.loaded_at >= coalesce(at.loaded_at, ht.loaded_at) then ht.loaded_at
+    when at.loaded_at > g.loaded_at then at.loaded_at
+    else g.loaded_at
+  end as loaded_at
 from {{ ref('stg_nba__games') }} as g
 left join {{ ref('stg_nba__teams') }} as ht
   on g.home_team_id = ht.team_id
+  and g.season = ht.season
 left join {{ ref('stg_nba__teams') }} as at
   on g.away_team_id = at.team_id
+  and g.season = at.season
+{{ season_watermarks('g.season') }}
+where
+  (
+    {{ loaded_at_watermark('g.loaded_at') }}
+    or {{ loaded_at_watermark('ht.loaded_at') }}
+    or {{ loaded_at_watermark('at.loaded_at') }}
+  )
+  and {{ season_scope('g.season') }}
@@ -9,5 +9,6 @@ select
   cast(home_team_id as varchar) as home_team_id,
   cast(away_team_id as varchar) as away_team_id,
   cast(home_score as integer) as home_score,
-  cast(away_score as integer) as away_score
+  cast(away_score as integer) as away_score,
+  cast(loaded_at as timestamp) as loaded_at
 from {{ source('raw', 'mlb_games') }}
@@ -6,5 +6,6 @@ select
   cast(team_name as varchar) as team_name,
   cast(team_abbr as varchar) as team_abbr,
   cast(league_id as integer) as league_id,
-  cast(division_id as integer) as division_id
+  cast(division_id as integer) as division_id,
+  cast(loaded_at as timestamp) as loaded_at
 from {{ source('raw', 'mlb_teams') }}
@@ -5,9 +5,13 @@
 -- - avoid SELECT * in curated layers
 
 select
-  cast(null as varchar) as game_id,
-  cast(null as date) as game_date,
-  cast(null as varchar) as home_team_id,
-  cast(null as varchar) as away_team_id
+  cast(game_id as varchar) as game_id,
+  cast(season as integer) as season,
+  cast(game_date as date) as game_date,
+  cast(status as varchar) as status,
+  cast(home_team_id as varchar) as home_team_id,
+  cast(away_team_id as varchar) as away_team_id,
+  cast(home_score as integer) as home_score,
+  cast(away_score as integer) as away_score,
+  cast(loaded_at as timestamp) as loaded_at
 from {{ source('raw', 'nba_games') }}
-where 1 = 0
@@ -1,8 +1,10 @@
 {{ config(tags=["stg", "nba"]) }}
 
 select
-  cast(null as varchar) as team_id,
-  cast(null as varchar) as team_name,
-  cast(null as varchar) as team_abbr
+  cast(team_id as varchar) as team_id,
+  cast(season as integer) as season,
+  cast(team_name as varchar) as team_name,
+  cast(team_abbr as varchar) as team_abbr,
+  cast(conference as varchar) as conference,
+  cast(loaded_at as timestamp) as loaded_at
 from {{ source('raw', 'nba_teams') }}
-where 1 = 0
@@ -2,7 +2,9 @@
 
 select
   cast(null as varchar) as team_id,
+  cast(null as integer) as season,
   cast(null as varchar) as team_name,
-  cast(null as varchar) as team_abbr
+  cast(null as varchar) as team_abbr,
+  cast(null as timestamp) as loaded_at
 from {{ source('raw', 'nfl_teams') }}
 where 1 = 0
@@ -2,8 +2,10 @@
 
 select
   cast(null as varchar) as game_id,
+  cast(null as integer) as season,
   cast(null as date) as game_date,
   cast(null as varchar) as home_team_id,
-  cast(null as varchar) as away_team_id
+  cast(null as varchar) as away_team_id,
+  cast(null as timestamp) as loaded_at
 from {{ source('raw', 'nhl_games') }}
 where 1 = 0
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import itertools
+import json
+import shutil
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from psycopg2 import sql
+
+from cityscape.utils.db import get_pool, postgres_config
+from cityscape.utils.logger import get_run_logger
+from cityscape.utils.partitions import split_table
+
+# Parquet codecs offered by `cityscape export`; "none" writes uncompressed pages.
+Compression = Literal["zstd", "snappy", "gzip", "none"]
+COMPRESSIONS: tuple[str, ...] = ("zstd", "snappy", "gzip", "none")
+
+# `schema.*` exports every table and view of that schema (partitions excluded).
+DEFAULT_TABLES: tuple[str, ...] = ("raw.mlb_games", "core.*")
+
+# Rows per fetch from the server-side cursor, and per Parquet row group.
+CHUNK_ROWS = 50_000
+
+# Incremental watermarks, one per exported table, at the root of the output directory.
+STATE_FILE = "_export_state.json"
+
+# Postgres types with a direct Arrow counterpart; anything else (json/jsonb,
+# numeric, uuid, arrays, ...) is exported as its text form.
+_ARROW_TYPES: dict[str, str] = {
+    "bool": "bool_",
+    "int2": "int16",
+    "int4": "int32",
+    "int8": "int64",
+    "float4": "float32",
+    "float8": "float64",
+    "date": "date32",
+    "text": "string",
+    "varchar": "string",
+    "bpchar": "string",
+    "bytea": "binary",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TableExport:
+    """What one table's export wrote."""
+
+    table: str
+    rows: int
+    files: int
+    seasons: tuple[int, ...]
+    incremental: bool
+    watermark: str | None
+    seconds: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "files": self.files,
+            "seasons": list(self.seasons),
+            "incremental": self.incremental,
+            "watermark": self.watermark,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet export needs pyarrow; install the `export` extra (uv sync --extra export)"
+        ) from exc
+    return pa, pq
+
+
+def resolve_tables(conn, specs: Iterable[str]) -> list[str]:
+    """Expand `schema.*` specs and check the named tables exist; keeps first-seen order."""
+
+    out: list[str] = []
+    with conn.cursor() as cur:
+        for spec in specs:
+            schema, name = split_table(spec)
+            if name == "*":
+                cur.execute(
+                    """
+                    select n.nspname || '.' || c.relname
+                    from pg_class c
+                    join pg_namespace n on n.oid = c.relnamespace
+                    where n.nspname = %s
+                      and c.relkind in ('r', 'p', 'v', 'm')
+                      and not c.relispartition
+                    order by c.relname
+                    """,
+                    (schema,),
+                )
+                found = [r[0] for r in cur.fetchall()]
+            else:
+                cur.execute("select to_regclass(%s) is not null", (f"{schema}.{name}",))
+                found = [f"{schema}.{name}"] if cur.fetchone()[0] else []
+            if not found:
+                raise ValueError(f"No table matches {spec!r}")
+            out += [t for t in found if t not in out]
+    return out
+
+
+def _columns(cur, table: str) -> list[tuple[str, str]]:
+    """(column name, Postgres type name) of `table`, in table order."""
+
+    cur.execute(
+        """
+        select a.attname, t.typname
+        from pg_attribute a
+        join pg_type t on t.oid = a.atttypid
+        where a.attrelid = to_regclass(%s) and a.attnum > 0 and not a.attisdropped
+        order by a.attnum
+        """,
+        (table,),
+    )
+    return cur.fetchall()
+
+
+def _arrow_type(pa: Any, pg_type: str) -> Any:
+    if pg_type == "timestamptz":
+        return pa.timestamp("us", tz="UTC")
+    if pg_type == "timestamp":
+        return pa.timestamp("us")
+    return getattr(pa, _ARROW_TYPES.get(pg_type, "string"))()
+
+
+def _select_list(columns: list[tuple[str, str]]) -> sql.Composable:
+    items = []
+    for name, pg_type in columns:
+        ident = sql.Identifier(name)
+        if pg_type in _ARROW_TYPES or pg_type in ("timestamp", "timestamptz"):
+            items.append(ident)
+        else:
+            items.append(sql.SQL("cast({} as text) as {}").format(ident, ident))
+    return sql.SQL(", ").join(items)
+
+
+def _horizon(cur) -> datetime:
+    """Upper `loaded_at` bound that no uncommitted write can fall below.
+
+    Ingest writes stamp `loaded_at = now()`, the start of the writing
+    transaction, so rows still being written carry a `loaded_at` no earlier
+    than the oldest open transaction. Exporting only rows below that (and
+    starting the next incremental export there) neither misses nor repeats a
+    row. Sessions of other roles are only visible to roles with
+    pg_read_all_stats.
+    """
+
+    cur.execute(
+        """
+        select least(now(), min(xact_start))
+        from pg_stat_activity
+        where datname = current_database()
+          and pid <> pg_backend_pid()
+          and xact_start is not null
+        """
+    )
+    return cur.fetchone()[0]
+
+
+def load_state(out_dir: Path) -> dict[str, dict[str, Any]]:
+    path = out_dir / STATE_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(out_dir: Path, state: dict[str, dict[str, Any]]) -> None:
+    path = out_dir / STATE_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+    tmp.replace(path)
+
+
+def _state_key(table: str, seasons: tuple[int, ...]) -> str:
+    return f"{table}[{','.join(map(str, seasons))}]" if seasons else table
+
+
+def _replace_dir(src: Path, dest: Path) -> None:
+    """Move `src` to `dest`, replacing whatever was there."""
+
+    old = dest.with_name(f".{dest.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if dest.exists():
+        dest.rename(old)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    src.rename(dest)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def export_table(
+    conn,
+    table: str,
+    out_dir: Path,
+    *,
+    seasons: Iterable[int] = (),
+    incremental: bool = False,
+    state: dict[str, dict[str, Any]] | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+    compression: Compression = "zstd",
+) -> TableExport:
+    """Stream `table` into Parquet files under `out_dir/<schema>/<table>/`.
+
+    Rows are read through a server-side cursor `chunk_rows` at a time, and
+    each chunk becomes one row group, so memory stays bounded whatever the
+    table size. Tables with a `season` column are written as a Hive-style
+    dataset (`season=2024/part-*.parquet`), one file per season per run.
+
+    A full export replaces the table's files (or, with `seasons`, those
+    seasons' directories) once it has finished. An incremental export appends
+    new files holding only the rows whose `loaded_at` moved past the watermark
+    recorded in `state` by the previous export; rows updated since then appear
+    again, so readers dedupe on the key by latest `loaded_at`. `state` is
+    updated in place.
+    """
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; expected one of {COMPRESSIONS}")
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be >= 1, got {chunk_rows}")
+
+    pa, pq = _pyarrow()
+    logger = get_run_logger()
+    started = time.perf_counter()
+    state = state if state is not None else {}
+    seasons = tuple(sorted(set(seasons)))
+    schema_name, name = split_table(table)
+    table_dir = out_dir / schema_name / name
+    run_id = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+
+    # One read-only snapshot per table: the watermark and the rows agree.
+    conn.set_session(readonly=True, isolation_level="REPEATABLE READ")
+    try:
+        with conn.cursor() as cur:
+            columns = _columns(cur, table)
+            names = [c for c, _ in columns]
+            has_season = "season" in names
+            has_loaded_at = "loaded_at" in names
+            horizon = _horizon(cur) if has_loaded_at else None
+
+        key = _state_key(table, seasons)
+        since = state.get(key, {}).get("loaded_at") if incremental and has_loaded_at else None
+        if incremental and not has_loaded_at:
+            logger.warning(f"{table} has no loaded_at column; exporting it in full")
+        appending = since is not None
+        write_root = table_dir if appending else table_dir.with_name(f".{name}.tmp-{run_id}")
+
+        where = []
+        params: list[Any] = []
+        if seasons and has_season:
+            where.append(sql.SQL("season = any(%s)"))
+            params.append(list(seasons))
+        if since is not None:
+            where.append(sql.SQL("loaded_at >= %s"))
+            params.append(since)
+        if horizon is not None:
+            where.append(sql.SQL("loaded_at < %s"))
+            params.append(horizon)
+        query = sql.SQL("select {} from {}.{}").format(
+            _select_list(columns), sql.Identifier(schema_name), sql.Identifier(name)
+        )
+        if where:
+            query += sql.SQL(" where ") + sql.SQL(" and ").join(where)
+        if has_season:
+            # Seasons arrive one after another, so one Parquet writer is open at a time.
+            query += sql.SQL(" order by season")
+
+        arrow_schema = pa.schema([(c, _arrow_type(pa, t)) for c, t in columns])
+        season_idx = names.index("season") if has_season else None
+        codec = None if compression == "none" else compression
+        rows = files = 0
+        written: list[int] = []
+        writer = None
+        current: object = object()
+        try:
+            with conn.cursor(name=f"cityscape_export_{run_id}") as cur:
+                cur.itersize = chunk_rows
+                cur.execute(query, params)
+                while chunk := cur.fetchmany(chunk_rows):
+                    groups = (
+                        itertools.groupby(chunk, key=lambda r: r[season_idx])
+                        if season_idx is not None
+                        else [(None, chunk)]
+                    )
+                    for season, group in groups:
+                        group = list(group)
+                        if writer is None or season != current:
+                            if writer is not None:
+                                writer.close()
+                            part_dir = write_root / (
+                                f"season={season}" if season is not None else ""
+                            )
+                            part_dir.mkdir(parents=True, exist_ok=True)
+                            writer = pq.ParquetWriter(
+                                part_dir / f"part-{run_id}.parquet",
+                                arrow_schema,
+                                compression=codec,
+                            )
+                            current = season
+                            files += 1
+                            if season is not None:
+                                written.append(season)
+                        arrays = [
+                            pa.array(col, type=f.type)
+                            for col, f in zip(zip(*group, strict=True), arrow_schema, strict=True)
+                        ]
+                        writer.write_table(pa.Table.from_arrays(arrays, schema=arrow_schema))
+                        rows += len(group)
+        finally:
+            if writer is not None:
+                writer.close()
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        if not appending:
+            shutil.rmtree(write_root, ignore_errors=True)
+        raise
+    finally:
+        conn.set_session(readonly=False, isolation_level="DEFAULT")
+
+    if not appending:
+        if seasons and has_season:
+            # Replace only the exported seasons; seasons without rows now are removed.
+            for season in seasons:
+                src = write_root / f"season={season}"
+                dest = table_dir / f"season={season}"
+                if src.exists():
+                    _replace_dir(src, dest)
+                else:
+                    shutil.rmtree(dest, ignore_errors=True)
+            shutil.rmtree(write_root, ignore_errors=True)
+        else:
+            write_root.mkdir(parents=True, exist_ok=True)
+            _replace_dir(write_root, table_dir)
+
+    watermark = horizon.isoformat() if horizon is not None else None
+    if watermark is not None:
+        state[key] = {
+            "loaded_at": watermark,
+            "exported_at": datetime.now(UTC).isoformat(),
+            "rows": rows,
+        }
+    result = TableExport(
+        table=table,
+        rows=rows,
+        files=files,
+        seasons=tuple(written),
+        incremental=appending,
+        watermark=watermark,
+        seconds=time.perf_counter() - started,
+    )
+    logger.info(
+        f"Exported {table} rows={rows} files={files} "
+        f"{'incremental' if appending else 'full'} in {result.seconds:.2f}s"
+    )
+    return result
+
+
+def export_tables(
+    out_dir: str | Path,
+    *,
+    tables: Iterable[str] = DEFAULT_TABLES,
+    seasons: Iterable[int] = (),
+    incremental: bool = False,
+    chunk_rows: int = CHUNK_ROWS,
+    compression: Compression = "zstd",
+) -> list[TableExport]:
+    """Export `tables` (default: raw.mlb_games and every core table) to Parquet under `out_dir`.
+
+    See `export_table`. The incremental watermarks in `out_dir/_export_state.json`
+    are saved after each table, so an interrupted run keeps the tables it finished.
+    """
+
+    _pyarrow()
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    state = load_state(out)
+    seasons = tuple(seasons)
+
+    with get_pool(postgres_config()).connection() as conn:
+        results = []
+        for table in resolve_tables(conn, tables):
+            conn.commit()
+            results.append(
+                export_table(
+                    conn,
+                    table,
+                    out,
+                    seasons=seasons,
+                    incremental=incremental,
+                    state=state,
+                    chunk_rows=chunk_rows,
+                    compression=compression,
+                )
+            )
+            _save_state(out, state)
+        return results
@@ -0,0 +1,324 @@
+"""Shared ingest engine: several leagues' seasons fetched and loaded side by side.
+
+Each `LeagueJob` (a connector and a season, see `cityscape.integrations.leagues`)
+runs on its own thread: it plans the season's endpoints, hands them to one fetch
+pool shared by every job, and loads the parsed responses in endpoint order as
+they arrive. Two process-wide limits apply across all leagues:
+
+- `max_fetches` requests (fetch + parse) in flight at once, and per job at
+  most `max_fetches` parsed responses fetched ahead of its loads
+- `max_writers` Postgres write transactions at once (`cityscape.utils.db.write_slots`)
+
+so a nightly run of every league takes about as long as the slowest one rather
+than the sum of them, without overrunning the APIs or the database.
+
+Every endpoint is a unit of work in the ingest ledger
+(`cityscape.automations.ingest.ledger`), committed with its rows: a rerun
+skips units that are loaded and settled (with the same load options, into
+the same partitions), so an interrupted backfill resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import time
+from collections import deque
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from cityscape.automations.ingest.ledger import (
+    LedgerEntry,
+    ensure_ledger,
+    fail_unit,
+    finish_unit,
+    load_signature,
+    plan_units,
+)
+from cityscape.integrations.leagues import Endpoint, LeagueConnector, LoadChunk, get_connector
+from cityscape.utils.db import (
+    ConnectionPool,
+    LoadMethod,
+    UpsertCounts,
+    get_pool,
+    postgres_config,
+    upsert_columns,
+    write_slots,
+)
+from cityscape.utils.logger import get_run_logger
+from cityscape.utils.partitions import partition_oids
+from cityscape.utils.payloads import canonical_json
+
+__all__ = ["LeagueIngestResult", "LeagueJob", "ingest_leagues", "league_jobs"]
+
+
+@dataclass(frozen=True, slots=True)
+class LeagueJob:
+    """One league season (or the [start_date, end_date] part of it) to ingest."""
+
+    connector: LeagueConnector
+    season: int
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class LeagueIngestResult:
+    league: str
+    season: int
+    tables: dict[str, UpsertCounts] = field(default_factory=dict)
+    requests: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    wall_s: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Flat summary: per-table inserted/updated/unchanged counts keyed `<table>_<count>`."""
+
+        out: dict[str, Any] = {
+            "league": self.league,
+            "season": self.season,
+            "requests": self.requests,
+            "units_skipped": self.skipped,
+            "responses_unchanged": self.unchanged,
+            "wall_s": round(self.wall_s, 3),
+            "error": self.error,
+        }
+        for table, counts in self.tables.items():
+            out.update(counts.as_dict(f"{table.rpartition('.')[2]}_"))
+        return out
+
+
+def league_jobs(
+    leagues: Iterable[str],
+    seasons: Iterable[int],
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list[LeagueJob]:
+    """A job per league and season, each league with its default connector."""
+
+    connectors = [get_connector(league) for league in dict.fromkeys(leagues)]
+    return [
+        LeagueJob(connector, season, start_date=start_date, end_date=end_date)
+        for connector in connectors
+        for season in dict.fromkeys(seasons)
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class _Response:
+    digest: str
+    settled: bool
+    # None when the response is the one already loaded.
+    chunks: list[LoadChunk] | None
+    fetch_s: float
+
+
+def _fetch_and_parse(
+    connector: LeagueConnector, endpoint: Endpoint, loaded_digest: str | None
+) -> _Response:
+    started = time.perf_counter()
+    payload = connector.fetch(endpoint)
+    digest = hashlib.sha256(canonical_json(payload)).hexdigest()
+    chunks = None if digest == loaded_digest else list(connector.parse(endpoint, payload))
+    return _Response(
+        digest=digest,
+        settled=connector.settled(endpoint, payload),
+        chunks=chunks,
+        fetch_s=time.perf_counter() - started,
+    )
+
+
+def _run_job(
+    job: LeagueJob,
+    *,
+    fetchers: ThreadPoolExecutor,
+    max_fetches: int,
+    pool: ConnectionPool,
+    max_writers: int,
+    load_method: LoadMethod,
+    refresh: bool,
+) -> LeagueIngestResult:
+    logger = get_run_logger()
+    connector = job.connector
+    started = time.perf_counter()
+    tables: dict[str, UpsertCounts] = {}
+    requests = skipped = unchanged = 0
+    pending: deque[tuple[Endpoint, Future[_Response]]] = deque()
+    endpoint: Endpoint | None = None
+    try:
+        endpoints = connector.endpoints(
+            job.season, start_date=job.start_date, end_date=job.end_date
+        )
+        with pool.connection() as conn:
+            ledger = plan_units(conn, endpoints)
+            raw_tables = [t.target.table for t in connector.tables]
+            signature = load_signature(
+                {**connector.load_options(), "load_method": load_method},
+                partition_oids(conn, raw_tables, job.season),
+            )
+        # Units loaded with other options, or into since-replaced partitions, load again.
+        ledger = {e: entry.under(signature) for e, entry in ledger.items()}
+        if refresh:
+            ledger = {e: LedgerEntry() for e in endpoints}
+        todo = [e for e in endpoints if not ledger[e].complete]
+        skipped = len(endpoints) - len(todo)
+        if skipped:
+            logger.info(
+                f"Skipping {skipped} of {len(endpoints)} settled units "
+                f"league={connector.league} season={job.season}"
+            )
+        queued = iter(todo)
+
+        def _submit_next() -> None:
+            e = next(queued, None)
+            if e is not None:
+                future = fetchers.submit(_fetch_and_parse, connector, e, ledger[e].loaded_digest)
+                pending.append((e, future))
+
+        # Fetch ahead of the loads, but keep at most `max_fetches` parsed responses waiting.
+        for _ in range(max_fetches):
+            _submit_next()
+        # Responses load in endpoint order, so a game listed twice keeps its later entry.
+        while pending:
+            endpoint, future = pending.popleft()
+            response = future.result()
+            _submit_next()
+            requests += 1
+            load_started = time.perf_counter()
+            with write_slots(max_writers), pool.connection() as conn:
+                counts: UpsertCounts | None = None
+                if response.chunks is None:
+                    unchanged += 1
+                else:
+                    counts = UpsertCounts()
+                    for chunk in response.chunks:
+                        table = chunk.target.table
+                        loaded = upsert_columns(
+                            conn, chunk.target, chunk.columns, method=load_method
+                        )
+                        tables[table] = tables.get(table, UpsertCounts()) + loaded
+                        counts += loaded
+                # Committed with the unit's rows, or not at all.
+                finish_unit(
+                    conn,
+                    endpoint,
+                    counts=counts,
+                    payload_digest=response.digest,
+                    settled=response.settled,
+                    signature=signature,
+                    wall_s=response.fetch_s + time.perf_counter() - load_started,
+                )
+            logger.debug(f"Loaded {endpoint}: {counts or 'unchanged'}")
+        endpoint = None
+    except Exception as exc:
+        for _, future in pending:
+            future.cancel()
+        logger.error(f"Ingest failed league={connector.league} season={job.season}: {exc!r}")
+        if endpoint is not None:
+            try:
+                with pool.connection() as conn:
+                    fail_unit(conn, endpoint, repr(exc))
+            except Exception as ledger_exc:
+                logger.warning(f"Could not record the failure of {endpoint}: {ledger_exc!r}")
+        return LeagueIngestResult(
+            league=connector.league,
+            season=job.season,
+            tables=tables,
+            requests=requests,
+            skipped=skipped,
+            unchanged=unchanged,
+            wall_s=time.perf_counter() - started,
+            error=repr(exc),
+        )
+
+    result = LeagueIngestResult(
+        league=connector.league,
+        season=job.season,
+        tables=tables,
+        requests=requests,
+        skipped=skipped,
+        unchanged=unchanged,
+        wall_s=time.perf_counter() - started,
+    )
+    logger.info(f"Ingest complete {result.as_dict()}")
+    return result
+
+
+def ingest_leagues(
+    jobs: Sequence[LeagueJob],
+    *,
+    max_fetches: int = 8,
+    max_writers: int = 2,
+    load_method: LoadMethod = "batch",
+    max_jobs: int | None = None,
+    refresh: bool = False,
+) -> list[LeagueIngestResult]:
+    """Fetch and load every job concurrently; one result per job, in job order.
+
+    All jobs share one pool of `max_fetches` fetch threads and at most
+    `max_writers` concurrent write transactions; `max_jobs` caps how many jobs
+    run at once (default: all). Each response is upserted and committed on its
+    own, together with its unit in the ingest ledger (unchanged rows are
+    skipped by digest, so a rerun is cheap). Units the ledger has as loaded and
+    settled are not fetched again unless `refresh=True`. A failing job is
+    reported in its result's `error` and does not stop the others. Raw tables
+    and season partitions are created up front.
+    """
+
+    if max_fetches < 1:
+        raise ValueError("max_fetches must be >= 1")
+    if max_jobs is not None and max_jobs < 1:
+        raise ValueError("max_jobs must be >= 1")
+    if not jobs:
+        return []
+
+    logger = get_run_logger()
+    pool = get_pool(postgres_config())
+
+    seasons: dict[int, list[int]] = {}
+    for job in jobs:
+        seasons.setdefault(id(job.connector), []).append(job.season)
+    with pool.connection() as conn:
+        ensure_ledger(conn)
+        for job in {id(job.connector): job for job in jobs}.values():
+            job.connector.ensure_storage(conn, seasons[id(job.connector)])
+
+    logger.info(
+        f"Ingesting {len(jobs)} league seasons "
+        f"(fetches in flight={max_fetches}, db writers={max_writers})"
+    )
+    with (
+        ThreadPoolExecutor(max_workers=max_fetches, thread_name_prefix="ingest-fetch") as fetchers,
+        ThreadPoolExecutor(
+            max_workers=min(len(jobs), max_jobs or len(jobs)), thread_name_prefix="ingest-league"
+        ) as runners,
+    ):
+        # Each runner gets a copy of the caller's context, so Prefect logs attach to its run.
+        futures = [
+            runners.submit(
+                contextvars.copy_context().run,
+                _run_job,
+                job,
+                fetchers=fetchers,
+                max_fetches=max_fetches,
+                pool=pool,
+                max_writers=max_writers,
+                load_method=load_method,
+                refresh=refresh,
+            )
+            for job in jobs
+        ]
+        results = [future.result() for future in futures]
+
+    logger.info(f"Postgres pool {pool.stats().as_dict()}")
+    return results
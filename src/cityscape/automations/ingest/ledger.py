@@ -0,0 +1,298 @@
+"""Ingest ledger: which units of work have been loaded, so backfills can resume.
+
+raw.ingest_ledger keeps a row per unit of work of the shared ingest engine:
+one `Endpoint` (league, season and request, e.g. a month of schedule). The
+engine plans every job's units against it before fetching:
+
+- a unit that loaded and is *settled* (its response can no longer change,
+  e.g. a past season's month with every game Final) is not fetched again
+- a unit whose response has the same digest as the one last loaded is
+  fetched but not parsed or written
+- everything else (pending, failed, or loaded but still changing) is loaded
+
+Each load records its *load signature* (`load_signature`): the options that
+shape the rows it wrote (e.g. raw retention, load method) and the season's
+partitions it wrote into. A unit loaded under another signature counts as
+never loaded, so changing those options or reloading a partition rewrites it.
+
+A unit is marked done in the transaction that writes its rows, so the
+ledger never claims data that did not commit: after a crash, rerunning the
+same backfill redoes only the units that were in flight or not yet started.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+
+import psycopg2.extras
+
+from cityscape.integrations.leagues import Endpoint
+from cityscape.utils.db import UpsertCounts, ensure_raw_schema
+from cityscape.utils.payloads import canonical_json
+
+__all__ = [
+    "LEDGER_TABLE",
+    "UNIT_STATUSES",
+    "LedgerEntry",
+    "LedgerProgress",
+    "UnitStatus",
+    "ensure_ledger",
+    "fail_unit",
+    "finish_unit",
+    "ledger_progress",
+    "load_signature",
+    "plan_units",
+]
+
+# Where a unit stands:
+# - "pending": planned, not loaded yet (or its load did not commit)
+# - "done": its rows are committed
+# - "failed": the last attempt raised; `error` says why
+UnitStatus = Literal["pending", "done", "failed"]
+UNIT_STATUSES: tuple[str, ...] = ("pending", "done", "failed")
+
+LEDGER_TABLE = "raw.ingest_ledger"
+
+_LEDGER_DDL = """
+    create table if not exists raw.ingest_ledger (
+      league varchar not null,
+      season integer not null,
+      unit varchar not null,
+      start_date date null,
+      end_date date null,
+      status varchar not null default 'pending',
+      settled boolean not null default false,
+      attempts integer not null default 0,
+      rows_inserted integer not null default 0,
+      rows_updated integer not null default 0,
+      rows_unchanged integer not null default 0,
+      payload_digest text null,
+      load_signature text null,
+      wall_s double precision null,
+      error text null,
+      planned_at timestamptz not null default now(),
+      finished_at timestamptz null,
+      primary key (league, season, unit)
+    )
+"""
+
+_ledger_lock = threading.Lock()
+# Databases (by DSN) whose ledger table exists, checked once per process.
+_ledger_ready: set[str] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerEntry:
+    """A unit's ledger state as of planning."""
+
+    status: UnitStatus = "pending"
+    settled: bool = False
+    payload_digest: str | None = None
+    load_signature: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Loaded, and its source can no longer change: nothing left to fetch."""
+
+        return self.status == "done" and self.settled
+
+    @property
+    def loaded_digest(self) -> str | None:
+        """Digest of the response whose rows are committed, if any."""
+
+        return self.payload_digest if self.status == "done" else None
+
+    def under(self, signature: str) -> LedgerEntry:
+        """This entry as seen by a load with `signature`: pending unless it was loaded with it."""
+
+        return self if self.load_signature == signature else LedgerEntry()
+
+
+def load_signature(options: Mapping[str, Any], partitions: Sequence[int]) -> str:
+    """Digest of a load's row-shaping `options` and the oids of the partitions it writes."""
+
+    payload = {"options": dict(options), "partitions": list(partitions)}
+    return hashlib.sha256(canonical_json(payload)).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerProgress:
+    """Ledger totals for one league season."""
+
+    league: str
+    season: int
+    units: int
+    done: int
+    settled: int
+    failed: int
+    rows: int
+    last_finished_at: datetime | None = None
+    last_error: str | None = None
+
+    @property
+    def pending(self) -> int:
+        return self.units - self.done - self.failed
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "league": self.league,
+            "season": self.season,
+            "units": self.units,
+            "done": self.done,
+            "settled": self.settled,
+            "failed": self.failed,
+            "pending": self.pending,
+            "rows": self.rows,
+            "last_finished_at": (
+                self.last_finished_at.isoformat() if self.last_finished_at else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+def ensure_ledger(conn) -> None:
+    """Create raw.ingest_ledger (committed), once per process and database."""
+
+    with _ledger_lock:
+        if conn.dsn in _ledger_ready:
+            return
+        ensure_raw_schema(conn)
+        with conn.cursor() as cur:
+            cur.execute(_LEDGER_DDL)
+        conn.commit()
+        _ledger_ready.add(conn.dsn)
+
+
+def plan_units(conn, endpoints: Sequence[Endpoint]) -> dict[Endpoint, LedgerEntry]:
+    """Record `endpoints` as units (new ones pending) and return each one's state.
+
+    Not committed; the caller's transaction decides.
+    """
+
+    if not endpoints:
+        return {}
+    with conn.cursor() as cur:
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            insert into raw.ingest_ledger (league, season, unit, start_date, end_date)
+            values %s
+            on conflict (league, season, unit) do nothing
+            """,
+            [(e.league, e.season, e.unit, e.start_date, e.end_date) for e in endpoints],
+        )
+        cur.execute(
+            """
+            select league, season, unit, status, settled, payload_digest, load_signature
+            from raw.ingest_ledger
+            where league = any(%s) and season = any(%s)
+            """,
+            (
+                list({e.league for e in endpoints}),
+                list({e.season for e in endpoints}),
+            ),
+        )
+        stored = {
+            (league, season, unit): LedgerEntry(status, settled, digest, signature)
+            for league, season, unit, status, settled, digest, signature in cur.fetchall()
+        }
+    return {e: stored[(e.league, e.season, e.unit)] for e in endpoints}
+
+
+def finish_unit(
+    conn,
+    endpoint: Endpoint,
+    *,
+    counts: UpsertCounts | None,
+    payload_digest: str,
+    settled: bool,
+    wall_s: float,
+    signature: str | None = None,
+) -> None:
+    """Mark `endpoint` done, in the caller's transaction (the one that wrote its rows).
+
+    `counts=None` (a response identical to the last load) keeps the stored counts;
+    `signature` is the load's `load_signature`.
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            update raw.ingest_ledger
+            set status = 'done',
+                settled = %(settled)s,
+                attempts = attempts + 1,
+                rows_inserted = coalesce(%(inserted)s, rows_inserted),
+                rows_updated = coalesce(%(updated)s, rows_updated),
+                rows_unchanged = coalesce(%(unchanged)s, rows_unchanged),
+                payload_digest = %(payload_digest)s,
+                load_signature = %(signature)s,
+                wall_s = %(wall_s)s,
+                error = null,
+                finished_at = now()
+            where league = %(league)s and season = %(season)s and unit = %(unit)s
+            """,
+            {
+                "league": endpoint.league,
+                "season": endpoint.season,
+                "unit": endpoint.unit,
+                "settled": settled,
+                "inserted": counts.inserted if counts is not None else None,
+                "updated": counts.updated if counts is not None else None,
+                "unchanged": counts.unchanged if counts is not None else None,
+                "payload_digest": payload_digest,
+                "signature": signature,
+                "wall_s": wall_s,
+            },
+        )
+
+
+def fail_unit(conn, endpoint: Endpoint, error: str) -> None:
+    """Mark `endpoint` failed with `error` (not committed)."""
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            update raw.ingest_ledger
+            set status = 'failed', attempts = attempts + 1, error = %s, finished_at = now()
+            where league = %s and season = %s and unit = %s
+            """,
+            (error, endpoint.league, endpoint.season, endpoint.unit),
+        )
+
+
+def ledger_progress(
+    conn, *, leagues: Iterable[str] = (), seasons: Iterable[int] = ()
+) -> list[LedgerProgress]:
+    """Per league season totals of the ledger, optionally limited to `leagues`/`seasons`."""
+
+    leagues, seasons = list(leagues), list(seasons)
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            select
+              league,
+              season,
+              count(*),
+              count(*) filter (where status = 'done'),
+              count(*) filter (where status = 'done' and settled),
+              count(*) filter (where status = 'failed'),
+              coalesce(sum(rows_inserted + rows_updated + rows_unchanged)
+                filter (where status = 'done'), 0),
+              max(finished_at),
+              (array_agg(unit || ': ' || error order by finished_at desc)
+                filter (where status = 'failed'))[1]
+            from raw.ingest_ledger
+            where (cardinality(%s::varchar[]) = 0 or league = any(%s::varchar[]))
+              and (cardinality(%s::integer[]) = 0 or season = any(%s::integer[]))
+            group by league, season
+            order by league, season
+            """,
+            (leagues, leagues, seasons, seasons),
+        )
+        return [LedgerProgress(*row) for row in cur.fetchall()]
@@ -1,19 +1,206 @@
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Iterable, Sequence
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any, Literal
 
-from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.integrations.cache import default_response_cache
+from cityscape.integrations.leagues import ScheduleWindow
+from cityscape.integrations.mlb.statsapi import (
+    GameFeedFetchError,
+    MlbGame,
+    MlbGameFeed,
+    MlbStatsApi,
+)
 from cityscape.utils.db import (
-    PostgresConfig,
-    connect,
-    ensure_mlb_tables,
-    ensure_raw_schema,
-    upsert_mlb_games,
-    upsert_mlb_teams,
+    MLB_GAME_FEEDS,
+    MLB_GAMES,
+    MLB_GAMES_ARCHIVE,
+    MLB_TEAMS,
+    LoadMethod,
+    UpsertCounts,
+    ensure_mlb_storage,
+    get_pool,
+    postgres_config,
+    reload_season,
+    stored_mlb_game_feeds,
+    upsert_columns,
+    upsert_rows,
+    write_slots,
 )
 from cityscape.utils.logger import get_run_logger
+from cityscape.utils.metrics import (
+    IngestMetrics,
+    StageTimer,
+    append_jsonl,
+    peak_rss_bytes,
+    timed_iter,
+    write_prometheus_textfile,
+)
 from cityscape.utils.settings import get_settings
 
+# What lands in raw.mlb_games.raw:
+# - "full": the schedule game object verbatim
+# - "projected": only MLB_GAME_RAW_KEYS (or the caller's key paths)
+# - "archive": the projection, plus the full object compressed into raw.mlb_games_archive
+RawRetention = Literal["full", "projected", "archive"]
+RAW_RETENTIONS: tuple[str, ...] = ("full", "projected", "archive")
+
+# Dotted key paths of a schedule game object kept by "projected"/"archive" retention.
+MLB_GAME_RAW_KEYS: tuple[str, ...] = (
+    "gamePk",
+    "gameGuid",
+    "link",
+    "gameType",
+    "season",
+    "gameDate",
+    "officialDate",
+    "rescheduleDate",
+    "rescheduledFrom",
+    "status.abstractGameState",
+    "status.codedGameState",
+    "status.detailedState",
+    "status.statusCode",
+    "status.reason",
+    "teams.away.team.id",
+    "teams.away.team.name",
+    "teams.away.score",
+    "teams.away.isWinner",
+    "teams.away.leagueRecord",
+    "teams.home.team.id",
+    "teams.home.team.name",
+    "teams.home.score",
+    "teams.home.isWinner",
+    "teams.home.leagueRecord",
+    "venue.id",
+    "venue.name",
+    "doubleHeader",
+    "gameNumber",
+    "dayNight",
+    "scheduledInnings",
+    "seriesDescription",
+    "seriesGameNumber",
+    "gamesInSeries",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RawBytes:
+    """JSON bytes of raw game payloads before and after applying the retention policy."""
+
+    rows: int = 0
+    before: int = 0
+    after: int = 0
+    archived: int = 0
+
+    def __add__(self, other: RawBytes) -> RawBytes:
+        return RawBytes(
+            rows=self.rows + other.rows,
+            before=self.before + other.before,
+            after=self.after + other.after,
+            archived=self.archived + other.archived,
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        per_row = max(1, self.rows)
+        return {
+            "raw_bytes_per_row_before": round(self.before / per_row, 1),
+            "raw_bytes_per_row_after": round(self.after / per_row, 1),
+            "archive_bytes_per_row": round(self.archived / per_row, 1),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class MlbIngestResult:
+    season: int
+    teams: UpsertCounts
+    games: UpsertCounts
+    raw_retention: RawRetention = "full"
+    raw_bytes: RawBytes = RawBytes()
+    metrics: IngestMetrics | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Flat summary for flow results: totals, per-table upsert counts and run metrics."""
+
+        return {
+            "season": self.season,
+            "teams": self.teams.total,
+            "games": self.games.total,
+            **self.teams.as_dict("teams_"),
+            **self.games.as_dict("games_"),
+            "raw_retention": self.raw_retention,
+            **self.raw_bytes.as_dict(),
+            **(self.metrics.as_dict() if self.metrics is not None else {}),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class MlbFeedIngestResult:
+    """Outcome of one game-feed ingest: how each feed was fetched and what was written."""
+
+    game_date: date
+    feeds: UpsertCounts
+    full: int = 0
+    patched: int = 0
+    unchanged: int = 0
+    skipped_final: int = 0
+    http_requests: int = 0
+    bytes_received: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "game_date": self.game_date.isoformat(),
+            "feeds": self.feeds.total,
+            **self.feeds.as_dict("feeds_"),
+            "feeds_full": self.full,
+            "feeds_patched": self.patched,
+            "feeds_unchanged": self.unchanged,
+            "feeds_skipped_final": self.skipped_final,
+            "http_requests": self.http_requests,
+            "bytes_received": self.bytes_received,
+        }
+
+
+def game_row(game: MlbGame, *, raw: dict[str, Any] | None = None) -> dict[str, Any]:
+    return {
+        "game_id": game.game_id,
+        "season": game.season,
+        "game_date": game.game_date,
+        "game_type": game.game_type,
+        "status": game.status,
+        "home_team_id": game.home_team_id,
+        "away_team_id": game.away_team_id,
+        "home_score": game.home_score,
+        "away_score": game.away_score,
+        "raw": game.raw if raw is None else raw,
+    }
+
+
+def game_feed_row(feed: MlbGameFeed, *, season: int) -> dict[str, Any]:
+    return {
+        "game_id": feed.game_id,
+        "season": season,
+        "game_date": feed.game_date,
+        "abstract_state": feed.abstract_state,
+        "detailed_state": feed.detailed_state,
+        "timecode": feed.timecode,
+        "feed": feed.feed,
+    }
+
+
+def prepare_mlb_seasons(seasons: Iterable[int]) -> None:
+    """Create the raw MLB tables and the partitions for `seasons` in one short transaction.
+
+    Run before loading several seasons concurrently, so no load has to wait on
+    another's partition DDL.
+    """
+
+    with get_pool(postgres_config()).connection() as conn:
+        ensure_mlb_storage(conn, seasons)
+
 
 def ingest_mlb_season(
     *,
@@ -21,29 +208,75 @@ def ingest_mlb_season(
     game_types: str = "R",
     start_date: date | None = None,
     end_date: date | None = None,
-) -> tuple[int, int]:
+    load_method: LoadMethod = "batch",
+    max_concurrent_writers: int | None = None,
+    batch_size: int = 1000,
+    commit_every: int | None = None,
+    window: ScheduleWindow | None = None,
+    max_concurrent_windows: int = 4,
+    raw_retention: RawRetention = "full",
+    raw_keys: Sequence[str] = MLB_GAME_RAW_KEYS,
+    reload: bool = False,
+) -> MlbIngestResult:
     """Fetch MLB teams + games for a season and land them into Postgres raw tables.
 
     Lands into:
     - raw.mlb_teams
     - raw.mlb_games
+
+    `load_method="copy"` bulk-loads through COPY + a set-based merge (see
+    `cityscape.utils.db.upsert_rows`); prefer it for multi-season backfills.
+    Rows whose content digest matches what is already stored are not rewritten
+    and are reported as unchanged.
+
+    Games are parsed lazily into columnar `GameBatch`es of `batch_size` games
+    (see `cityscape.integrations.mlb.batches`) and written column by column, so
+    only one batch is alive at a time and no per-row dicts are built. By default
+    everything commits once at the end (all-or-nothing); `commit_every=N` commits
+    after every N game batches instead, trading atomicity for shorter transactions.
+
+    `window="week"|"month"` fetches the schedule as date windows, up to
+    `max_concurrent_windows` at a time, retrying failed windows individually.
+
+    `raw_retention` controls how much of each schedule game object is stored in
+    raw.mlb_games.raw ("full", "projected" to `raw_keys`, or "archive": projected
+    plus a compressed copy of the full object in raw.mlb_games_archive). The
+    result reports raw bytes per row before and after the policy.
+
+    `max_concurrent_writers` caps how many ingests in this process may hold a
+    Postgres write transaction at once (see `cityscape.utils.db.write_slots`);
+    fetching is not limited by it.
+
+    Raw tables are partitioned by season; the season's partitions are created
+    (and committed) before loading. `reload=True` drops and reloads the season:
+    rows are loaded into fresh partitions that replace the live ones on commit
+    (see `cityscape.utils.db.reload_season`), so games no longer in the schedule
+    disappear. raw.mlb_games_archive is only swapped with `raw_retention="archive"`.
+
+    The result carries `IngestMetrics`: wall time per stage (fetch, parse, row
+    building, upserts, commit), rows/s, HTTP requests/retries/bytes and peak RSS.
+    They are also written to the sinks configured by `CITYSCAPE_METRICS_TEXTFILE_DIR`
+    / `CITYSCAPE_METRICS_JSONL` (see `publish_metrics`).
     """
 
-    logger = get_run_logger()
-    settings = get_settings()
+    if raw_retention not in RAW_RETENTIONS:
+        raise ValueError(
+            f"Unknown raw retention {raw_retention!r}; expected one of {RAW_RETENTIONS}"
+        )
+    if reload and (start_date is not None or end_date is not None):
+        raise ValueError(
+            "reload replaces the whole season; it cannot be combined with start_date/end_date"
+        )
 
-    cfg = PostgresConfig(
-        host=settings.postgres_host or "postgres",
-        port=settings.postgres_port or 5432,
-        user=settings.postgres_user or "postgres",
-        password=settings.postgres_password or "postgres",
-        dbname=settings.postgres_dbname or "cityscape",
-    )
+    logger = get_run_logger()
+    cfg = postgres_config()
 
-    api = MlbStatsApi()
+    timer = StageTimer()
+    api = MlbStatsApi(cache=default_response_cache(), timer=timer)
+    http_before = api.http_stats()
 
     logger.info(f"Fetching MLB teams season={season}")
-    teams = api.list_teams(season=season)
+    teams = api.get_team_batch(season=season)
 
     if start_date is not None or end_date is not None:
         logger.info(
@@ -52,48 +285,209 @@ def ingest_mlb_season(
     else:
         logger.info(f"Fetching MLB games season={season} game_types={game_types}")
 
-    games = api.list_games(season=season, game_types=game_types, start_date=start_date, end_date=end_date)
-
-    team_rows = [
-        {
-            "team_id": t.team_id,
-            "season": season,
-            "team_name": t.team_name,
-            "team_abbr": t.team_abbr,
-            "league_id": t.league_id,
-            "division_id": t.division_id,
-            "raw": t.raw,
-        }
-        for t in teams
-    ]
+    # Parsed straight into columns; raw game objects are only kept as JSON bytes.
+    batches = api.iter_game_batches(
+        season=season,
+        game_types=game_types,
+        start_date=start_date,
+        end_date=end_date,
+        window=window,
+        max_concurrency=max_concurrent_windows,
+        batch_size=batch_size,
+        raw_keys=None if raw_retention == "full" else raw_keys,
+        archive=raw_retention == "archive",
+    )
+    batches = timed_iter(batches, timer, "parse_schedule")
 
-    game_rows = [
-        {
-            "game_id": g.game_id,
-            "season": g.season,
-            "game_date": g.game_date,
-            "game_type": g.game_type,
-            "status": g.status,
-            "home_team_id": g.home_team_id,
-            "away_team_id": g.away_team_id,
-            "home_score": g.home_score,
-            "away_score": g.away_score,
-            "raw": g.raw,
-        }
+    with timer.stage("build_rows"):
+        team_columns = teams.columns()
+
+    slots = write_slots(max_concurrent_writers) if max_concurrent_writers else nullcontext()
+    with ExitStack() as held:
+        with timer.stage("wait_write_slot"):
+            held.enter_context(slots)
+
+        logger.info(f"Connecting to Postgres host={cfg.host} port={cfg.port} dbname={cfg.dbname}")
+        pool = get_pool(cfg)
+        with timer.stage("db_setup"):
+            conn = held.enter_context(pool.connection())
+            # Commits any DDL, releasing its locks before the long load.
+            ensure_mlb_storage(conn, [season])
+
+        with ExitStack() as swaps:
+            teams_target, games_target, archive_target = MLB_TEAMS, MLB_GAMES, MLB_GAMES_ARCHIVE
+            if reload:
+                logger.info(f"Reloading season={season} into fresh partitions")
+                teams_target = swaps.enter_context(reload_season(conn, MLB_TEAMS, season))
+                games_target = swaps.enter_context(reload_season(conn, MLB_GAMES, season))
+                if raw_retention == "archive":
+                    archive_target = swaps.enter_context(
+                        reload_season(conn, MLB_GAMES_ARCHIVE, season)
+                    )
+
+            with timer.stage("upsert_teams"):
+                team_counts = upsert_columns(conn, teams_target, team_columns, method=load_method)
+
+            game_counts = UpsertCounts()
+            raw_bytes = RawBytes()
+            for n, batch in enumerate(batches, start=1):
+                with timer.stage("build_rows"):
+                    columns = batch.columns()
+                with timer.stage("upsert_games"):
+                    game_counts += upsert_columns(conn, games_target, columns, method=load_method)
+                if batch.archive is not None:
+                    with timer.stage("upsert_archive"):
+                        upsert_columns(
+                            conn, archive_target, batch.archive_columns(), method=load_method
+                        )
+                raw_bytes += RawBytes(
+                    rows=len(batch),
+                    before=batch.raw_bytes_before,
+                    after=batch.raw_bytes_after,
+                    archived=batch.archive_bytes,
+                )
+                if commit_every and n % commit_every == 0:
+                    with timer.stage("commit"):
+                        conn.commit()
+
+            if reload:
+                with timer.stage("swap_partitions"):
+                    swaps.close()
+
+        with timer.stage("commit"):
+            conn.commit()
+
+    if api.cache is not None:
+        logger.info(f"HTTP cache {api.cache.stats().as_dict()}")
+    logger.info(f"Postgres pool {pool.stats().as_dict()}")
+
+    http = api.http_stats() - http_before
+    metrics = IngestMetrics(
+        wall_s=timer.elapsed_s,
+        stages=timer.totals(),
+        rows=game_counts.total,
+        http_requests=http.requests,
+        http_retries=http.retries,
+        bytes_received=http.bytes_received,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+
+    logger.info(f"Raw payloads retention={raw_retention} {raw_bytes.as_dict()}")
+    logger.info(f"Ingest complete season={season} teams={team_counts} games={game_counts}")
+    logger.info(f"Ingest metrics season={season} {metrics.as_dict()}")
+    result = MlbIngestResult(
+        season=season,
+        teams=team_counts,
+        games=game_counts,
+        raw_retention=raw_retention,
+        raw_bytes=raw_bytes,
+        metrics=metrics,
+    )
+    publish_metrics(result)
+    return result
+
+
+# Schedule states (status.abstractGameState) of games that have a feed worth landing.
+FEED_GAME_STATES: tuple[str, ...] = ("Live", "Final")
+
+
+def ingest_mlb_game_feeds(
+    *,
+    game_date: date,
+    season: int | None = None,
+    game_types: str = "R",
+    max_concurrency: int = 8,
+    load_method: LoadMethod = "batch",
+) -> MlbFeedIngestResult:
+    """Land the live feeds of `game_date`'s started games into raw.mlb_game_feeds.
+
+    Feeds are fetched concurrently (up to `max_concurrency` at a time). A game
+    whose stored feed is already Final is never fetched again; one that is in
+    progress is brought up to date from its stored version through the
+    diffPatch endpoint, patched in memory, instead of downloading the whole
+    feed (see `MlbStatsApi.get_game_feed`). Only feeds that changed are written.
+
+    Feeds that still fail after retries are logged; the others are committed
+    before the `GameFeedFetchError` is re-raised.
+    """
+
+    logger = get_run_logger()
+    cfg = postgres_config()
+    season = season or game_date.year
+
+    api = MlbStatsApi()
+    http_before = api.http_stats()
+
+    logger.info(f"Fetching MLB schedule game_date={game_date} season={season}")
+    games = api.list_games(
+        season=season, game_types=game_types, start_date=game_date, end_date=game_date
+    )
+    started = [
+        g.game_id
         for g in games
+        if (g.raw.get("status") or {}).get("abstractGameState") in FEED_GAME_STATES
     ]
 
-    logger.info(f"Connecting to Postgres host={cfg.host} port={cfg.port} dbname={cfg.dbname}")
+    # The connection goes back to the pool while the feeds are fetched.
+    pool = get_pool(cfg)
+    with pool.connection() as conn:
+        ensure_mlb_storage(conn, [season])
+        stored = stored_mlb_game_feeds(conn, season=season, game_ids=started)
+        conn.commit()
 
-    with connect(cfg) as conn:
-        conn.autocommit = False
-        ensure_raw_schema(conn)
-        ensure_mlb_tables(conn)
+    final = {game_id for game_id, row in stored.items() if row["feed"] is None}
+    priors = {
+        game_id: MlbGameFeed(**row) for game_id, row in stored.items() if row["feed"] is not None
+    }
+    todo = [game_id for game_id in started if game_id not in final]
+    logger.info(
+        f"Fetching {len(todo)} game feeds game_date={game_date} "
+        f"({len(priors)} incrementally, {len(final)} already final)"
+    )
 
-        inserted_teams = upsert_mlb_teams(conn, team_rows)
-        inserted_games = upsert_mlb_games(conn, game_rows)
+    failed: GameFeedFetchError | None = None
+    try:
+        feeds = api.list_game_feeds(todo, priors=priors, max_concurrency=max_concurrency)
+    except GameFeedFetchError as exc:
+        logger.warning(f"Game feeds failed game_date={game_date}: {exc}")
+        feeds, failed = exc.feeds, exc
 
+    rows = [game_feed_row(f, season=season) for f in feeds if f.fetch != "unchanged"]
+    with pool.connection() as conn:
+        counts = upsert_rows(conn, MLB_GAME_FEEDS, rows, method=load_method)
         conn.commit()
 
-    logger.info(f"Ingest complete season={season} teams={inserted_teams} games={inserted_games}")
-    return inserted_teams, inserted_games
+    fetches = [f.fetch for f in feeds]
+    http = api.http_stats() - http_before
+    result = MlbFeedIngestResult(
+        game_date=game_date,
+        feeds=counts,
+        full=fetches.count("full"),
+        patched=fetches.count("patch"),
+        unchanged=fetches.count("unchanged"),
+        skipped_final=len(final),
+        http_requests=http.requests,
+        bytes_received=http.bytes_received,
+    )
+    logger.info(f"Game feeds complete game_date={game_date} {result.as_dict()}")
+    if failed is not None:
+        raise failed
+    return result
+
+
+def publish_metrics(result: MlbIngestResult) -> None:
+    """Write run metrics to the sinks configured in settings (Prometheus textfile, JSON lines)."""
+
+    if result.metrics is None:
+        return
+    settings = get_settings()
+    if settings.metrics_textfile_dir:
+        write_prometheus_textfile(
+            Path(settings.metrics_textfile_dir) / f"cityscape_ingest_mlb_{result.season}.prom",
+            result.metrics.prometheus({"league": "mlb", "season": result.season}),
+        )
+    if settings.metrics_jsonl_path:
+        append_jsonl(
+            settings.metrics_jsonl_path,
+            {"ts": datetime.now(UTC).isoformat(), "league": "mlb", **result.as_dict()},
+        )
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from cityscape.automations.ingest.mlb import (
+    FEED_GAME_STATES,
+    game_feed_row,
+    game_row,
+)
+from cityscape.integrations.mlb.statsapi import (
+    FINAL_GAME_STATE,
+    GameFeedFetchError,
+    MlbGame,
+    MlbGameFeed,
+    MlbStatsApi,
+)
+from cityscape.integrations.ratelimit import CircuitOpenError
+from cityscape.utils.db import (
+    MLB_GAME_FEEDS,
+    MLB_GAMES,
+    ensure_mlb_storage,
+    get_pool,
+    postgres_config,
+    stored_mlb_game_feeds,
+    upsert_rows,
+)
+from cityscape.utils.logger import get_run_logger
+
+# Default poll intervals (seconds): while a game is live, while one is about to
+# start (or overdue), and the longest sleep while waiting for the first pitch.
+LIVE_POLL_S = 10.0
+PREGAME_POLL_S = 60.0
+IDLE_POLL_S = 900.0
+
+# Start polling at the pre-game interval this long before the first pitch.
+PREGAME_LEAD = timedelta(minutes=10)
+
+# (status, home score, away score): what makes a schedule row worth rewriting.
+GameState = tuple[str | None, int | None, int | None]
+
+
+@dataclass(frozen=True, slots=True)
+class MlbWatchResult:
+    """What one watch session did, and how fresh its writes were."""
+
+    game_date: date
+    games: int
+    polls: int
+    games_written: int
+    feeds_written: int
+    max_lag_s: float
+    runtime_s: float
+    stopped: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "game_date": self.game_date.isoformat(),
+            "games": self.games,
+            "polls": self.polls,
+            "games_written": self.games_written,
+            "feeds_written": self.feeds_written,
+            "max_lag_s": round(self.max_lag_s, 3),
+            "runtime_s": round(self.runtime_s, 1),
+            "stopped": self.stopped,
+        }
+
+
+def _abstract_state(game: MlbGame) -> str | None:
+    return (game.raw.get("status") or {}).get("abstractGameState")
+
+
+def _start_time(game: MlbGame) -> datetime | None:
+    value = game.raw.get("gameDate")
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def game_state(game: MlbGame) -> GameState:
+    return (game.status, game.home_score, game.away_score)
+
+
+def changed_games(games: Iterable[MlbGame], seen: dict[int, GameState]) -> list[MlbGame]:
+    """Games whose status or score differs from `seen` (updated in place)."""
+
+    out = []
+    for g in games:
+        state = game_state(g)
+        if seen.get(g.game_id) != state:
+            seen[g.game_id] = state
+            out.append(g)
+    return out
+
+
+def all_final(games: Iterable[MlbGame]) -> bool:
+    """True when every game is over (postponed and cancelled games are Final too)."""
+
+    return all(_abstract_state(g) == FINAL_GAME_STATE for g in games)
+
+
+def poll_delay(
+    games: Iterable[MlbGame],
+    *,
+    now: datetime,
+    live_s: float = LIVE_POLL_S,
+    pregame_s: float = PREGAME_POLL_S,
+    idle_s: float = IDLE_POLL_S,
+) -> float:
+    """Seconds until the next poll, from the state of the day's games.
+
+    `live_s` while any game is live; `pregame_s` from `PREGAME_LEAD` before the
+    next first pitch (and while a game is overdue); otherwise sleep until then,
+    capped at `idle_s`.
+    """
+
+    pending = [g for g in games if _abstract_state(g) != FINAL_GAME_STATE]
+    if any(_abstract_state(g) == "Live" for g in pending):
+        return live_s
+    starts = [s for s in map(_start_time, pending) if s is not None]
+    if len(starts) < len(pending):
+        return pregame_s
+    if not starts:
+        return idle_s
+    until = (min(starts) - PREGAME_LEAD - now).total_seconds()
+    return max(pregame_s, min(idle_s, until)) if until > 0 else pregame_s
+
+
+@dataclass(slots=True)
+class _Pending:
+    """Rows detected as changed but not written yet (kept across a failed write)."""
+
+    games: dict[int, dict[str, Any]]
+    feeds: dict[int, dict[str, Any]]
+    detected_at: float | None = None
+
+
+async def _watch(
+    api: MlbStatsApi,
+    write: Callable[[list[dict[str, Any]], list[dict[str, Any]]], Awaitable[None]],
+    *,
+    game_date: date,
+    season: int,
+    game_types: str,
+    feeds: bool,
+    final_feeds: set[int],
+    feed_priors: dict[int, MlbGameFeed],
+    live_s: float,
+    pregame_s: float,
+    idle_s: float,
+    deadline: float,
+    stop: asyncio.Event,
+    max_concurrency: int,
+) -> MlbWatchResult:
+    logger = get_run_logger()
+    started = time.monotonic()
+    seen: dict[int, GameState] = {}
+    pending = _Pending(games={}, feeds={})
+    polls = games_written = feeds_written = 0
+    max_lag = 0.0
+    games: list[MlbGame] = []
+    stopped = "deadline"
+
+    while time.monotonic() < deadline:
+        polls += 1
+        polled_at = time.monotonic()
+        polled = False
+        delay = live_s
+        try:
+            games = await api.alist_games(
+                season=season, game_types=game_types, start_date=game_date, end_date=game_date
+            )
+            for g in changed_games(games, seen):
+                pending.games[g.game_id] = game_row(g)
+
+            if feeds:
+                todo = [
+                    g.game_id
+                    for g in games
+                    if _abstract_state(g) in FEED_GAME_STATES and g.game_id not in final_feeds
+                ]
+                try:
+                    fetched = await api.alist_game_feeds(
+                        todo, priors=feed_priors, max_concurrency=max_concurrency
+                    )
+                except GameFeedFetchError as exc:
+                    logger.warning(f"Game feeds failed game_date={game_date}: {exc}")
+                    fetched = exc.feeds
+                for f in fetched:
+                    feed_priors[f.game_id] = f
+                    if f.is_final:
+                        final_feeds.add(f.game_id)
+                    if f.fetch != "unchanged":
+                        pending.feeds[f.game_id] = game_feed_row(f, season=season)
+
+            polled = True
+            delay = poll_delay(
+                games,
+                now=datetime.now(UTC),
+                live_s=live_s,
+                pregame_s=pregame_s,
+                idle_s=idle_s,
+            )
+        except CircuitOpenError as exc:
+            logger.warning(f"Stats API circuit open; pausing {exc.retry_in_s:.0f}s")
+            delay = max(live_s, exc.retry_in_s)
+        except Exception as exc:
+            logger.warning(f"Poll failed game_date={game_date}: {exc!r}")
+            delay = pregame_s
+
+        if pending.games or pending.feeds:
+            if pending.detected_at is None:
+                pending.detected_at = polled_at
+            game_rows, feed_rows = list(pending.games.values()), list(pending.feeds.values())
+            try:
+                await write(game_rows, feed_rows)
+            except Exception as exc:
+                logger.warning(f"Write failed, retrying next poll: {exc!r}")
+            else:
+                lag = time.monotonic() - pending.detected_at
+                max_lag = max(max_lag, lag)
+                games_written += len(game_rows)
+                feeds_written += len(feed_rows)
+                logger.info(
+                    f"Wrote {len(game_rows)} games, {len(feed_rows)} feeds "
+                    f"game_date={game_date} lag={lag:.2f}s"
+                )
+                pending = _Pending(games={}, feeds={})
+
+        if polled and not games:
+            stopped = "no_games"
+            break
+        if polled and all_final(games) and not pending.games and not pending.feeds:
+            if not feeds or all(g.game_id in final_feeds for g in games):
+                stopped = "all_final"
+                break
+            # The schedule says Final; wait for the last feeds to say so too.
+            delay = live_s
+        if stop.is_set():
+            stopped = "signal"
+            break
+
+        delay = min(delay, max(0.0, deadline - time.monotonic()))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except TimeoutError:
+            pass
+
+    logger.info(
+        f"Watch finished game_date={game_date} ({stopped}): {polls} polls, "
+        f"{games_written} games and {feeds_written} feeds written, max lag {max_lag:.2f}s"
+    )
+    return MlbWatchResult(
+        game_date=game_date,
+        games=len(games),
+        polls=polls,
+        games_written=games_written,
+        feeds_written=feeds_written,
+        max_lag_s=max_lag,
+        runtime_s=time.monotonic() - started,
+        stopped=stopped,
+    )
+
+
+def _install_stop_handlers(stop: asyncio.Event) -> None:
+    # Signal handlers can only be installed from the main thread (and not on Windows).
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass
+
+
+async def awatch_mlb_games(
+    *,
+    game_date: date | None = None,
+    season: int | None = None,
+    game_types: str = "R",
+    feeds: bool = False,
+    live_s: float = LIVE_POLL_S,
+    pregame_s: float = PREGAME_POLL_S,
+    idle_s: float = IDLE_POLL_S,
+    max_hours: float = 18.0,
+    max_concurrency: int = 8,
+    handle_signals: bool = True,
+) -> MlbWatchResult:
+    """Poll one day's MLB games and land score/status changes within seconds.
+
+    The day's schedule is polled at an interval tied to game state (see
+    `poll_delay`): every `live_s` while a game is live, every `pregame_s` close
+    to a first pitch, and otherwise sleeping until then. Only games whose status
+    or score changed since the last poll are written to raw.mlb_games, in one
+    short transaction per poll. With `feeds=True`, the live feeds of live games
+    are kept current in raw.mlb_game_feeds too, patched in memory from the
+    previous poll's version (see `MlbStatsApi.get_game_feed`).
+
+    Returns once every game is Final (or there are none), after `max_hours`, or
+    on SIGINT/SIGTERM (unless `handle_signals=False`, e.g. under an orchestrator
+    that handles them itself). A failed poll or write is retried on the next poll; rows
+    that failed to write are kept until they are written.
+    """
+
+    logger = get_run_logger()
+    game_date = game_date or date.today()
+    season = season or game_date.year
+    pool = get_pool(postgres_config())
+
+    def _prepare_sync(game_ids: list[int]) -> dict[int, dict[str, Any]]:
+        with pool.connection() as conn:
+            ensure_mlb_storage(conn, [season])
+            return stored_mlb_game_feeds(conn, season=season, game_ids=game_ids)
+
+    def _write_sync(game_rows: list[dict[str, Any]], feed_rows: list[dict[str, Any]]) -> None:
+        # A pooled connection per write: one lost to a server restart is replaced.
+        with pool.connection() as conn:
+            if game_rows:
+                upsert_rows(conn, MLB_GAMES, game_rows)
+            if feed_rows:
+                upsert_rows(conn, MLB_GAME_FEEDS, feed_rows)
+
+    api = MlbStatsApi()
+    try:
+        final_feeds: set[int] = set()
+        feed_priors: dict[int, MlbGameFeed] = {}
+        game_ids: list[int] = []
+        if feeds:
+            games = await api.alist_games(
+                season=season, game_types=game_types, start_date=game_date, end_date=game_date
+            )
+            game_ids = [g.game_id for g in games]
+        stored = await asyncio.to_thread(_prepare_sync, game_ids)
+        for game_id, row in stored.items():
+            if row["feed"] is None:
+                final_feeds.add(game_id)
+            else:
+                feed_priors[game_id] = MlbGameFeed(**row)
+
+        async def _write(game_rows: list[dict[str, Any]], feed_rows: list[dict[str, Any]]) -> None:
+            await asyncio.to_thread(_write_sync, game_rows, feed_rows)
+
+        stop = asyncio.Event()
+        if handle_signals:
+            _install_stop_handlers(stop)
+        logger.info(f"Watching MLB games game_date={game_date} season={season} feeds={feeds}")
+        return await _watch(
+            api,
+            _write,
+            game_date=game_date,
+            season=season,
+            game_types=game_types,
+            feeds=feeds,
+            final_feeds=final_feeds,
+            feed_priors=feed_priors,
+            live_s=live_s,
+            pregame_s=pregame_s,
+            idle_s=idle_s,
+            deadline=time.monotonic() + max_hours * 3600,
+            stop=stop,
+            max_concurrency=max_concurrency,
+        )
+    finally:
+        await api.aclose()
+        logger.info(f"Postgres pool {pool.stats().as_dict()}")
+
+
+def watch_mlb_games(**kwargs: Any) -> MlbWatchResult:
+    """Blocking form of `awatch_mlb_games` (runs its own event loop)."""
+
+    return asyncio.run(awatch_mlb_games(**kwargs))
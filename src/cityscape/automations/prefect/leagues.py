@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from prefect import flow
+
+from cityscape.automations.ingest.engine import ingest_leagues, league_jobs
+from cityscape.automations.prefect.transform import dbt_build_changes
+from cityscape.automations.transform.dbt import ChangeSet
+from cityscape.utils.db import LoadMethod
+from cityscape.utils.logger import get_run_logger
+
+
+@flow(name="leagues-ingestion", log_prints=False)
+def leagues_ingestion(
+    *,
+    seasons: dict[str, list[int]],
+    start_date: date | None = None,
+    end_date: date | None = None,
+    max_fetches: int = 8,
+    max_writers: int = 2,
+    load_method: LoadMethod = "batch",
+    transform: bool = False,
+) -> dict[str, Any]:
+    """Ingest several leagues at once, e.g. seasons={"mlb": [2026], "nba": [2025]}.
+
+    Every league season is fetched and loaded concurrently under one set of
+    HTTP/Postgres limits (see `cityscape.automations.ingest.engine.ingest_leagues`),
+    so the run takes about as long as its slowest league. A failed league
+    season is recorded in `failures` and does not stop the others.
+
+    `transform=True` then builds the dbt models of just the league seasons
+    whose rows changed (tag and `seasons` var), and skips dbt when none did;
+    per-model timings come back in `transform`.
+    """
+
+    logger = get_run_logger()
+    jobs = [
+        job
+        for league, league_seasons in seasons.items()
+        for job in league_jobs([league], league_seasons, start_date=start_date, end_date=end_date)
+    ]
+    logger.info(f"Starting league ingestion {seasons}")
+    results = ingest_leagues(
+        jobs, max_fetches=max_fetches, max_writers=max_writers, load_method=load_method
+    )
+
+    failures = [
+        {"league": r.league, "season": r.season, "error": r.error} for r in results if not r.ok
+    ]
+    logger.info(
+        f"Completed league ingestion: {len(results) - len(failures)} league seasons, "
+        f"{len(failures)} failed"
+    )
+    summary: dict[str, Any] = {
+        "processed": len(results) - len(failures),
+        "failed": len(failures),
+        "results": [r.as_dict() for r in results if r.ok],
+        "failures": failures,
+    }
+    if transform:
+        # A failed league season may still have committed some of its units.
+        changes = ChangeSet()
+        for r in results:
+            changes |= ChangeSet.of(r.league, r.season, r.tables.values())
+        summary["transform"] = dbt_build_changes(changes)
+    return summary
+
+
+if __name__ == "__main__":
+    # Handy local invocation: `uv run python -m cityscape.automations.prefect.leagues`
+    leagues_ingestion(seasons={"mlb": [2024], "nba": [2024]})
@@ -1,46 +1,160 @@
 from __future__ import annotations
 
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from typing import Any
 
 from prefect import flow
+from prefect.artifacts import create_table_artifact
+from prefect.task_runners import ThreadPoolTaskRunner
 
-from cityscape.automations.ingest.mlb import ingest_mlb_season
+from cityscape.automations.ingest.engine import LeagueIngestResult, LeagueJob, ingest_leagues
+from cityscape.automations.ingest.mlb import (
+    MLB_GAME_RAW_KEYS,
+    RAW_RETENTIONS,
+    MlbIngestResult,
+    RawRetention,
+    ingest_mlb_season,
+    prepare_mlb_seasons,
+)
+from cityscape.automations.ingest.mlb_live import (
+    IDLE_POLL_S,
+    LIVE_POLL_S,
+    PREGAME_POLL_S,
+    awatch_mlb_games,
+)
+from cityscape.automations.prefect.mlb_tasks import ingest_mlb_season_graph
+from cityscape.automations.prefect.transform import dbt_build_changes
+from cityscape.automations.transform.dbt import ChangeSet
+from cityscape.integrations.cache import default_response_cache
+from cityscape.integrations.leagues import ScheduleWindow
+from cityscape.integrations.mlb.connector import MlbConnector
 from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.utils.db import MLB_GAMES, MLB_TEAMS, LoadMethod, UpsertCounts
 from cityscape.utils.logger import get_run_logger
 
 
-@flow(name="mlb-season-ingestion", log_prints=False)
-def mlb_season_ingestion(*, season: int, game_types: str = "R") -> dict[str, int]:
+def _publish_metrics_artifact(result: MlbIngestResult, *, key: str) -> None:
+    """Attach the run's per-stage timings to the flow run as a table artifact."""
+
+    metrics = result.metrics
+    if metrics is None:
+        return
+    summary = metrics.as_dict()
+    create_table_artifact(
+        key=key,
+        table=[
+            {"stage": name, "seconds": round(seconds, 3)}
+            for name, seconds in sorted(metrics.stages.items(), key=lambda kv: -kv[1])
+        ],
+        description=(
+            f"MLB season {result.season}: {result.games.total} games in {summary['wall_s']}s "
+            f"({summary['rows_per_s']} rows/s), {metrics.http_requests} HTTP requests "
+            f"({metrics.http_retries} retries, {metrics.bytes_received} bytes), "
+            f"peak RSS {summary['peak_rss_mb']} MB"
+        ),
+    )
+
+
+# Threads for the fetch/transform/load tasks of `ingest_mlb_season_graph`.
+GRAPH_WORKERS = 8
+
+
+@flow(
+    name="mlb-season-ingestion",
+    log_prints=False,
+    task_runner=ThreadPoolTaskRunner(max_workers=GRAPH_WORKERS),
+)
+def mlb_season_ingestion(
+    *,
+    season: int,
+    game_types: str = "R",
+    load_method: LoadMethod = "batch",
+    max_concurrent_writers: int | None = None,
+    batch_size: int = 1000,
+    commit_every: int | None = None,
+    window: ScheduleWindow | None = None,
+    raw_retention: RawRetention = "full",
+    reload: bool = False,
+    transform: bool = False,
+) -> dict[str, Any]:
     """Prefect flow that ingests MLB season data into Postgres.
 
-    This wraps `ingest_mlb_season` so logs are attached to the Prefect run.
+    Runs as a task graph (see `cityscape.automations.prefect.mlb_tasks`): the
+    teams and each `window` of schedule (default a month) are fetched,
+    transformed and loaded as separate tasks, so the next window downloads
+    while the previous one loads, and each window commits on its own.
+
+    `reload=True` replaces the season's raw partitions instead of upserting
+    into them, and `commit_every` sets the commit interval; both need a single
+    connection for the whole season, so they run `ingest_mlb_season` instead.
+
+    `transform=True` then builds the season's MLB dbt models if any row changed
+    (see `dbt_build_changes`); the result's `transform` holds per-model timings.
     """
 
     logger = get_run_logger()
     logger.info(f"Starting MLB ingestion season={season} game_types={game_types}")
 
-    teams, games = ingest_mlb_season(season=season, game_types=game_types)
+    if reload or commit_every is not None:
+        result = ingest_mlb_season(
+            season=season,
+            game_types=game_types,
+            load_method=load_method,
+            max_concurrent_writers=max_concurrent_writers,
+            batch_size=batch_size,
+            commit_every=commit_every,
+            window=window,
+            raw_retention=raw_retention,
+            reload=reload,
+        )
+    else:
+        result = ingest_mlb_season_graph(
+            season=season,
+            game_types=game_types,
+            load_method=load_method,
+            max_concurrent_writers=max_concurrent_writers,
+            batch_size=batch_size,
+            window=window or "month",
+            raw_retention=raw_retention,
+        )
 
-    logger.info(f"Finished MLB ingestion season={season} teams={teams} games={games}")
-    return {"teams": teams, "games": games}
+    logger.info(f"Finished MLB ingestion season={season} teams={result.teams} games={result.games}")
+    _publish_metrics_artifact(result, key=f"mlb-ingest-{season}")
+    summary: dict[str, Any] = result.as_dict()
+    if transform:
+        changes = ChangeSet.of("mlb", season, [result.teams, result.games])
+        summary["transform"] = dbt_build_changes(changes)
+    return summary
 
 
-@flow(name="mlb-daily-ingestion", log_prints=False)
+@flow(
+    name="mlb-daily-ingestion",
+    log_prints=False,
+    task_runner=ThreadPoolTaskRunner(max_workers=GRAPH_WORKERS),
+)
 def mlb_daily_ingestion(
     *,
     season: int,
     game_types: str = "R",
     lookback_days: int = 2,
-) -> dict[str, int | str]:
+    load_method: LoadMethod = "batch",
+    raw_retention: RawRetention = "full",
+    transform: bool = False,
+) -> dict[str, Any]:
     """Daily MLB ingestion.
 
     - Skips automatically until the regular season start date.
-    - Loads a small rolling window (default 2 days) to handle late updates.
+    - Loads a small rolling window (default 2 days) to handle late updates,
+      as one fetch/transform/load pass of `ingest_mlb_season_graph`.
+    - With `transform=True`, builds the season's MLB dbt models when the window
+      changed any row, and skips dbt otherwise.
     """
 
     logger = get_run_logger()
 
-    api = MlbStatsApi()
+    api = MlbStatsApi(cache=default_response_cache())
     start, end = api.get_regular_season_bounds(season=season)
     today = date.today()
 
@@ -59,21 +173,41 @@ def mlb_daily_ingestion(
         f"Running MLB daily ingest season={season} game_types={game_types} window={window_start}..{window_end}"
     )
 
-    teams, games = ingest_mlb_season(
+    result = ingest_mlb_season_graph(
         season=season,
         game_types=game_types,
         start_date=window_start,
         end_date=window_end,
+        load_method=load_method,
+        raw_retention=raw_retention,
     )
+    _publish_metrics_artifact(result, key=f"mlb-daily-ingest-{season}")
 
-    return {
+    summary: dict[str, Any] = {
         "status": "ok",
-        "teams": teams,
-        "games": games,
-        "season": season,
+        **result.as_dict(),
         "window_start": window_start.isoformat(),
         "window_end": window_end.isoformat(),
     }
+    if transform:
+        changes = ChangeSet.of("mlb", season, [result.teams, result.games])
+        summary["transform"] = dbt_build_changes(changes)
+    return summary
+
+
+def _season_summary(result: LeagueIngestResult) -> dict[str, Any]:
+    teams = result.tables.get(MLB_TEAMS.table, UpsertCounts())
+    games = result.tables.get(MLB_GAMES.table, UpsertCounts())
+    return {
+        "teams": teams.total,
+        "games": games.total,
+        **teams.as_dict("teams_"),
+        **games.as_dict("games_"),
+        "requests": result.requests,
+        "units_skipped": result.skipped,
+        "responses_unchanged": result.unchanged,
+        "wall_s": round(result.wall_s, 3),
+    }
 
 
 @flow(name="mlb-multi-season-ingestion", log_prints=False)
@@ -82,38 +216,166 @@ def mlb_multi_season_ingestion(
     start_year: int,
     end_year: int,
     game_types: str = "R",
-) -> dict[str, int | list]:
+    load_method: LoadMethod = "copy",
+    max_concurrent_seasons: int = 1,
+    max_concurrent_writers: int = 1,
+    window: ScheduleWindow | None = None,
+    raw_retention: RawRetention = "full",
+    reload: bool = False,
+    max_fetches: int = 8,
+    refresh: bool = False,
+    transform: bool = False,
+) -> dict[str, Any]:
     """Ingest MLB data for multiple seasons from start_year to end_year (inclusive).
 
     Example: start_year=2020, end_year=2024 will ingest seasons 2020, 2021, 2022, 2023, 2024
+
+    Seasons run on the shared ingest engine (`cityscape.automations.ingest.engine`):
+    up to `max_concurrent_seasons` at once, `max_fetches` requests in flight and at
+    most `max_concurrent_writers` Postgres writers. Each request (the teams, or one
+    `window` of schedule, default a month) commits on its own and is recorded in
+    the ingest ledger, so rerunning an interrupted backfill only loads what is
+    missing or can still change; `refresh=True` fetches everything again.
+    A failed season is recorded in `failures` and does not stop the others.
+
+    `reload=True` instead runs a `mlb_season_ingestion` subflow per season, each
+    replacing the season's partitions in one transaction; it skips the ledger.
+
+    `transform=True` then runs one dbt build over the seasons that changed.
     """
 
+    if raw_retention not in RAW_RETENTIONS:
+        raise ValueError(
+            f"Unknown raw retention {raw_retention!r}; expected one of {RAW_RETENTIONS}"
+        )
+
     logger = get_run_logger()
-    logger.info(f"Starting multi-season ingestion: {start_year} to {end_year}")
+    logger.info(
+        f"Starting multi-season ingestion: {start_year} to {end_year} "
+        f"(seasons in flight={max_concurrent_seasons}, db writers={max_concurrent_writers})"
+    )
+
+    seasons = range(start_year, end_year + 1)
+    outcomes: dict[int, dict[str, Any] | str] = {}
+    if reload:
+
+        def _run_season(season: int) -> dict[str, Any]:
+            logger.info(f"Reloading season {season}...")
+            return mlb_season_ingestion(
+                season=season,
+                game_types=game_types,
+                load_method=load_method,
+                max_concurrent_writers=max_concurrent_writers,
+                window=window,
+                raw_retention=raw_retention,
+                reload=True,
+            )
+
+        prepare_mlb_seasons(seasons)
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrent_seasons)) as pool:
+            # Each worker gets its own copy of the run context so subflows attach to this run.
+            futures = {
+                season: pool.submit(contextvars.copy_context().run, _run_season, season)
+                for season in seasons
+            }
+        for season, future in futures.items():
+            try:
+                outcomes[season] = future.result()
+            except Exception as exc:
+                outcomes[season] = repr(exc)
+    else:
+        connector = MlbConnector(
+            MlbStatsApi(cache=default_response_cache()),
+            game_types=game_types,
+            window=window or "month",
+            raw_keys=None if raw_retention == "full" else MLB_GAME_RAW_KEYS,
+            archive=raw_retention == "archive",
+        )
+        results = ingest_leagues(
+            [LeagueJob(connector, season) for season in seasons],
+            max_fetches=max_fetches,
+            max_writers=max_concurrent_writers,
+            load_method=load_method,
+            max_jobs=max(1, max_concurrent_seasons),
+            refresh=refresh,
+        )
+        for r in results:
+            outcomes[r.season] = _season_summary(r) if r.ok else r.error
 
     results = []
+    failures = []
     total_teams = 0
     total_games = 0
+    total_games_changed = 0
+    changes = ChangeSet()
+
+    for season, result in outcomes.items():
+        if isinstance(result, str):
+            logger.error(f"Season {season} failed: {result}")
+            failures.append({"season": season, "error": result})
+            continue
 
-    for season in range(start_year, end_year + 1):
-        logger.info(f"Processing season {season}...")
-        result = mlb_season_ingestion(season=season, game_types=game_types)
-        
         total_teams += result["teams"]
         total_games += result["games"]
+        total_games_changed += result["games_inserted"] + result["games_updated"]
         results.append({"season": season, **result})
+        changed = [
+            UpsertCounts(result[f"{t}_inserted"], result[f"{t}_updated"])
+            for t in ("teams", "games")
+        ]
+        changes |= ChangeSet.of("mlb", season, changed)
 
     logger.info(
         f"Completed multi-season ingestion: {len(results)} seasons, "
-        f"{total_teams} total teams, {total_games} total games"
+        f"{total_teams} total teams, {total_games} total games ({total_games_changed} changed), "
+        f"{len(failures)} failed"
     )
 
-    return {
+    summary: dict[str, Any] = {
         "seasons_processed": len(results),
+        "seasons_failed": len(failures),
         "total_teams": total_teams,
         "total_games": total_games,
+        "total_games_changed": total_games_changed,
         "results": results,
+        "failures": failures,
     }
+    if transform:
+        summary["transform"] = dbt_build_changes(changes)
+    return summary
+
+
+@flow(name="mlb-live-watch", log_prints=False)
+async def mlb_live_watch(
+    *,
+    game_date: date | None = None,
+    game_types: str = "R",
+    feeds: bool = False,
+    live_s: float = LIVE_POLL_S,
+    pregame_s: float = PREGAME_POLL_S,
+    idle_s: float = IDLE_POLL_S,
+    max_hours: float = 18.0,
+) -> dict[str, int | float | str]:
+    """Long-running poller keeping today's MLB scores (and optionally live feeds) fresh.
+
+    Starts once a day and returns when every game is Final; see
+    `cityscape.automations.ingest.mlb_live.awatch_mlb_games`.
+    """
+
+    logger = get_run_logger()
+    logger.info(f"Starting MLB live watch game_date={game_date or date.today()} feeds={feeds}")
+    result = await awatch_mlb_games(
+        game_date=game_date,
+        game_types=game_types,
+        feeds=feeds,
+        live_s=live_s,
+        pregame_s=pregame_s,
+        idle_s=idle_s,
+        max_hours=max_hours,
+        # Prefect handles SIGTERM (cancellation) itself.
+        handle_signals=False,
+    )
+    return result.as_dict()
 
 
 if __name__ == "__main__":
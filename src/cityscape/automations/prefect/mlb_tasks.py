@@ -0,0 +1,312 @@
+"""Prefect tasks of the MLB season ingest: fetch, transform and load as separate steps.
+
+`ingest_mlb_season_graph` wires them into a graph per schedule window (the
+teams, then each week/month of schedule):
+
+    fetch-mlb-schedule[w] -> transform-mlb-games[w] -> load-mlb-chunks[w]
+
+Fetches and transforms run concurrently on the flow's task runner; loads run
+one at a time in window order (each waits for the previous one, so a game
+listed twice keeps its later entry), each committing its own transaction.
+So window w+1 downloads while window w is written.
+
+Retries are per task and tuned to the kind of work:
+
+- fetches (network): exponential backoff with jitter, not for client errors
+  such as a 404; their results are cached by an input hash (season, game
+  types, window), so a flow retry after a failed load does not call the API again
+- loads (Postgres): a short, fixed delay, only for lost connections,
+  deadlocks and serialization failures; a retry reuses the transformed rows
+- transforms: none (they are deterministic)
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import httpx
+import psycopg2
+from prefect import task
+from prefect.cache_policies import INPUTS, NO_CACHE, TASK_SOURCE
+from prefect.tasks import exponential_backoff
+
+from cityscape.automations.ingest.mlb import (
+    MLB_GAME_RAW_KEYS,
+    RAW_RETENTIONS,
+    MlbIngestResult,
+    RawBytes,
+    RawRetention,
+    prepare_mlb_seasons,
+    publish_metrics,
+)
+from cityscape.integrations.cache import default_response_cache
+from cityscape.integrations.http import RETRYABLE_STATUSES
+from cityscape.integrations.leagues import LoadChunk, ScheduleWindow
+from cityscape.integrations.mlb.batches import TeamBatch, iter_game_batches
+from cityscape.integrations.mlb.statsapi import CACHE_TTLS, MlbStatsApi
+from cityscape.utils.db import (
+    MLB_GAMES,
+    MLB_GAMES_ARCHIVE,
+    MLB_TEAMS,
+    LoadMethod,
+    UpsertCounts,
+    get_pool,
+    postgres_config,
+    upsert_columns,
+    write_slots,
+)
+from cityscape.utils.logger import get_run_logger
+from cityscape.utils.metrics import IngestMetrics, peak_rss_bytes
+
+__all__ = [
+    "MlbTransformed",
+    "fetch_mlb_schedule",
+    "fetch_mlb_teams",
+    "ingest_mlb_season_graph",
+    "load_mlb_chunks",
+    "transform_mlb_games",
+    "transform_mlb_teams",
+]
+
+# How long a fetched response may be reused by a rerun: past seasons do not
+# change, the current one only within the HTTP cache's schedule TTL.
+PAST_SEASON_CACHE = timedelta(days=30)
+CURRENT_SEASON_CACHE = timedelta(seconds=CACHE_TTLS["schedule"])
+
+
+def _fetch_cache_expiration(season: int) -> timedelta:
+    return PAST_SEASON_CACHE if season < date.today().year else CURRENT_SEASON_CACHE
+
+
+def _exception(state: Any) -> BaseException | None:
+    exc = state.result(raise_on_failure=False)
+    return exc if isinstance(exc, BaseException) else None
+
+
+def _retry_network(task: Any, task_run: Any, state: Any) -> bool:
+    """Retry a fetch unless the API rejected the request itself (4xx other than 408/425/429)."""
+
+    exc = _exception(state)
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUSES
+    return True
+
+
+def _retry_db(task: Any, task_run: Any, state: Any) -> bool:
+    """Retry a load only when Postgres dropped the connection or aborted the transaction."""
+
+    # Deadlocks and serialization failures are OperationalError subclasses.
+    return isinstance(_exception(state), (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+
+_FETCH_OPTIONS: dict[str, Any] = {
+    "cache_policy": INPUTS + TASK_SOURCE,
+    "persist_result": True,
+    "retries": 3,
+    "retry_delay_seconds": exponential_backoff(backoff_factor=10),
+    "retry_jitter_factor": 0.5,
+    "retry_condition_fn": _retry_network,
+}
+
+
+@task(name="fetch-mlb-teams", **_FETCH_OPTIONS)
+def fetch_mlb_teams(season: int) -> dict[str, Any]:
+    return MlbStatsApi(cache=default_response_cache()).get_teams_json(season=season)
+
+
+@task(name="fetch-mlb-schedule", **_FETCH_OPTIONS)
+def fetch_mlb_schedule(
+    season: int, game_types: str, start_date: date | None, end_date: date | None
+) -> dict[str, Any]:
+    api = MlbStatsApi(cache=default_response_cache())
+    return api.get_schedule_json(
+        season=season, game_types=game_types, start_date=start_date, end_date=end_date
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class MlbTransformed:
+    """A response parsed into load chunks, with its raw payload sizes and parse time."""
+
+    chunks: list[LoadChunk]
+    raw_bytes: RawBytes = RawBytes()
+    seconds: float = 0.0
+
+
+@task(name="transform-mlb-teams", cache_policy=NO_CACHE)
+def transform_mlb_teams(payload: dict[str, Any], *, season: int) -> MlbTransformed:
+    started = time.perf_counter()
+    batch = TeamBatch.from_payload(payload, season=season)
+    chunks = [LoadChunk(MLB_TEAMS, batch.columns())]
+    return MlbTransformed(chunks, seconds=time.perf_counter() - started)
+
+
+@task(name="transform-mlb-games", cache_policy=NO_CACHE)
+def transform_mlb_games(
+    payload: dict[str, Any],
+    *,
+    season: int,
+    batch_size: int = 1000,
+    raw_keys: Sequence[str] | None = None,
+    archive: bool = False,
+) -> MlbTransformed:
+    started = time.perf_counter()
+    chunks: list[LoadChunk] = []
+    raw_bytes = RawBytes()
+    for batch in iter_game_batches(
+        [payload], season=season, batch_size=batch_size, raw_keys=raw_keys, archive=archive
+    ):
+        chunks.append(LoadChunk(MLB_GAMES, batch.columns()))
+        if batch.archive is not None:
+            chunks.append(LoadChunk(MLB_GAMES_ARCHIVE, batch.archive_columns()))
+        raw_bytes += RawBytes(
+            rows=len(batch),
+            before=batch.raw_bytes_before,
+            after=batch.raw_bytes_after,
+            archived=batch.archive_bytes,
+        )
+    return MlbTransformed(chunks, raw_bytes, time.perf_counter() - started)
+
+
+@dataclass(frozen=True, slots=True)
+class _Loaded:
+    tables: dict[str, UpsertCounts] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+@task(
+    name="load-mlb-chunks",
+    cache_policy=NO_CACHE,
+    retries=2,
+    retry_delay_seconds=5,
+    retry_jitter_factor=0.5,
+    retry_condition_fn=_retry_db,
+)
+def load_mlb_chunks(
+    transformed: MlbTransformed,
+    *,
+    load_method: LoadMethod = "batch",
+    max_concurrent_writers: int | None = None,
+) -> _Loaded:
+    """Upsert one response's chunks and commit them together."""
+
+    started = time.perf_counter()
+    tables: dict[str, UpsertCounts] = {}
+    slots = write_slots(max_concurrent_writers) if max_concurrent_writers else nullcontext()
+    with slots, get_pool(postgres_config()).connection() as conn:
+        for chunk in transformed.chunks:
+            counts = upsert_columns(conn, chunk.target, chunk.columns, method=load_method)
+            tables[chunk.target.table] = tables.get(chunk.target.table, UpsertCounts()) + counts
+    return _Loaded(tables, time.perf_counter() - started)
+
+
+def ingest_mlb_season_graph(
+    *,
+    season: int,
+    game_types: str = "R",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    window: ScheduleWindow | None = None,
+    load_method: LoadMethod = "batch",
+    max_concurrent_writers: int | None = None,
+    batch_size: int = 1000,
+    raw_retention: RawRetention = "full",
+    raw_keys: Sequence[str] = MLB_GAME_RAW_KEYS,
+) -> MlbIngestResult:
+    """Run the season (or [start_date, end_date]) as fetch/transform/load tasks.
+
+    Must be called inside a flow; concurrency comes from the flow's task
+    runner. Lands the same rows as `ingest_mlb_season`, but commits per
+    response instead of once per season. `window=None` fetches the schedule in
+    one request. The result's metrics report busy time per stage, which can
+    add up to more than the wall time since stages overlap.
+    """
+
+    if raw_retention not in RAW_RETENTIONS:
+        raise ValueError(
+            f"Unknown raw retention {raw_retention!r}; expected one of {RAW_RETENTIONS}"
+        )
+
+    logger = get_run_logger()
+    started = time.perf_counter()
+    api = MlbStatsApi(cache=default_response_cache())
+    http_before = api.http_stats()
+
+    spans = [(start_date, end_date)]
+    if window is not None:
+        spans = api.season_windows(
+            season=season, start_date=start_date, end_date=end_date, window=window
+        )
+    logger.info(
+        f"Ingesting MLB season={season} game_types={game_types} as {len(spans)} schedule "
+        f"request(s) start_date={start_date} end_date={end_date}"
+    )
+    # Partition DDL commits before any load starts.
+    prepare_mlb_seasons([season])
+
+    expiration = _fetch_cache_expiration(season)
+    teams = fetch_mlb_teams.with_options(cache_expiration=expiration).submit(season)
+    fetch = fetch_mlb_schedule.with_options(cache_expiration=expiration)
+    schedules = [fetch.submit(season, game_types, start, end) for start, end in spans]
+
+    transformed = [transform_mlb_teams.submit(teams, season=season)]
+    transformed += [
+        transform_mlb_games.submit(
+            payload,
+            season=season,
+            batch_size=batch_size,
+            raw_keys=None if raw_retention == "full" else raw_keys,
+            archive=raw_retention == "archive",
+        )
+        for payload in schedules
+    ]
+
+    loads = []
+    for parsed in transformed:
+        loads.append(
+            load_mlb_chunks.submit(
+                parsed,
+                load_method=load_method,
+                max_concurrent_writers=max_concurrent_writers,
+                wait_for=loads[-1:],
+            )
+        )
+
+    tables: dict[str, UpsertCounts] = {}
+    load_s = 0.0
+    for future in loads:
+        loaded = future.result()
+        load_s += loaded.seconds
+        for table, counts in loaded.tables.items():
+            tables[table] = tables.get(table, UpsertCounts()) + counts
+    parsed = [future.result() for future in transformed]
+    raw_bytes = sum((p.raw_bytes for p in parsed), RawBytes())
+
+    games = tables.get(MLB_GAMES.table, UpsertCounts())
+    http = api.http_stats() - http_before
+    metrics = IngestMetrics(
+        wall_s=time.perf_counter() - started,
+        stages={"transform": sum(p.seconds for p in parsed), "load": load_s},
+        rows=games.total,
+        http_requests=http.requests,
+        http_retries=http.retries,
+        bytes_received=http.bytes_received,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+    result = MlbIngestResult(
+        season=season,
+        teams=tables.get(MLB_TEAMS.table, UpsertCounts()),
+        games=games,
+        raw_retention=raw_retention,
+        raw_bytes=raw_bytes,
+        metrics=metrics,
+    )
+    logger.info(f"Ingest complete season={season} teams={result.teams} games={result.games}")
+    logger.info(f"Ingest metrics season={season} {metrics.as_dict()}")
+    publish_metrics(result)
+    return result
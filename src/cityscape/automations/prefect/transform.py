@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any
+
+from prefect import task
+from prefect.artifacts import create_table_artifact
+from prefect.cache_policies import NO_CACHE
+
+from cityscape.automations.transform.dbt import ChangeSet, build_changes
+from cityscape.utils.logger import get_run_logger
+
+
+@task(name="dbt-build-changes", cache_policy=NO_CACHE)
+def dbt_build_changes(changes: ChangeSet) -> dict[str, Any]:
+    """Build the dbt models of the league seasons in `changes`; skipped when it is empty.
+
+    Per-model timings are returned and attached to the run as a table
+    artifact. A failed build fails the task, so the ingest's flow run shows
+    it. The raw rows stay committed, and the next build that covers those
+    seasons (or `make dbt-run`) picks them up, as the dbt watermark is per season.
+    """
+
+    logger = get_run_logger()
+    if not changes:
+        logger.info("No rows changed; skipping dbt")
+        return build_changes(changes).as_dict()
+
+    result = build_changes(changes)
+    create_table_artifact(
+        key="dbt-build-changes",
+        table=[m.as_dict() for m in sorted(result.models, key=lambda m: -m.seconds)],
+        description=(
+            f"dbt build {result.status} for {result.changes.as_dict()} in {result.wall_s:.1f}s"
+        ),
+    )
+    if result.error is not None:
+        raise RuntimeError(f"dbt build failed for {result.changes.as_dict()}: {result.error}")
+    return result.as_dict()
@@ -0,0 +1,157 @@
+"""Change-scoped dbt builds: rebuild only the leagues and seasons an ingest changed.
+
+Ingests report a `ChangeSet` (league -> seasons with rows inserted or
+updated). `build_changes` turns it into an in-process `dbt build` of the
+incremental models tagged with those leagues, with `--vars '{"seasons": [...]}'`
+so each model only reads the changed seasons' raw partitions (see
+`season_scope` in dbt/macros/incremental.sql). Nothing changed, nothing runs.
+
+Leagues that changed the same seasons share one invocation; the others run
+one after another (dbtRunner is not safe to call concurrently).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from cityscape.utils.db import UpsertCounts
+from cityscape.utils.logger import get_run_logger
+from cityscape.utils.settings import get_settings
+
+__all__ = ["ChangeSet", "DbtBuildResult", "ModelTiming", "build_changes", "dbt_build_args"]
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeSet:
+    """League seasons whose raw rows an ingest inserted or updated."""
+
+    seasons: Mapping[str, frozenset[int]] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, league: str, season: int, counts: Iterable[UpsertCounts]) -> ChangeSet:
+        """`league`'s `season` if any of `counts` changed a row, else nothing."""
+
+        changed = any(c.changed for c in counts)
+        return cls({league: frozenset({season})} if changed else {})
+
+    def __or__(self, other: ChangeSet) -> ChangeSet:
+        merged = dict(self.seasons)
+        for league, seasons in other.seasons.items():
+            merged[league] = merged.get(league, frozenset()) | seasons
+        return ChangeSet(merged)
+
+    def __bool__(self) -> bool:
+        return any(self.seasons.values())
+
+    def as_dict(self) -> dict[str, list[int]]:
+        return {league: sorted(s) for league, s in sorted(self.seasons.items()) if s}
+
+
+@dataclass(frozen=True, slots=True)
+class ModelTiming:
+    """One node of a dbt build: how it ended and how long it took."""
+
+    name: str
+    status: str
+    seconds: float
+    rows: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "model": self.name,
+            "status": self.status,
+            "seconds": round(self.seconds, 3),
+            "rows": self.rows,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class DbtBuildResult:
+    changes: ChangeSet
+    invocations: tuple[tuple[str, ...], ...] = ()
+    models: tuple[ModelTiming, ...] = ()
+    wall_s: float = 0.0
+    error: str | None = None
+
+    @property
+    def status(self) -> str:
+        if not self.invocations:
+            return "skipped"
+        return "failed" if self.error is not None else "ok"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "changes": self.changes.as_dict(),
+            "invocations": [" ".join(args) for args in self.invocations],
+            "wall_s": round(self.wall_s, 3),
+            "models": [m.as_dict() for m in self.models],
+            "error": self.error,
+        }
+
+
+def dbt_build_args(leagues: Iterable[str], seasons: Iterable[int]) -> list[str]:
+    """`dbt build` arguments for the incremental models of `leagues`, limited to `seasons`."""
+
+    select = [f"tag:{league},config.materialized:incremental" for league in sorted(leagues)]
+    return ["build", "--select", *select, "--vars", json.dumps({"seasons": sorted(seasons)})]
+
+
+def _timings(result: Any) -> list[ModelTiming]:
+    timings = []
+    for r in getattr(result, "results", None) or ():
+        rows = (r.adapter_response or {}).get("rows_affected")
+        timings.append(ModelTiming(r.node.name, str(r.status), r.execution_time or 0.0, rows))
+    return timings
+
+
+def build_changes(changes: ChangeSet, *, project_dir: str | None = None) -> DbtBuildResult:
+    """Run `dbt build` in-process for what `changes` touched; skipped when empty.
+
+    `project_dir` defaults to `CITYSCAPE_DBT_PROJECT_DIR`, else `dbt`. Profiles
+    are found the usual dbt way (`DBT_PROFILES_DIR`, then ~/.dbt). Stops at the
+    first failed invocation and reports its error; models built before it keep
+    their timings.
+    """
+
+    if not changes:
+        return DbtBuildResult(changes)
+
+    from dbt.cli.main import dbtRunner
+
+    logger = get_run_logger()
+    project_dir = project_dir or get_settings().dbt_project_dir or "dbt"
+    by_seasons: dict[frozenset[int], list[str]] = defaultdict(list)
+    for league, seasons in changes.seasons.items():
+        if seasons:
+            by_seasons[seasons].append(league)
+
+    started = time.perf_counter()
+    invocations: list[tuple[str, ...]] = []
+    models: list[ModelTiming] = []
+    error = None
+    runner = dbtRunner()
+    for seasons, leagues in sorted(by_seasons.items(), key=lambda kv: sorted(kv[1])):
+        args = dbt_build_args(leagues, seasons)
+        invocations.append(tuple(args))
+        logger.info(f"Running dbt {' '.join(args)}")
+        res = runner.invoke([*args, "--project-dir", project_dir])
+        models += _timings(res.result)
+        if not res.success:
+            failed = [m.name for m in models if m.status in ("error", "fail")]
+            error = repr(res.exception) if res.exception else f"dbt build failed: {failed}"
+            break
+
+    result = DbtBuildResult(
+        changes, tuple(invocations), tuple(models), time.perf_counter() - started, error
+    )
+    logger.info(
+        f"dbt build {result.status} in {result.wall_s:.1f}s for {changes.as_dict()}: "
+        + ", ".join(f"{m.name}={m.seconds:.2f}s" for m in models)
+    )
+    return result
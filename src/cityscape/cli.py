@@ -1,9 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import sys
+from datetime import date
+from typing import TYPE_CHECKING
 
 from cityscape import __version__
-from cityscape.automations.ingest.mlb import ingest_mlb_season
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Subcommands import their dependencies (httpx, psycopg2, Prefect via the
+# logger) when they run, so `--version`, `--help` and `hello` start fast. The
+# choices below mirror the tuples next to the code that validates them
+# (db.LOAD_METHODS, leagues.SCHEDULE_WINDOWS, ingest.RAW_RETENTIONS,
+# parquet.COMPRESSIONS, leagues.LEAGUES) for the same reason; tests/test_cli.py
+# keeps them in sync.
+LEAGUES: tuple[str, ...] = ("mlb", "nba")
+LOAD_METHODS: tuple[str, ...] = ("batch", "copy")
+SCHEDULE_WINDOWS: tuple[str, ...] = ("week", "month")
+RAW_RETENTIONS: tuple[str, ...] = ("full", "projected", "archive")
+COMPRESSIONS: tuple[str, ...] = ("zstd", "snappy", "gzip", "none")
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -18,17 +35,432 @@ def _build_parser() -> argparse.ArgumentParser:
     ingest = sub.add_parser("ingest", help="Ingest raw data from external APIs")
     ingest_sub = ingest.add_subparsers(dest="ingest_target", required=True)
 
-    ingest_mlb = ingest_sub.add_parser("mlb", help="Fetch MLB season data and land it into Postgres")
+    ingest_mlb = ingest_sub.add_parser(
+        "mlb", help="Fetch MLB season data and land it into Postgres"
+    )
     ingest_mlb.add_argument("--season", type=int, required=True, help="Season year, e.g. 2024")
     ingest_mlb.add_argument(
         "--game-types",
         default="R",
         help="Comma-separated gameTypes for MLB Stats API (default: R=regular season)",
     )
+    ingest_mlb.add_argument(
+        "--load-method",
+        choices=LOAD_METHODS,
+        default="batch",
+        help="Postgres write path: batch (row upserts) or copy (COPY + set-based merge)",
+    )
+    ingest_mlb.add_argument(
+        "--batch-size", type=int, default=1000, help="Games written per batch (default: 1000)"
+    )
+    ingest_mlb.add_argument(
+        "--commit-every",
+        type=int,
+        default=None,
+        help="Commit after every N game batches (default: one commit at the end)",
+    )
+    ingest_mlb.add_argument(
+        "--window",
+        choices=SCHEDULE_WINDOWS,
+        default=None,
+        help="Fetch the schedule as concurrent week/month windows (default: one request)",
+    )
+    ingest_mlb.add_argument(
+        "--max-concurrent-windows",
+        type=int,
+        default=4,
+        help="Schedule windows fetched at once when --window is set (default: 4)",
+    )
+    ingest_mlb.add_argument(
+        "--raw-retention",
+        choices=RAW_RETENTIONS,
+        default="full",
+        help="Raw payload kept in raw.mlb_games: full, projected, "
+        "or archive (projected + compressed copy)",
+    )
+    ingest_mlb.add_argument(
+        "--reload",
+        action="store_true",
+        help="Drop and reload the season by swapping in freshly loaded raw partitions",
+    )
+    ingest_mlb.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Profile the run with cProfile: save stats to PATH "
+        "(default: cityscape-mlb-<season>.prof) and print the top functions by cumulative time",
+    )
+
+    ingest_feeds = ingest_sub.add_parser(
+        "mlb-feeds", help="Land the live game feeds of one day's started MLB games into Postgres"
+    )
+    ingest_feeds.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Game date, YYYY-MM-DD (default: today)",
+    )
+    ingest_feeds.add_argument(
+        "--season", type=int, default=None, help="Season (default: the date's year)"
+    )
+    ingest_feeds.add_argument(
+        "--game-types", default="R", help="Comma-separated gameTypes (default: R)"
+    )
+    ingest_feeds.add_argument(
+        "--max-concurrency", type=int, default=8, help="Feeds fetched at once (default: 8)"
+    )
+    ingest_feeds.add_argument(
+        "--load-method",
+        choices=LOAD_METHODS,
+        default="batch",
+        help="Postgres write path: batch (row upserts) or copy (COPY + set-based merge)",
+    )
+
+    ingest_leagues = ingest_sub.add_parser(
+        "leagues",
+        help="Ingest several leagues' seasons concurrently on the shared ingest engine",
+    )
+    ingest_leagues.add_argument(
+        "--league",
+        choices=LEAGUES,
+        action="append",
+        default=[],
+        help="League to ingest (repeatable; default: all)",
+    )
+    ingest_leagues.add_argument(
+        "--season", type=int, action="append", required=True, help="Season year (repeatable)"
+    )
+    ingest_leagues.add_argument(
+        "--start-date", type=date.fromisoformat, default=None, help="Only games from YYYY-MM-DD"
+    )
+    ingest_leagues.add_argument(
+        "--end-date", type=date.fromisoformat, default=None, help="Only games until YYYY-MM-DD"
+    )
+    ingest_leagues.add_argument(
+        "--max-fetches", type=int, default=8, help="Requests in flight across leagues (default: 8)"
+    )
+    ingest_leagues.add_argument(
+        "--max-writers", type=int, default=2, help="Concurrent Postgres writers (default: 2)"
+    )
+    ingest_leagues.add_argument(
+        "--load-method",
+        choices=LOAD_METHODS,
+        default="batch",
+        help="Postgres write path: batch (row upserts) or copy (COPY + set-based merge)",
+    )
+    ingest_leagues.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Fetch every request again, even those the ingest ledger has as loaded and settled",
+    )
+
+    ingest_progress = ingest_sub.add_parser(
+        "progress", help="Show what the ingest ledger has loaded, per league season"
+    )
+    ingest_progress.add_argument(
+        "--league", choices=LEAGUES, action="append", default=[], help="League (repeatable)"
+    )
+    ingest_progress.add_argument(
+        "--season", type=int, action="append", default=[], help="Season year (repeatable)"
+    )
+
+    migrate = sub.add_parser(
+        "migrate",
+        help="Partition raw tables left unpartitioned by older versions "
+        "(drops the views over them; rerun dbt afterwards)",
+    )
+    migrate.add_argument(
+        "--league", choices=LEAGUES, action="append", default=[], help="League (repeatable)"
+    )
+
+    watch = sub.add_parser("watch", help="Poll live data until it stops changing")
+    watch_sub = watch.add_subparsers(dest="watch_target", required=True)
+
+    watch_mlb = watch_sub.add_parser(
+        "mlb", help="Poll one day's MLB games and land score/status changes until all are Final"
+    )
+    watch_mlb.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Game date, YYYY-MM-DD (default: today)",
+    )
+    watch_mlb.add_argument("--season", type=int, default=None, help="Default: the date's year")
+    watch_mlb.add_argument("--game-types", default="R", help="Comma-separated gameTypes")
+    watch_mlb.add_argument(
+        "--feeds", action="store_true", help="Also keep live feeds current in raw.mlb_game_feeds"
+    )
+    watch_mlb.add_argument(
+        "--live-interval", type=float, default=None, help="Seconds between polls during play"
+    )
+    watch_mlb.add_argument(
+        "--pregame-interval", type=float, default=None, help="Seconds between polls near a start"
+    )
+    watch_mlb.add_argument(
+        "--idle-interval", type=float, default=None, help="Longest sleep before the first game"
+    )
+    watch_mlb.add_argument(
+        "--max-hours", type=float, default=18.0, help="Give up after this long (default: 18)"
+    )
+
+    export = sub.add_parser(
+        "export", help="Stream Postgres tables into season-partitioned Parquet datasets"
+    )
+    export.add_argument(
+        "tables",
+        nargs="*",
+        help="Tables to export; schema.* means every table of a schema "
+        "(default: raw.mlb_games core.*)",
+    )
+    export.add_argument("--out", required=True, help="Output directory")
+    export.add_argument(
+        "--season",
+        type=int,
+        action="append",
+        default=[],
+        help="Only export this season (repeatable; default: all)",
+    )
+    export.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Append only rows loaded since the last export to --out",
+    )
+    export.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=50_000,
+        help="Rows per cursor fetch and Parquet row group (default: 50000)",
+    )
+    export.add_argument("--compression", choices=COMPRESSIONS, default="zstd")
+
+    serve = sub.add_parser(
+        "serve", help="Serve the core game tables over a cached, read-only local HTTP API"
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765)")
+    serve.add_argument(
+        "--schema",
+        default="core",
+        help="Schema of the core_<league>__games models (default: core)",
+    )
+    serve.add_argument(
+        "--page-size", type=int, default=1000, help="Games per page by default (default: 1000)"
+    )
+    serve.add_argument(
+        "--cache-entries", type=int, default=256, help="Pages kept in the result cache"
+    )
+    serve.add_argument("--cache-mb", type=int, default=64, help="Result cache size cap in MiB")
+    serve.add_argument(
+        "--cache-ttl", type=float, default=300.0, help="Seconds a cached page is served at most"
+    )
+    serve.add_argument(
+        "--watermark-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks of a table's loaded_at high-water mark (default: 1)",
+    )
 
     return parser
 
 
+def _dump_profile(profiler: cProfile.Profile, path: str) -> None:
+    import pstats
+
+    profiler.dump_stats(path)
+    print(f"profile written to {path} (inspect with: python -m pstats {path})", file=sys.stderr)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+
+
+def _ingest_mlb(args: argparse.Namespace) -> int:
+    from cityscape.automations.ingest.mlb import ingest_mlb_season
+
+    profiler = None
+    if args.profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        result = ingest_mlb_season(
+            season=args.season,
+            game_types=args.game_types,
+            load_method=args.load_method,
+            batch_size=args.batch_size,
+            commit_every=args.commit_every,
+            window=args.window,
+            max_concurrent_windows=args.max_concurrent_windows,
+            raw_retention=args.raw_retention,
+            reload=args.reload,
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _dump_profile(profiler, args.profile or f"cityscape-mlb-{args.season}.prof")
+
+    print(
+        f"ingested mlb season={args.season}: "
+        f"teams={result.teams.total} ({result.teams.changed} changed) "
+        f"games={result.games.total} ({result.games.changed} changed)"
+    )
+    if result.metrics is not None:
+        stages = ", ".join(
+            f"{name}={seconds:.2f}s"
+            for name, seconds in sorted(result.metrics.stages.items(), key=lambda kv: -kv[1])
+        )
+        metrics = result.metrics
+        print(f"  {metrics.wall_s:.2f}s total, {metrics.rows_per_s:.0f} rows/s: {stages}")
+    return 0
+
+
+def _ingest_mlb_feeds(args: argparse.Namespace) -> int:
+    from cityscape.automations.ingest.mlb import ingest_mlb_game_feeds
+
+    game_date = args.date or date.today()
+    result = ingest_mlb_game_feeds(
+        game_date=game_date,
+        season=args.season,
+        game_types=args.game_types,
+        max_concurrency=args.max_concurrency,
+        load_method=args.load_method,
+    )
+    print(
+        f"ingested mlb game feeds date={game_date}: "
+        f"{result.full} full, {result.patched} patched, {result.unchanged} unchanged, "
+        f"{result.skipped_final} already final; {result.feeds.changed} written"
+    )
+    return 0
+
+
+def _ingest_leagues(args: argparse.Namespace) -> int:
+    from cityscape.automations.ingest.engine import ingest_leagues, league_jobs
+
+    jobs = league_jobs(
+        args.league or LEAGUES,
+        args.season,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+    results = ingest_leagues(
+        jobs,
+        max_fetches=args.max_fetches,
+        max_writers=args.max_writers,
+        load_method=args.load_method,
+        refresh=args.refresh,
+    )
+    for r in results:
+        if r.error is not None:
+            print(f"failed {r.league} season={r.season}: {r.error}")
+            continue
+        tables = ", ".join(
+            f"{table}={counts.total} ({counts.changed} changed)"
+            for table, counts in r.tables.items()
+        )
+        print(
+            f"ingested {r.league} season={r.season} in {r.wall_s:.1f}s: {tables or 'nothing'}; "
+            f"{r.requests} requests, {r.skipped} settled units skipped"
+        )
+    return 0 if all(r.ok for r in results) else 1
+
+
+def _ingest_progress(args: argparse.Namespace) -> int:
+    from cityscape.automations.ingest.ledger import ensure_ledger, ledger_progress
+    from cityscape.utils.db import get_pool, postgres_config
+
+    with get_pool(postgres_config()).connection() as conn:
+        ensure_ledger(conn)
+        progress = ledger_progress(conn, leagues=args.league, seasons=args.season)
+    if not progress:
+        print("no ingest units recorded")
+        return 0
+    for p in progress:
+        last = f", last loaded {p.last_finished_at:%Y-%m-%d %H:%M}" if p.last_finished_at else ""
+        print(
+            f"{p.league} season={p.season}: {p.done}/{p.units} units done "
+            f"({p.settled} settled), {p.failed} failed, {p.pending} pending, {p.rows} rows{last}"
+        )
+        if p.last_error:
+            print(f"  last error: {p.last_error}")
+    return 0 if all(p.failed == 0 for p in progress) else 1
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    from cityscape.integrations.leagues import get_connector
+    from cityscape.utils.db import get_pool, migrate_raw_tables, postgres_config
+
+    tables = [t for league in args.league or LEAGUES for t in get_connector(league).tables]
+    with get_pool(postgres_config()).connection() as conn:
+        moved = migrate_raw_tables(conn, tables)
+    if not moved:
+        print("raw tables are already partitioned")
+        return 0
+    for table, rows in moved.items():
+        print(f"partitioned {table} by season: {rows} rows moved")
+    print("views over these tables were dropped; rebuild them with `make dbt-run`")
+    return 0
+
+
+def _watch_mlb(args: argparse.Namespace) -> int:
+    from cityscape.automations.ingest.mlb_live import watch_mlb_games
+
+    intervals = {
+        "live_s": args.live_interval,
+        "pregame_s": args.pregame_interval,
+        "idle_s": args.idle_interval,
+    }
+    result = watch_mlb_games(
+        game_date=args.date,
+        season=args.season,
+        game_types=args.game_types,
+        feeds=args.feeds,
+        max_hours=args.max_hours,
+        **{k: v for k, v in intervals.items() if v is not None},
+    )
+    print(
+        f"watched mlb games date={result.game_date} ({result.stopped}): "
+        f"{result.polls} polls, {result.games_written} games and {result.feeds_written} feeds "
+        f"written, max lag {result.max_lag_s:.2f}s"
+    )
+    return 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    from cityscape.automations.export.parquet import DEFAULT_TABLES, export_tables
+
+    results = export_tables(
+        args.out,
+        tables=args.tables or DEFAULT_TABLES,
+        seasons=args.season,
+        incremental=args.incremental,
+        chunk_rows=args.chunk_rows,
+        compression=args.compression,
+    )
+    for r in results:
+        mode = "incremental" if r.incremental else "full"
+        print(f"exported {r.table}: {r.rows} rows, {r.files} files ({mode}, {r.seconds:.1f}s)")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from cityscape.serve.cache import ResultCache
+    from cityscape.serve.server import serve
+
+    serve(
+        args.host,
+        args.port,
+        schema=args.schema,
+        page_size=args.page_size,
+        watermark_s=args.watermark_interval,
+        cache=ResultCache(
+            max_entries=args.cache_entries,
+            max_bytes=args.cache_mb * 1024 * 1024,
+            ttl_s=args.cache_ttl,
+        ),
+    )
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
@@ -38,9 +470,28 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "ingest" and args.ingest_target == "mlb":
-        teams, games = ingest_mlb_season(season=args.season, game_types=args.game_types)
-        print(f"ingested mlb season={args.season}: teams={teams} games={games}")
-        return 0
+        return _ingest_mlb(args)
+
+    if args.command == "ingest" and args.ingest_target == "mlb-feeds":
+        return _ingest_mlb_feeds(args)
+
+    if args.command == "ingest" and args.ingest_target == "leagues":
+        return _ingest_leagues(args)
+
+    if args.command == "ingest" and args.ingest_target == "progress":
+        return _ingest_progress(args)
+
+    if args.command == "migrate":
+        return _migrate(args)
+
+    if args.command == "watch" and args.watch_target == "mlb":
+        return _watch_mlb(args)
+
+    if args.command == "export":
+        return _export(args)
+
+    if args.command == "serve":
+        return _serve(args)
 
     parser.print_help()
     return 0
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from cityscape.utils.payloads import loads_json
+from cityscape.utils.settings import get_settings
+
+__all__ = ["CacheStats", "ResponseCache", "cache_key", "default_response_cache"]
+
+
+def cache_key(endpoint: str, params: dict[str, Any] | None = None) -> str:
+    """Canonical key for an endpoint call, independent of parameter order."""
+
+    items = sorted((k, str(v)) for k, v in (params or {}).items())
+    return f"{endpoint}?{urlencode(items)}"
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "size_bytes": self.size_bytes,
+        }
+
+
+class ResponseCache:
+    """Size-bounded, on-disk JSON response cache backed by SQLite.
+
+    Entries are stored zlib-compressed with an optional expiry; `ttl_s=None`
+    means the entry never expires (immutable data). When the stored size
+    exceeds `max_bytes`, least-recently-used entries are evicted. One instance
+    can be shared between threads; several processes may share the file.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute(
+            """
+            create table if not exists responses (
+              key text primary key,
+              body blob not null,
+              size integer not null,
+              stored_at real not null,
+              expires_at real null,
+              last_access real not null
+            )
+            """
+        )
+        self._db.execute(
+            "create index if not exists responses_last_access on responses (last_access)"
+        )
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "select body, expires_at from responses where key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._db.execute("delete from responses where key = ?", (key,))
+                self._misses += 1
+                return None
+
+            self._db.execute("update responses set last_access = ? where key = ?", (now, key))
+            self._hits += 1
+        return loads_json(zlib.decompress(row[0]))
+
+    def put(self, key: str, payload: dict[str, Any], *, ttl_s: float | None) -> None:
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        if len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = None if ttl_s is None else now + ttl_s
+        with self._lock:
+            self._db.execute(
+                """
+                insert into responses (key, body, size, stored_at, expires_at, last_access)
+                values (?, ?, ?, ?, ?, ?)
+                on conflict (key) do update set
+                  body = excluded.body,
+                  size = excluded.size,
+                  stored_at = excluded.stored_at,
+                  expires_at = excluded.expires_at,
+                  last_access = excluded.last_access
+                """,
+                (key, body, len(body), now, expires_at, now),
+            )
+            self._stores += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute("select coalesce(sum(size), 0) from responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        # Expired entries go first, then least recently used.
+        rows = self._db.execute(
+            """
+            select key, size from responses
+            order by (expires_at is not null and expires_at <= ?) desc, last_access asc
+            """,
+            (time.time(),),
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("delete from responses where key = ?", doomed)
+        self._evictions += len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("delete from responses")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, size = self._db.execute(
+                "select count(*), coalesce(sum(size), 0) from responses"
+            ).fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                entries=entries,
+                size_bytes=size,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache(maxsize=1)
+def default_response_cache() -> ResponseCache | None:
+    """Process-wide cache configured by `CITYSCAPE_HTTP_CACHE` (a file path); None if unset."""
+
+    settings = get_settings()
+    if not settings.http_cache_path:
+        return None
+    max_mb = settings.http_cache_max_mb or 256
+    return ResponseCache(settings.http_cache_path, max_bytes=max_mb * 1024 * 1024)
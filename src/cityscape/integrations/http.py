@@ -1,37 +1,355 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
 
+from cityscape.integrations.ratelimit import Outcome, RateLimiter
+from cityscape.utils.payloads import loads_json
+
+__all__ = [
+    "RETRYABLE_STATUSES",
+    "AsyncHttpClient",
+    "HttpClient",
+    "HttpStats",
+    "backoff_delay",
+    "retry_after_s",
+]
+
+DEFAULT_MAX_CONNECTIONS = 10
+
+# Statuses worth another attempt; any other error response is permanent and
+# raised at once. 429 and 503 mean "slow down" and may carry a Retry-After.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
 
 @dataclass(frozen=True, slots=True)
+class HttpStats:
+    """Cumulative request counters of a client; subtract two snapshots for one run."""
+
+    requests: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+
+    def __add__(self, other: HttpStats) -> HttpStats:
+        return HttpStats(
+            requests=self.requests + other.requests,
+            retries=self.retries + other.retries,
+            bytes_received=self.bytes_received + other.bytes_received,
+        )
+
+    def __sub__(self, other: HttpStats) -> HttpStats:
+        return HttpStats(
+            requests=self.requests - other.requests,
+            retries=self.retries - other.retries,
+            bytes_received=self.bytes_received - other.bytes_received,
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+        }
+
+
+def _join_url(base_url: str, path: str) -> str:
+    return f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+
+
+def _json_value(resp: httpx.Response) -> Any:
+    resp.raise_for_status()
+    # Decoded from the body bytes, without first decoding them to a str.
+    return loads_json(resp.content)
+
+
+def _json_object(resp: httpx.Response) -> dict[str, Any]:
+    data = _json_value(resp)
+    if not isinstance(data, dict):
+        raise TypeError(f"Expected JSON object from {resp.request.url}, got {type(data)}")
+    return data
+
+
+def _bytes_received(resp: httpx.Response) -> int:
+    # Wire bytes (before content decoding) when the transport reports them.
+    return resp.num_bytes_downloaded or len(resp.content)
+
+
+def retry_after_s(resp: httpx.Response) -> float | None:
+    """Seconds the server asked us to wait (Retry-After as delta-seconds or HTTP date)."""
+
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int, backoff_s: float, *, retry_after: float | None = None, max_s: float = 60.0
+) -> float:
+    """Sleep before retry number `attempt + 1`.
+
+    Honours the server's Retry-After (capped at `max_s`) plus up to one
+    `backoff_s` of jitter; otherwise exponential backoff with full jitter, so
+    workers that failed together do not retry together.
+    """
+
+    if retry_after is not None:
+        return min(retry_after, max_s) + random.uniform(0.0, backoff_s)
+    return random.uniform(0.0, min(max_s, backoff_s * (2**attempt)))
+
+
+@dataclass(frozen=True, slots=True)
+class _Attempt:
+    """What one request attempt produced: a response to return, or an error to retry or raise."""
+
+    outcome: Outcome
+    error: Exception | None = None
+    retry_after: float | None = None
+    retryable: bool = False
+
+
+def _classify(resp: httpx.Response | None, exc: Exception | None) -> _Attempt:
+    if resp is None:
+        # Timeouts and refused/reset connections are transient; anything else
+        # (a bad URL, a bug) will fail the same way again.
+        if isinstance(exc, httpx.TransportError):
+            return _Attempt("failed", exc, retryable=True)
+        return _Attempt("ok", exc)
+    if resp.status_code not in RETRYABLE_STATUSES:
+        return _Attempt("ok")
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as status_error:
+        error: Exception = status_error
+    else:  # pragma: no cover - every retryable status is an error status
+        return _Attempt("ok")
+    if resp.status_code in THROTTLE_STATUSES:
+        return _Attempt("throttled", error, retry_after=retry_after_s(resp), retryable=True)
+    return _Attempt("failed", error, retryable=True)
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+
+
+@dataclass(slots=True)
 class HttpClient:
+    """Blocking JSON client backed by one long-lived, keep-alive connection pool.
+
+    The underlying `httpx.Client` is created on first use and reused for every
+    request (and every retry), so only the first request to a host pays the
+    TCP+TLS handshake. It is safe to share one instance between threads.
+    `stats()` counts requests, retries and bytes received over its lifetime.
+
+    Transport errors and `RETRYABLE_STATUSES` are retried up to `retries`
+    times (see `backoff_delay`); other errors are raised at once. With a
+    `limiter`, every attempt waits for admission and reports its outcome.
+    """
+
     base_url: str
     timeout_s: float = 30.0
     retries: int = 3
     backoff_s: float = 0.5
+    max_backoff_s: float = 60.0
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    transport: httpx.BaseTransport | None = None
+    limiter: RateLimiter | None = None
+    _client: httpx.Client | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _stats: HttpStats = field(default_factory=HttpStats, init=False, repr=False)
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        timeout=self.timeout_s,
+                        limits=_limits(self.max_connections),
+                        transport=self.transport,
+                    )
+        return self._client
 
     def get_json(self, path: str, *, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+        return _json_object(self._get(path, params))
+
+    def get_json_value(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
+        """Like `get_json`, for endpoints whose body is not a JSON object (e.g. an array)."""
+
+        return _json_value(self._get(path, params))
+
+    def _get(self, path: str, params: dict[str, Any] | None) -> httpx.Response:
+        url = _join_url(self.base_url, path)
+
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            resp: httpx.Response | None = None
+            try:
+                resp = self.client.get(url, params=params)
+            except Exception as exc:
+                result = _classify(None, exc)
+            except BaseException:
+                # Interrupted: says nothing about the server, but the slot must go back.
+                if self.limiter is not None:
+                    self.limiter.release("ok")
+                raise
+            else:
+                self._record(HttpStats(requests=1, bytes_received=_bytes_received(resp)))
+                result = _classify(resp, None)
+            if self.limiter is not None:
+                self.limiter.release(result.outcome, retry_after_s=result.retry_after)
+
+            if result.error is None:
+                assert resp is not None
+                return resp
+            if not result.retryable or attempt >= self.retries:
+                raise result.error
+            self._record(HttpStats(retries=1))
+            time.sleep(
+                backoff_delay(
+                    attempt,
+                    self.backoff_s,
+                    retry_after=result.retry_after,
+                    max_s=self.max_backoff_s,
+                )
+            )
+
+        raise AssertionError("unreachable")
+
+    def _record(self, delta: HttpStats) -> None:
+        with self._lock:
+            self._stats += delta
+
+    def stats(self) -> HttpStats:
+        return self._stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def __enter__(self) -> HttpClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
+class AsyncHttpClient:
+    """asyncio JSON client with HTTP/2 and a bounded connection pool.
+
+    `max_connections` caps the sockets opened to the host; with HTTP/2 many
+    concurrent requests are multiplexed over them. The underlying
+    `httpx.AsyncClient` is bound to the event loop it was first used on, so
+    create one instance per `asyncio.run(...)` and `aclose()` it at the end.
+    Retries and `limiter` work as in `HttpClient`; one limiter can serve both.
+    """
+
+    base_url: str
+    timeout_s: float = 30.0
+    retries: int = 3
+    backoff_s: float = 0.5
+    max_backoff_s: float = 60.0
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    http2: bool = True
+    transport: httpx.AsyncBaseTransport | None = None
+    limiter: RateLimiter | None = None
+    _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _stats: HttpStats = field(default_factory=HttpStats, init=False, repr=False)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_s,
+                limits=_limits(self.max_connections),
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def get_json(self, path: str, *, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        return _json_object(await self._get(path, params))
+
+    async def get_json_value(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
+        """Like `get_json`, for endpoints whose body is not a JSON object (e.g. an array)."""
+
+        return _json_value(await self._get(path, params))
+
+    async def _get(self, path: str, params: dict[str, Any] | None) -> httpx.Response:
+        url = _join_url(self.base_url, path)
 
-        last_exc: Exception | None = None
         for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                await self.limiter.aacquire()
+            resp: httpx.Response | None = None
             try:
-                with httpx.Client(timeout=self.timeout_s) as client:
-                    resp = client.get(url, params=params)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    if not isinstance(data, dict):
-                        raise TypeError(f"Expected JSON object from {url}, got {type(data)}")
-                    return data
+                resp = await self.client.get(url, params=params)
             except Exception as exc:
-                last_exc = exc
-                if attempt >= self.retries:
-                    break
-                time.sleep(self.backoff_s * (2**attempt))
+                result = _classify(None, exc)
+            except BaseException:
+                # Cancelled: says nothing about the server, but the slot must go back.
+                if self.limiter is not None:
+                    await self.limiter.arelease("ok")
+                raise
+            else:
+                self._stats += HttpStats(requests=1, bytes_received=_bytes_received(resp))
+                result = _classify(resp, None)
+            if self.limiter is not None:
+                await self.limiter.arelease(result.outcome, retry_after_s=result.retry_after)
+
+            if result.error is None:
+                assert resp is not None
+                return resp
+            if not result.retryable or attempt >= self.retries:
+                raise result.error
+            self._stats += HttpStats(retries=1)
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt,
+                    self.backoff_s,
+                    retry_after=result.retry_after,
+                    max_s=self.max_backoff_s,
+                )
+            )
+
+        raise AssertionError("unreachable")
+
+    def stats(self) -> HttpStats:
+        return self._stats
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> AsyncHttpClient:
+        return self
 
-        assert last_exc is not None
-        raise last_exc
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
@@ -0,0 +1,145 @@
+"""League connectors: what the shared ingest engine needs to know about a league.
+
+A connector describes one league's source and raw tables:
+
+- `tables`: the raw landing tables (DDL, upsert key, indexes) as `RawTable`s
+- `endpoints(season, ...)`: the requests that make up a season's fetch
+- `fetch(endpoint)`: perform one request (blocking)
+- `parse(endpoint, payload)`: turn its response into `LoadChunk`s, column-wise
+  input for `cityscape.utils.db.upsert_columns`
+- `settled(endpoint, payload)`: whether that response can no longer change, so
+  a backfill never needs to fetch it again (see `cityscape.automations.ingest.ledger`)
+- `load_options()`: the connector options that change the rows it writes, so
+  the ledger reloads units loaded under other ones
+
+`cityscape.automations.ingest.engine.ingest_leagues` runs any number of them
+side by side under one set of HTTP and Postgres concurrency limits.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+if TYPE_CHECKING:
+    from cityscape.utils.db import RawTable, UpsertTarget
+
+__all__ = [
+    "LEAGUES",
+    "SCHEDULE_WINDOWS",
+    "DateRange",
+    "Endpoint",
+    "League",
+    "LeagueConnector",
+    "LoadChunk",
+    "ScheduleWindow",
+    "get_connector",
+    "schedule_windows",
+]
+
+League = Literal["mlb", "nba"]
+LEAGUES: tuple[str, ...] = ("mlb", "nba")
+
+# Season fetches can be split into windows that are requested concurrently.
+ScheduleWindow = Literal["week", "month"]
+SCHEDULE_WINDOWS: tuple[str, ...] = ("week", "month")
+
+DateRange = tuple[date, date]
+
+
+def schedule_windows(start: date, end: date, window: ScheduleWindow) -> list[DateRange]:
+    """Split [start, end] (inclusive) into consecutive week- or calendar-month windows."""
+
+    if window not in SCHEDULE_WINDOWS:
+        raise ValueError(f"Unknown schedule window {window!r}; expected one of {SCHEDULE_WINDOWS}")
+
+    out: list[DateRange] = []
+    cur = start
+    while cur <= end:
+        if window == "week":
+            nxt = cur + timedelta(days=7)
+        else:
+            nxt = (cur.replace(day=1) + timedelta(days=32)).replace(day=1)
+        out.append((cur, min(nxt - timedelta(days=1), end)))
+        cur = nxt
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """One request of a league's season fetch, optionally limited to a date span."""
+
+    league: str
+    name: str
+    season: int
+    start_date: date | None = None
+    end_date: date | None = None
+
+    @property
+    def unit(self) -> str:
+        """Key of this request in the ingest ledger, unique within its league season."""
+
+        if self.start_date or self.end_date:
+            return f"{self.name} {self.start_date}..{self.end_date}"
+        return self.name
+
+    def __str__(self) -> str:
+        span = f" {self.start_date}..{self.end_date}" if self.start_date or self.end_date else ""
+        return f"{self.league}:{self.name}[{self.season}]{span}"
+
+
+@dataclass(frozen=True, slots=True)
+class LoadChunk:
+    """Parsed rows for one raw table, one sequence per column of `target.columns`.
+
+    JSON columns hold `canonical_json` bytes (see `cityscape.utils.db.upsert_columns`).
+    """
+
+    target: UpsertTarget
+    columns: dict[str, Sequence[Any]]
+
+    def __len__(self) -> int:
+        return len(self.columns[self.target.columns[0]])
+
+
+class LeagueConnector(Protocol):
+    league: str
+    tables: tuple[RawTable, ...]
+
+    def ensure_storage(self, conn, seasons: Iterable[int]) -> None:
+        """Create the raw tables and `seasons`' partitions (committed), once per process."""
+        ...
+
+    def endpoints(
+        self, season: int, *, start_date: date | None = None, end_date: date | None = None
+    ) -> list[Endpoint]:
+        """The requests that fetch `season` (or its [start_date, end_date] part), in load order."""
+        ...
+
+    def fetch(self, endpoint: Endpoint) -> Any: ...
+
+    def parse(self, endpoint: Endpoint, payload: Any) -> Iterator[LoadChunk]: ...
+
+    def settled(self, endpoint: Endpoint, payload: Any) -> bool:
+        """Whether `payload` is final, e.g. a past season's schedule with every game over."""
+        ...
+
+    def load_options(self) -> dict[str, Any]:
+        """Options that change what is fetched or written, e.g. which raw keys are kept."""
+        ...
+
+
+def get_connector(league: str) -> LeagueConnector:
+    """The connector for `league` (one of `LEAGUES`), with its default source."""
+
+    if league == "mlb":
+        from cityscape.integrations.mlb.connector import MlbConnector
+
+        return MlbConnector()
+    if league == "nba":
+        from cityscape.integrations.nba.connector import NbaConnector
+
+        return NbaConnector()
+    raise ValueError(f"Unknown league {league!r}; expected one of {LEAGUES}")
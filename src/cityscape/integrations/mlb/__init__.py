@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from cityscape.integrations.mlb.batches import GameBatch, TeamBatch
 from cityscape.integrations.mlb.statsapi import MlbGame, MlbStatsApi, MlbTeam
 
-__all__ = ["MlbGame", "MlbStatsApi", "MlbTeam"]
+__all__ = ["GameBatch", "MlbGame", "MlbStatsApi", "MlbTeam", "TeamBatch"]
@@ -0,0 +1,239 @@
+"""Columnar batches of parsed MLB schedule games and teams.
+
+`MlbStatsApi.iter_game_batches` fills a `GameBatch` straight from the decoded
+schedule response: scalar fields go into typed arrays and each game object is
+kept only as its canonical JSON bytes. A batch of 1000 games is then a dozen
+flat columns instead of 1000 `MlbGame`s, each holding a tree of dicts, and
+`cityscape.utils.db.upsert_columns` writes the columns as they are.
+
+Indexing or iterating a batch still yields `MlbGame`s (decoding `raw` back into
+a dict) for code that works row by row.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from cityscape.integrations.mlb.schedule import game_fields, iter_schedule_games, team_fields
+from cityscape.integrations.mlb.statsapi import MlbGame, MlbTeam
+from cityscape.utils.payloads import JSON_ZLIB, canonical_json, compress_json, loads_json, project
+
+__all__ = ["GameBatch", "TeamBatch", "iter_game_batches"]
+
+# Stands in for None in the integer columns: ids and scores are never negative,
+# and no game is dated on ordinal 0.
+_NULL = -1
+_NO_DATE = 0
+
+
+def _int_or_null(value: int | None) -> int:
+    return _NULL if value is None else value
+
+
+def _nullable(values: array) -> list[int | None]:
+    return [None if v == _NULL else v for v in values]
+
+
+def _intern(value: str | None) -> str | None:
+    # game_type/status repeat a handful of values across a season.
+    return None if value is None else sys.intern(value)
+
+
+@dataclass(slots=True)
+class GameBatch:
+    """One season's parsed schedule games, column by column.
+
+    `raw` holds each game object as `canonical_json` bytes, projected to the
+    `raw_keys` it was built with; `archive` (when archiving) holds the full
+    object compressed with `compress_json`. The `*_bytes` counters total the JSON
+    size of the game objects before and after projection and of the archive copies.
+    """
+
+    season: int
+    game_id: array = field(default_factory=lambda: array("q"))
+    game_date: array = field(default_factory=lambda: array("i"))
+    game_type: list[str | None] = field(default_factory=list)
+    status: list[str | None] = field(default_factory=list)
+    home_team_id: array = field(default_factory=lambda: array("i"))
+    away_team_id: array = field(default_factory=lambda: array("i"))
+    home_score: array = field(default_factory=lambda: array("i"))
+    away_score: array = field(default_factory=lambda: array("i"))
+    raw: list[bytes] = field(default_factory=list)
+    archive: list[bytes] | None = None
+    raw_bytes_before: int = 0
+    raw_bytes_after: int = 0
+    archive_bytes: int = 0
+
+    def append(self, g: dict[str, Any], *, raw_keys: Sequence[str] | None = None) -> None:
+        """Add one schedule game object."""
+
+        game_id, game_date, game_type, status, home_id, away_id, home_score, away_score = (
+            game_fields(g)
+        )
+        self.game_id.append(game_id)
+        self.game_date.append(_NO_DATE if game_date is None else game_date.toordinal())
+        self.game_type.append(_intern(game_type))
+        self.status.append(_intern(status))
+        self.home_team_id.append(_int_or_null(home_id))
+        self.away_team_id.append(_int_or_null(away_id))
+        self.home_score.append(_int_or_null(home_score))
+        self.away_score.append(_int_or_null(away_score))
+
+        full = canonical_json(g)
+        raw = full if raw_keys is None else canonical_json(project(g, raw_keys))
+        self.raw.append(raw)
+        self.raw_bytes_before += len(full)
+        self.raw_bytes_after += len(raw)
+        if self.archive is not None:
+            blob = compress_json(g)
+            self.archive.append(blob)
+            self.archive_bytes += len(blob)
+
+    def __len__(self) -> int:
+        return len(self.game_id)
+
+    def __getitem__(self, i: int) -> MlbGame:
+        ordinal = self.game_date[i]
+        return MlbGame(
+            game_id=self.game_id[i],
+            season=self.season,
+            game_date=None if ordinal == _NO_DATE else date.fromordinal(ordinal),
+            game_type=self.game_type[i],
+            status=self.status[i],
+            home_team_id=None if self.home_team_id[i] == _NULL else self.home_team_id[i],
+            away_team_id=None if self.away_team_id[i] == _NULL else self.away_team_id[i],
+            home_score=None if self.home_score[i] == _NULL else self.home_score[i],
+            away_score=None if self.away_score[i] == _NULL else self.away_score[i],
+            raw=loads_json(self.raw[i]),
+        )
+
+    def __iter__(self) -> Iterator[MlbGame]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def columns(self) -> dict[str, Sequence[Any]]:
+        """The `MlbGame` fields as columns (None restored; `raw` stays JSON bytes)."""
+
+        return {
+            "game_id": self.game_id,
+            "season": [self.season] * len(self),
+            "game_date": [None if o == _NO_DATE else date.fromordinal(o) for o in self.game_date],
+            "game_type": self.game_type,
+            "status": self.status,
+            "home_team_id": _nullable(self.home_team_id),
+            "away_team_id": _nullable(self.away_team_id),
+            "home_score": _nullable(self.home_score),
+            "away_score": _nullable(self.away_score),
+            "raw": self.raw,
+        }
+
+    def archive_columns(self) -> dict[str, Sequence[Any]]:
+        """Columns of raw.mlb_games_archive for the archived full game objects."""
+
+        if self.archive is None:
+            raise ValueError("This batch was built without archive=True")
+        return {
+            "game_id": self.game_id,
+            "season": [self.season] * len(self),
+            "codec": [JSON_ZLIB] * len(self),
+            "payload": self.archive,
+        }
+
+
+@dataclass(slots=True)
+class TeamBatch:
+    """One season's teams, column by column (`raw` as `canonical_json` bytes)."""
+
+    season: int
+    team_id: array = field(default_factory=lambda: array("q"))
+    team_name: list[str] = field(default_factory=list)
+    team_abbr: list[str | None] = field(default_factory=list)
+    league_id: array = field(default_factory=lambda: array("i"))
+    division_id: array = field(default_factory=lambda: array("i"))
+    raw: list[bytes] = field(default_factory=list)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], *, season: int) -> TeamBatch:
+        """Build from a `teams` endpoint response."""
+
+        batch = cls(season=season)
+        for t in payload.get("teams", []):
+            if isinstance(t, dict):
+                batch.append(t)
+        return batch
+
+    def append(self, t: dict[str, Any]) -> None:
+        team_id, team_name, team_abbr, league_id, division_id = team_fields(t)
+        self.team_id.append(team_id)
+        self.team_name.append(team_name)
+        self.team_abbr.append(team_abbr)
+        self.league_id.append(_int_or_null(league_id))
+        self.division_id.append(_int_or_null(division_id))
+        self.raw.append(canonical_json(t))
+
+    def __len__(self) -> int:
+        return len(self.team_id)
+
+    def __getitem__(self, i: int) -> MlbTeam:
+        return MlbTeam(
+            team_id=self.team_id[i],
+            team_name=self.team_name[i],
+            team_abbr=self.team_abbr[i],
+            league_id=None if self.league_id[i] == _NULL else self.league_id[i],
+            division_id=None if self.division_id[i] == _NULL else self.division_id[i],
+            raw=loads_json(self.raw[i]),
+        )
+
+    def __iter__(self) -> Iterator[MlbTeam]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def columns(self) -> dict[str, Sequence[Any]]:
+        """The `MlbTeam` fields plus `season` as columns (`raw` stays JSON bytes)."""
+
+        return {
+            "team_id": self.team_id,
+            "season": [self.season] * len(self),
+            "team_name": self.team_name,
+            "team_abbr": self.team_abbr,
+            "league_id": _nullable(self.league_id),
+            "division_id": _nullable(self.division_id),
+            "raw": self.raw,
+        }
+
+
+def iter_game_batches(
+    payloads: Iterable[dict[str, Any]],
+    *,
+    season: int,
+    batch_size: int = 1000,
+    raw_keys: Sequence[str] | None = None,
+    archive: bool = False,
+) -> Iterator[GameBatch]:
+    """Parse schedule responses into `GameBatch`es of up to `batch_size` games.
+
+    `raw_keys` projects each stored game object to those key paths (see
+    `cityscape.utils.payloads.project`); `archive` also keeps the full object
+    compressed. Games keep their schedule order, repeats included.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    def _new() -> GameBatch:
+        return GameBatch(season=season, archive=[] if archive else None)
+
+    batch = _new()
+    for payload in payloads:
+        for g in iter_schedule_games(payload):
+            batch.append(g, raw_keys=raw_keys)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = _new()
+    if len(batch):
+        yield batch
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from typing import Any
+
+from cityscape.integrations.cache import default_response_cache
+from cityscape.integrations.leagues import Endpoint, LoadChunk, ScheduleWindow
+from cityscape.integrations.mlb.batches import TeamBatch, iter_game_batches
+from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.utils.db import (
+    MLB_GAMES,
+    MLB_GAMES_ARCHIVE,
+    MLB_RAW_TABLES,
+    MLB_TEAMS,
+    ensure_mlb_storage,
+)
+
+__all__ = ["MlbConnector"]
+
+
+class MlbConnector:
+    """MLB for the shared ingest engine: the season's teams, then its schedule in windows.
+
+    Games land in raw.mlb_games with the full schedule object as `raw`, or only
+    its `raw_keys` paths; `archive=True` also lands the full object compressed
+    in raw.mlb_games_archive (see `ingest_mlb_season`'s `raw_retention`).
+    """
+
+    league = "mlb"
+    tables = MLB_RAW_TABLES
+
+    def __init__(
+        self,
+        api: MlbStatsApi | None = None,
+        *,
+        game_types: str = "R",
+        window: ScheduleWindow = "month",
+        batch_size: int = 1000,
+        window_retries: int = 1,
+        raw_keys: Sequence[str] | None = None,
+        archive: bool = False,
+    ) -> None:
+        self.api = api or MlbStatsApi(cache=default_response_cache())
+        self.game_types = game_types
+        self.window = window
+        self.batch_size = batch_size
+        self.window_retries = window_retries
+        self.raw_keys = raw_keys
+        self.archive = archive
+
+    def ensure_storage(self, conn, seasons: Iterable[int]) -> None:
+        ensure_mlb_storage(conn, seasons)
+
+    def endpoints(
+        self, season: int, *, start_date: date | None = None, end_date: date | None = None
+    ) -> list[Endpoint]:
+        windows = self.api.season_windows(
+            season=season, start_date=start_date, end_date=end_date, window=self.window
+        )
+        return [
+            Endpoint(self.league, "teams", season),
+            *(Endpoint(self.league, "schedule", season, start, end) for start, end in windows),
+        ]
+
+    def fetch(self, endpoint: Endpoint) -> Any:
+        if endpoint.name == "teams":
+            return self.api.get_teams_json(season=endpoint.season)
+        if endpoint.name == "schedule":
+            return self.api.fetch_schedule_window(
+                season=endpoint.season,
+                game_types=self.game_types,
+                span=(endpoint.start_date, endpoint.end_date),
+                retries=self.window_retries,
+            )
+        raise ValueError(f"Unknown MLB endpoint {endpoint.name!r}")
+
+    def parse(self, endpoint: Endpoint, payload: Any) -> Iterator[LoadChunk]:
+        if endpoint.name == "teams":
+            batch = TeamBatch.from_payload(payload, season=endpoint.season)
+            yield LoadChunk(MLB_TEAMS, batch.columns())
+            return
+        for games in iter_game_batches(
+            [payload],
+            season=endpoint.season,
+            batch_size=self.batch_size,
+            raw_keys=self.raw_keys,
+            archive=self.archive,
+        ):
+            yield LoadChunk(MLB_GAMES, games.columns())
+            if games.archive is not None:
+                yield LoadChunk(MLB_GAMES_ARCHIVE, games.archive_columns())
+
+    def load_options(self) -> dict[str, Any]:
+        return {
+            "game_types": self.game_types,
+            "raw_keys": list(self.raw_keys) if self.raw_keys is not None else None,
+            "archive": self.archive,
+        }
+
+    def settled(self, endpoint: Endpoint, payload: Any) -> bool:
+        # Exactly the responses the HTTP cache keeps forever.
+        name = "teams" if endpoint.name == "teams" else "schedule"
+        return self.api.cache_ttl(name, {"season": endpoint.season}, payload) is None
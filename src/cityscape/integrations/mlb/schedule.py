@@ -0,0 +1,116 @@
+"""Field extraction for Stats API schedule and teams responses.
+
+Every schedule game passes through `game_fields`, so it is written for the
+hot loop: one pass over the game object, each nested object looked up and
+type-checked once, and `officialDate` strings (shared by all of a day's
+games) parsed once each via `parse_date`. Responses are decoded from their
+bytes by `cityscape.utils.payloads.loads_json` (orjson).
+
+`MlbStatsApi` builds `MlbGame`s / `MlbTeam`s and `GameBatch`es from these tuples.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+__all__ = [
+    "GameFields",
+    "TeamFields",
+    "game_fields",
+    "iter_schedule_games",
+    "parse_date",
+    "team_fields",
+]
+
+# (game_id, game_date, game_type, status, home/away team id, home/away score)
+GameFields = tuple[
+    int, date | None, str | None, str | None, int | None, int | None, int | None, int | None
+]
+# (team_id, team_name, team_abbr, league_id, division_id)
+TeamFields = tuple[int, str, str | None, int | None, int | None]
+
+_EMPTY: dict[str, Any] = {}
+
+
+@lru_cache(maxsize=4096)
+def _date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_date(value: Any) -> date | None:
+    """A `YYYY-MM-DD` string as a date; None when missing or invalid. Cached per string."""
+
+    return _date(value) if isinstance(value, str) and value else None
+
+
+def _nested_id(obj: Any) -> int | None:
+    value = obj.get("id") if isinstance(obj, dict) else None
+    return int(value) if value is not None else None
+
+
+def game_fields(g: dict[str, Any]) -> GameFields:
+    """(game_id, game_date, game_type, status, home/away team id, home/away score) of a game."""
+
+    get = g.get
+    teams = get("teams")
+    home = away = _EMPTY
+    if isinstance(teams, dict):
+        home = teams.get("home")
+        away = teams.get("away")
+        if not isinstance(home, dict):
+            home = _EMPTY
+        if not isinstance(away, dict):
+            away = _EMPTY
+    home_score = home.get("score")
+    away_score = away.get("score")
+
+    status = get("status")
+    state = status.get("detailedState") if isinstance(status, dict) else None
+    game_type = get("gameType")
+
+    return (
+        int(get("gamePk")),
+        parse_date(get("officialDate")),
+        game_type if isinstance(game_type, str) else None,
+        state if isinstance(state, str) else None,
+        _nested_id(home.get("team")),
+        _nested_id(away.get("team")),
+        int(home_score) if home_score is not None else None,
+        int(away_score) if away_score is not None else None,
+    )
+
+
+def team_fields(t: dict[str, Any]) -> TeamFields:
+    """(team_id, team_name, team_abbr, league_id, division_id) of a team."""
+
+    abbreviation = t.get("abbreviation")
+    return (
+        int(t.get("id")),
+        str(t.get("name") or ""),
+        abbreviation if isinstance(abbreviation, str) else None,
+        _nested_id(t.get("league")),
+        _nested_id(t.get("division")),
+    )
+
+
+def iter_schedule_games(payload: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Game objects of a schedule response, in date order. `payload` is left as it was."""
+
+    dates = payload.get("dates")
+    if not isinstance(dates, list):
+        return
+    for d in dates:
+        if not isinstance(d, dict):
+            continue
+        games = d.get("games")
+        if not isinstance(games, list):
+            continue
+        for g in games:
+            if isinstance(g, dict):
+                yield g
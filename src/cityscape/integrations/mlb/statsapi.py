@@ -1,10 +1,74 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import copy
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, replace
 from datetime import date
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal
 
-import statsapi as mlb_statsapi
+from cityscape.integrations.cache import ResponseCache, cache_key
+from cityscape.integrations.http import AsyncHttpClient, HttpClient, HttpStats, backoff_delay
+from cityscape.integrations.leagues import DateRange, ScheduleWindow, schedule_windows
+from cityscape.integrations.mlb.schedule import game_fields, iter_schedule_games, team_fields
+from cityscape.integrations.ratelimit import default_rate_limiter
+from cityscape.utils.jsonpatch import JsonPatchError, apply_patch
+from cityscape.utils.metrics import StageTimer
+
+if TYPE_CHECKING:
+    from cityscape.integrations.mlb.batches import GameBatch, TeamBatch
+
+MLB_STATSAPI_BASE_URL = "https://statsapi.mlb.com/api"
+MLB_STATSAPI_HOST = "statsapi.mlb.com"
+
+# Endpoint name -> path below the base URL (names mirror the `MLB-StatsAPI` package).
+ENDPOINTS: dict[str, str] = {
+    "teams": "v1/teams",
+    "seasons": "v1/seasons",
+    "schedule": "v1/schedule",
+    "game_feed": "v1.1/game/{game_id}/feed/live",
+    "game_feed_diff": "v1.1/game/{game_id}/feed/live/diffPatch",
+}
+
+# Response cache lifetimes per endpoint (seconds). Data for seasons that are over
+# never expires (see `MlbStatsApi.cache_ttl`); endpoints not listed are not cached.
+CACHE_TTLS: dict[str, float] = {
+    "teams": 24 * 3600,
+    "seasons": 24 * 3600,
+    "schedule": 15 * 60,
+}
+
+# How a game feed version was obtained: the whole feed, JSON Patch diffs applied
+# to the previous version, or nothing new (no diffs, or the game was already Final).
+FeedFetch = Literal["full", "patch", "unchanged"]
+FEED_FETCHES: tuple[str, ...] = ("full", "patch", "unchanged")
+
+FINAL_GAME_STATE = "Final"
+
+
+class ScheduleFetchError(RuntimeError):
+    """Raised when one or more schedule windows still fail after their retries."""
+
+    def __init__(self, failures: dict[DateRange, BaseException]) -> None:
+        self.failures = failures
+        spans = ", ".join(f"{s}..{e}" for s, e in sorted(failures))
+        super().__init__(f"Schedule windows failed: {spans}")
+
+
+class GameFeedFetchError(RuntimeError):
+    """Raised when one or more game feeds still fail after their retries.
+
+    `feeds` holds the feeds that were fetched, so callers can keep them.
+    """
+
+    def __init__(self, failures: dict[int, BaseException], feeds: list[MlbGameFeed]) -> None:
+        self.failures = failures
+        self.feeds = feeds
+        super().__init__(f"Game feeds failed: {', '.join(str(g) for g in sorted(failures))}")
 
 
 @dataclass(frozen=True, slots=True)
@@ -31,62 +95,225 @@ class MlbGame:
     raw: dict[str, Any]
 
 
+@dataclass(frozen=True, slots=True)
+class MlbGameFeed:
+    """One version of a game's live feed (`game/{gamePk}/feed/live`)."""
+
+    game_id: int
+    season: int | None
+    game_date: date | None
+    abstract_state: str | None
+    detailed_state: str | None
+    timecode: str | None
+    feed: dict[str, Any]
+    fetch: FeedFetch = "full"
+
+    @property
+    def is_final(self) -> bool:
+        return self.abstract_state == FINAL_GAME_STATE
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> HttpClient:
+    # One keep-alive pool and one rate limiter per process, shared by every `MlbStatsApi()`.
+    return HttpClient(
+        base_url=MLB_STATSAPI_BASE_URL, limiter=default_rate_limiter(MLB_STATSAPI_HOST)
+    )
+
+
 class MlbStatsApi:
-    """Free MLB Stats API client (no auth required)."""
+    """Free MLB Stats API client (no auth required).
+
+    Every endpoint has a blocking form (`list_games`) backed by a shared,
+    pooled `HttpClient` and an asyncio form (`alist_games`) backed by an
+    `AsyncHttpClient` (HTTP/2). Call `aclose()` when done with the async forms.
+    Both go through the blocking client's rate limiter (by default the
+    process-wide one for the Stats API, see `default_rate_limiter`), so
+    concurrent windows, threads and tasks share one request budget.
+
+    With a `cache`, responses are served from disk until their endpoint TTL
+    runs out (never, for seasons that are over). With a `timer`, time spent
+    fetching (including cache reads) is charged to `fetch_<endpoint>` stages.
+    """
+
+    def __init__(
+        self,
+        *,
+        http: HttpClient | None = None,
+        async_http: AsyncHttpClient | None = None,
+        max_connections: int = 10,
+        cache: ResponseCache | None = None,
+        timer: StageTimer | None = None,
+    ) -> None:
+        self._http = http or _shared_http_client()
+        self._async_http = async_http
+        self._max_connections = max_connections
+        self.cache = cache
+        self.timer = timer
+
+    def _stage(self, name: str) -> AbstractContextManager[None]:
+        return nullcontext() if self.timer is None else self.timer.stage(name)
+
+    def http_stats(self) -> HttpStats:
+        """Counters of the blocking client (process-wide when it is the shared one)."""
+
+        return self._http.stats()
+
+    @property
+    def async_http(self) -> AsyncHttpClient:
+        if self._async_http is None:
+            self._async_http = AsyncHttpClient(
+                base_url=MLB_STATSAPI_BASE_URL,
+                max_connections=self._max_connections,
+                limiter=self._http.limiter,
+            )
+        return self._async_http
+
+    async def aclose(self) -> None:
+        if self._async_http is not None:
+            await self._async_http.aclose()
+
+    @staticmethod
+    def cache_ttl(endpoint: str, params: dict[str, Any], payload: dict[str, Any]) -> float | None:
+        """TTL for a response; None means it can never change.
+
+        Past seasons are immutable for teams/seasons. A past season's schedule is
+        only immutable once it lists games and every one of them is Final; an
+        empty one may just not be published yet.
+        """
+
+        season = params.get("season")
+        if season is not None and int(season) < date.today().year:
+            if endpoint != "schedule":
+                return None
+            games = [
+                g
+                for d in payload.get("dates", [])
+                if isinstance(d, dict)
+                for g in d.get("games", [])
+            ]
+            if games and all(
+                isinstance(g, dict) and (g.get("status") or {}).get("abstractGameState") == "Final"
+                for g in games
+            ):
+                return None
+        return CACHE_TTLS[endpoint]
+
+    def _cache_get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        if self.cache is None or endpoint not in CACHE_TTLS:
+            return None
+        return self.cache.get(cache_key(endpoint, params))
+
+    def _cache_put(self, endpoint: str, params: dict[str, Any], payload: dict[str, Any]) -> None:
+        if self.cache is None or endpoint not in CACHE_TTLS:
+            return
+        ttl_s = self.cache_ttl(endpoint, params, payload)
+        self.cache.put(cache_key(endpoint, params), payload, ttl_s=ttl_s)
 
     def _get_json(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
-        payload = mlb_statsapi.get(endpoint, params)
-        if not isinstance(payload, dict):
-            raise TypeError(f"Expected dict from statsapi.get({endpoint!r}, ...), got {type(payload)}")
+        with self._stage(f"fetch_{endpoint}"):
+            payload = self._cache_get(endpoint, params)
+            if payload is None:
+                payload = self._http.get_json(ENDPOINTS[endpoint], params=params)
+                self._cache_put(endpoint, params, payload)
+        return payload
+
+    async def _aget_json(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        payload = self._cache_get(endpoint, params)
+        if payload is None:
+            payload = await self.async_http.get_json(ENDPOINTS[endpoint], params=params)
+            self._cache_put(endpoint, params, payload)
         return payload
 
+    # teams
+
+    @staticmethod
+    def _teams_params(season: int) -> dict[str, Any]:
+        return {"sportId": 1, "season": season}
+
+    @staticmethod
+    def _parse_teams(payload: dict[str, Any]) -> list[MlbTeam]:
+        return [
+            MlbTeam(*team_fields(t), raw=t) for t in payload.get("teams", []) if isinstance(t, dict)
+        ]
+
+    def get_teams_json(self, *, season: int) -> dict[str, Any]:
+        """The raw teams response of a season (cached like every teams request)."""
+
+        return self._get_json("teams", self._teams_params(season))
+
     def list_teams(self, *, season: int) -> list[MlbTeam]:
-        payload = self._get_json("teams", {"sportId": 1, "season": season})
-        teams = payload.get("teams", [])
-        out: list[MlbTeam] = []
-        for t in teams:
-            if not isinstance(t, dict):
-                continue
-            team_id = int(t.get("id"))
-            out.append(
-                MlbTeam(
-                    team_id=team_id,
-                    team_name=str(t.get("name") or ""),
-                    team_abbr=(t.get("abbreviation") if isinstance(t.get("abbreviation"), str) else None),
-                    league_id=(int(t["league"]["id"]) if isinstance(t.get("league"), dict) and t["league"].get("id") is not None else None),
-                    division_id=(int(t["division"]["id"]) if isinstance(t.get("division"), dict) and t["division"].get("id") is not None else None),
-                    raw=t,
-                )
-            )
-        return out
+        return self._parse_teams(self._get_json("teams", self._teams_params(season)))
 
-    def get_regular_season_bounds(self, *, season: int) -> tuple[date | None, date | None]:
-        """Return (start_date, end_date) for the MLB regular season.
+    def get_team_batch(self, *, season: int) -> TeamBatch:
+        """The season's teams as one columnar `TeamBatch` (see `list_teams`)."""
 
-        Uses the free MLB Stats API seasons endpoint.
-        """
+        from cityscape.integrations.mlb.batches import TeamBatch
 
-        payload = self._get_json("seasons", {"sportId": 1, "season": season})
+        payload = self._get_json("teams", self._teams_params(season))
+        return TeamBatch.from_payload(payload, season=season)
+
+    async def alist_teams(self, *, season: int) -> list[MlbTeam]:
+        return self._parse_teams(await self._aget_json("teams", self._teams_params(season)))
+
+    # seasons
+
+    @staticmethod
+    def _parse_regular_season_bounds(
+        payload: dict[str, Any],
+        *,
+        start_key: str = "regularSeasonStartDate",
+        end_key: str = "regularSeasonEndDate",
+    ) -> tuple[date | None, date | None]:
         seasons = payload.get("seasons", [])
         if not seasons or not isinstance(seasons[0], dict):
             return None, None
 
         s0: dict[str, Any] = seasons[0]
-        start_s = s0.get("regularSeasonStartDate")
-        end_s = s0.get("regularSeasonEndDate")
+        start_s = s0.get(start_key)
+        end_s = s0.get(end_key)
 
         start_d = date.fromisoformat(start_s) if isinstance(start_s, str) and start_s else None
         end_d = date.fromisoformat(end_s) if isinstance(end_s, str) and end_s else None
         return start_d, end_d
 
-    def list_games(
-        self,
+    def get_regular_season_bounds(self, *, season: int) -> tuple[date | None, date | None]:
+        """Return (start_date, end_date) for the MLB regular season.
+
+        Uses the free MLB Stats API seasons endpoint.
+        """
+
+        payload = self._get_json("seasons", {"sportId": 1, "season": season})
+        return self._parse_regular_season_bounds(payload)
+
+    async def aget_regular_season_bounds(self, *, season: int) -> tuple[date | None, date | None]:
+        payload = await self._aget_json("seasons", {"sportId": 1, "season": season})
+        return self._parse_regular_season_bounds(payload)
+
+    def get_season_bounds(self, *, season: int) -> tuple[date | None, date | None]:
+        """Return (start_date, end_date) of the whole season, spring training through postseason."""
+
+        payload = self._get_json("seasons", {"sportId": 1, "season": season})
+        return self._parse_regular_season_bounds(
+            payload, start_key="seasonStartDate", end_key="seasonEndDate"
+        )
+
+    async def aget_season_bounds(self, *, season: int) -> tuple[date | None, date | None]:
+        payload = await self._aget_json("seasons", {"sportId": 1, "season": season})
+        return self._parse_regular_season_bounds(
+            payload, start_key="seasonStartDate", end_key="seasonEndDate"
+        )
+
+    # schedule
+
+    @staticmethod
+    def _schedule_params(
         *,
         season: int,
-        game_types: str = "R",
-        start_date: date | None = None,
-        end_date: date | None = None,
-    ) -> list[MlbGame]:
+        game_types: str,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> dict[str, Any]:
         # gameTypes: comma-separated; common values include R (regular), S (spring), F (wild card), D, L, W
         params: dict[str, Any] = {
             "sportId": 1,
@@ -97,60 +324,513 @@ class MlbStatsApi:
             params["startDate"] = start_date.isoformat()
         if end_date is not None:
             params["endDate"] = end_date.isoformat()
+        return params
+
+    def get_schedule_json(
+        self,
+        *,
+        season: int,
+        game_types: str = "R",
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> dict[str, Any]:
+        """The raw schedule response of a season (or [start_date, end_date] of it)."""
+
+        params = self._schedule_params(
+            season=season, game_types=game_types, start_date=start_date, end_date=end_date
+        )
+        return self._get_json("schedule", params)
+
+    @staticmethod
+    def _iter_parsed_games(payload: dict[str, Any], *, season: int) -> Iterator[MlbGame]:
+        for g in iter_schedule_games(payload):
+            game_id, game_date, game_type, status, home_id, away_id, home_score, away_score = (
+                game_fields(g)
+            )
+            yield MlbGame(
+                game_id=game_id,
+                season=season,
+                game_date=game_date,
+                game_type=game_type,
+                status=status,
+                home_team_id=home_id,
+                away_team_id=away_id,
+                home_score=home_score,
+                away_score=away_score,
+                raw=g,
+            )
+
+    @staticmethod
+    def _dedupe_games(games: Iterable[MlbGame]) -> list[MlbGame]:
+        """Keep the last occurrence of each gamePk, in order of that occurrence.
+
+        A postponed game is listed on its original date and again on its makeup
+        date; windows are merged chronologically, so the later entry wins.
+        """
+
+        by_id: dict[int, MlbGame] = {}
+        for g in games:
+            by_id.pop(g.game_id, None)
+            by_id[g.game_id] = g
+        return list(by_id.values())
+
+    @staticmethod
+    def _resolve_range(
+        bounds: tuple[date | None, date | None],
+        start_date: date | None,
+        end_date: date | None,
+        *,
+        season: int,
+    ) -> DateRange:
+        start = start_date or bounds[0]
+        end = end_date or bounds[1]
+        if start is None or end is None:
+            raise ValueError(
+                f"Cannot determine the date range of season {season} to split into windows"
+            )
+        return start, end
+
+    def season_windows(
+        self,
+        *,
+        season: int,
+        start_date: date | None,
+        end_date: date | None,
+        window: ScheduleWindow,
+    ) -> list[DateRange]:
+        """The season (or [start_date, end_date] of it) as week/month date ranges."""
 
-        payload = self._get_json("schedule", params)
+        bounds = (start_date, end_date)
+        if start_date is None or end_date is None:
+            bounds = self.get_season_bounds(season=season)
+        start, end = self._resolve_range(bounds, start_date, end_date, season=season)
+        return schedule_windows(start, end, window)
 
-        out: list[MlbGame] = []
-        dates = payload.get("dates", [])
-        for d in dates:
-            if not isinstance(d, dict):
-                continue
-            games = d.get("games", [])
-            for g in games:
-                if not isinstance(g, dict):
-                    continue
+    def fetch_schedule_window(
+        self, *, season: int, game_types: str, span: DateRange, retries: int = 0
+    ) -> dict[str, Any]:
+        """The schedule response of one window, fetched up to `retries` more times on failure."""
 
-                game_id = int(g.get("gamePk"))
+        params = self._schedule_params(
+            season=season, game_types=game_types, start_date=span[0], end_date=span[1]
+        )
+        for attempt in range(retries + 1):
+            try:
+                return self._get_json("schedule", params)
+            except Exception:
+                if attempt >= retries:
+                    raise
+            time.sleep(backoff_delay(attempt, self._http.backoff_s, max_s=self._http.max_backoff_s))
+        raise AssertionError("unreachable")
 
-                official_date = g.get("officialDate")
-                game_date: date | None
-                if isinstance(official_date, str) and official_date:
+    def _iter_windowed_payloads(
+        self,
+        *,
+        season: int,
+        game_types: str,
+        windows: list[DateRange],
+        max_concurrency: int,
+        window_retries: int,
+    ) -> Iterator[dict[str, Any]]:
+        # Windows are fetched on a thread pool with at most `max_concurrency` in
+        # flight and yielded strictly in date order as each one completes.
+        pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+        pending: list[tuple[DateRange, Future[dict[str, Any]]]] = []
+        todo = iter(windows)
+
+        def _submit_next() -> None:
+            span = next(todo, None)
+            if span is not None:
+                future = pool.submit(
+                    self.fetch_schedule_window,
+                    season=season,
+                    game_types=game_types,
+                    span=span,
+                    retries=window_retries,
+                )
+                pending.append((span, future))
+
+        for _ in range(max(1, max_concurrency)):
+            _submit_next()
+
+        def _consume() -> Iterator[dict[str, Any]]:
+            try:
+                while pending:
+                    span, future = pending.pop(0)
                     try:
-                        game_date = date.fromisoformat(official_date)
-                    except ValueError:
-                        game_date = None
-                else:
-                    game_date = None
-
-                teams = g.get("teams") if isinstance(g.get("teams"), dict) else {}
-                home = teams.get("home") if isinstance(teams.get("home"), dict) else {}
-                away = teams.get("away") if isinstance(teams.get("away"), dict) else {}
-
-                def _team_id(side: dict[str, Any]) -> int | None:
-                    team = side.get("team") if isinstance(side.get("team"), dict) else None
-                    team_id_val = team.get("id") if isinstance(team, dict) else None
-                    return int(team_id_val) if team_id_val is not None else None
-
-                def _score(side: dict[str, Any]) -> int | None:
-                    score_val = side.get("score")
-                    return int(score_val) if score_val is not None else None
-
-                status = g.get("status") if isinstance(g.get("status"), dict) else {}
-                detailed_state = status.get("detailedState") if isinstance(status.get("detailedState"), str) else None
-
-                out.append(
-                    MlbGame(
-                        game_id=game_id,
+                        with self._stage("fetch_schedule"):
+                            payload = future.result()
+                    except Exception as exc:
+                        raise ScheduleFetchError({span: exc}) from exc
+                    _submit_next()
+                    yield payload
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        return _consume()
+
+    def _iter_schedule_payloads(
+        self,
+        *,
+        season: int,
+        game_types: str,
+        start_date: date | None,
+        end_date: date | None,
+        window: ScheduleWindow | None,
+        max_concurrency: int,
+        window_retries: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Fetch the schedule (or its first windows) now; yield the responses in date order."""
+
+        if window is not None:
+            windows = self.season_windows(
+                season=season, start_date=start_date, end_date=end_date, window=window
+            )
+            return self._iter_windowed_payloads(
+                season=season,
+                game_types=game_types,
+                windows=windows,
+                max_concurrency=max_concurrency,
+                window_retries=window_retries,
+            )
+
+        params = self._schedule_params(
+            season=season, game_types=game_types, start_date=start_date, end_date=end_date
+        )
+        return iter([self._get_json("schedule", params)])
+
+    def iter_games(
+        self,
+        *,
+        season: int,
+        game_types: str = "R",
+        start_date: date | None = None,
+        end_date: date | None = None,
+        window: ScheduleWindow | None = None,
+        max_concurrency: int = 4,
+        window_retries: int = 1,
+    ) -> Iterator[MlbGame]:
+        """Fetch the schedule now and return a generator that parses games lazily.
+
+        Unlike `list_games`, no list of `MlbGame` is built: each game is parsed
+        when the consumer asks for it, so memory stays proportional to what the
+        consumer holds on to (e.g. one write batch).
+
+        With `window`, the range is fetched as week/month windows, a few at a
+        time, and only the in-flight windows are held in memory. Games are not
+        deduplicated across windows here; they come out in date order, so
+        last-write-wins upserts keep the latest entry of a postponed game.
+        """
+
+        payloads = self._iter_schedule_payloads(
+            season=season,
+            game_types=game_types,
+            start_date=start_date,
+            end_date=end_date,
+            window=window,
+            max_concurrency=max_concurrency,
+            window_retries=window_retries,
+        )
+        return (g for payload in payloads for g in self._iter_parsed_games(payload, season=season))
+
+    def iter_game_batches(
+        self,
+        *,
+        season: int,
+        game_types: str = "R",
+        start_date: date | None = None,
+        end_date: date | None = None,
+        window: ScheduleWindow | None = None,
+        max_concurrency: int = 4,
+        window_retries: int = 1,
+        batch_size: int = 1000,
+        raw_keys: Sequence[str] | None = None,
+        archive: bool = False,
+    ) -> Iterator[GameBatch]:
+        """Columnar form of `iter_games`: `GameBatch`es of up to `batch_size` games.
+
+        Games go from the decoded response straight into the batch's arrays;
+        each raw game object is kept only as JSON bytes (projected to
+        `raw_keys` when given, with a compressed copy of the full object when
+        `archive`). See `cityscape.integrations.mlb.batches`.
+        """
+
+        from cityscape.integrations.mlb.batches import iter_game_batches
+
+        payloads = self._iter_schedule_payloads(
+            season=season,
+            game_types=game_types,
+            start_date=start_date,
+            end_date=end_date,
+            window=window,
+            max_concurrency=max_concurrency,
+            window_retries=window_retries,
+        )
+        return iter_game_batches(
+            payloads, season=season, batch_size=batch_size, raw_keys=raw_keys, archive=archive
+        )
+
+    def list_games(
+        self,
+        *,
+        season: int,
+        game_types: str = "R",
+        start_date: date | None = None,
+        end_date: date | None = None,
+        window: ScheduleWindow | None = None,
+        max_concurrency: int = 4,
+        window_retries: int = 1,
+    ) -> list[MlbGame]:
+        """Return the schedule's games.
+
+        With `window`, the season (or the given range) is split into week/month
+        windows fetched concurrently on a thread pool. A failing window is
+        retried on its own up to `window_retries` times. Windows that still fail
+        are reported together in a `ScheduleFetchError`. Results are merged in
+        date order and deduplicated by gamePk.
+        """
+
+        if window is None:
+            params = self._schedule_params(
+                season=season, game_types=game_types, start_date=start_date, end_date=end_date
+            )
+            return list(self._iter_parsed_games(self._get_json("schedule", params), season=season))
+
+        windows = self.season_windows(
+            season=season, start_date=start_date, end_date=end_date, window=window
+        )
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = [
+                (
+                    span,
+                    pool.submit(
+                        self.fetch_schedule_window,
                         season=season,
-                        game_date=game_date,
-                        game_type=(g.get("gameType") if isinstance(g.get("gameType"), str) else None),
-                        status=detailed_state,
-                        home_team_id=_team_id(home),
-                        away_team_id=_team_id(away),
-                        home_score=_score(home),
-                        away_score=_score(away),
-                        raw=g,
-                    )
+                        game_types=game_types,
+                        span=span,
+                        retries=window_retries,
+                    ),
                 )
+                for span in windows
+            ]
+
+        payloads: list[dict[str, Any]] = []
+        failures: dict[DateRange, BaseException] = {}
+        for span, future in futures:
+            try:
+                payloads.append(future.result())
+            except Exception as exc:
+                failures[span] = exc
+        if failures:
+            raise ScheduleFetchError(failures)
+
+        return self._dedupe_games(
+            g for payload in payloads for g in self._iter_parsed_games(payload, season=season)
+        )
+
+    async def afetch_schedule_window(
+        self, *, season: int, game_types: str, span: DateRange, retries: int = 0
+    ) -> dict[str, Any]:
+        params = self._schedule_params(
+            season=season, game_types=game_types, start_date=span[0], end_date=span[1]
+        )
+        http = self.async_http
+        for attempt in range(retries + 1):
+            try:
+                return await self._aget_json("schedule", params)
+            except Exception:
+                if attempt >= retries:
+                    raise
+            await asyncio.sleep(backoff_delay(attempt, http.backoff_s, max_s=http.max_backoff_s))
+        raise AssertionError("unreachable")
+
+    async def alist_games(
+        self,
+        *,
+        season: int,
+        game_types: str = "R",
+        start_date: date | None = None,
+        end_date: date | None = None,
+        window: ScheduleWindow | None = None,
+        max_concurrency: int = 4,
+        window_retries: int = 1,
+    ) -> list[MlbGame]:
+        """asyncio form of `list_games`; windows are fanned out with `asyncio.gather`."""
+
+        if window is None:
+            params = self._schedule_params(
+                season=season, game_types=game_types, start_date=start_date, end_date=end_date
+            )
+            payload = await self._aget_json("schedule", params)
+            return list(self._iter_parsed_games(payload, season=season))
+
+        bounds = (start_date, end_date)
+        if start_date is None or end_date is None:
+            bounds = await self.aget_season_bounds(season=season)
+        windows = schedule_windows(
+            *self._resolve_range(bounds, start_date, end_date, season=season), window
+        )
+
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(span: DateRange) -> dict[str, Any]:
+            async with sem:
+                return await self.afetch_schedule_window(
+                    season=season, game_types=game_types, span=span, retries=window_retries
+                )
+
+        results = await asyncio.gather(*(_one(span) for span in windows), return_exceptions=True)
+        failures = {
+            span: r
+            for span, r in zip(windows, results, strict=True)
+            if isinstance(r, BaseException)
+        }
+        if failures:
+            raise ScheduleFetchError(failures)
+
+        return self._dedupe_games(
+            g for payload in results for g in self._iter_parsed_games(payload, season=season)
+        )
+
+    # game feeds
+
+    @staticmethod
+    def _parse_game_feed(feed: dict[str, Any], *, fetch: FeedFetch) -> MlbGameFeed:
+        game_data = feed.get("gameData") if isinstance(feed.get("gameData"), dict) else {}
+        game = game_data.get("game") if isinstance(game_data.get("game"), dict) else {}
+        status = game_data.get("status") if isinstance(game_data.get("status"), dict) else {}
+        when = game_data.get("datetime") if isinstance(game_data.get("datetime"), dict) else {}
+        meta = feed.get("metaData") if isinstance(feed.get("metaData"), dict) else {}
+
+        official_date = when.get("officialDate")
+        season = game.get("season")
+        return MlbGameFeed(
+            game_id=int(feed.get("gamePk") or game.get("pk")),
+            season=int(season) if season is not None else None,
+            game_date=(
+                date.fromisoformat(official_date)
+                if isinstance(official_date, str) and official_date
+                else None
+            ),
+            abstract_state=status.get("abstractGameState"),
+            detailed_state=status.get("detailedState"),
+            timecode=meta.get("timeStamp"),
+            feed=feed,
+            fetch=fetch,
+        )
+
+    def _patched_feed(self, prior: MlbGameFeed, payload: Any) -> MlbGameFeed | None:
+        """Apply a diffPatch response to `prior`; None when only a full refetch will do."""
+
+        if isinstance(payload, dict) and "gameData" in payload:
+            # The server answers with the whole feed when that is smaller than the diffs.
+            return self._parse_game_feed(payload, fetch="full")
+        if not isinstance(payload, list):
+            return None
+        operations = [
+            op
+            for patch in payload
+            if isinstance(patch, dict)
+            for op in patch.get("diff", [])
+            if isinstance(op, dict)
+        ]
+        if not operations:
+            return replace(prior, fetch="unchanged")
+        try:
+            # A copy, so a patch failing halfway leaves `prior` intact for the next poll.
+            feed = apply_patch(copy.deepcopy(prior.feed), operations)
+        except JsonPatchError:
+            return None
+        return self._parse_game_feed(feed, fetch="patch")
+
+    def get_game_feed(self, game_id: int, *, prior: MlbGameFeed | None = None) -> MlbGameFeed:
+        """Fetch a game's live feed, incrementally when a previous version is known.
+
+        With `prior`, only the JSON Patch diffs since `prior.timecode` are
+        downloaded and applied to a copy of `prior.feed`; a Final `prior` is
+        returned as is without any request. If the diffs do not apply, the
+        whole feed is fetched instead.
+        """
+
+        if prior is not None and prior.is_final:
+            return replace(prior, fetch="unchanged")
+        with self._stage("fetch_game_feed"):
+            if prior is not None and prior.timecode:
+                payload = self._http.get_json_value(
+                    ENDPOINTS["game_feed_diff"].format(game_id=game_id),
+                    params={"startTimecode": prior.timecode},
+                )
+                patched = self._patched_feed(prior, payload)
+                if patched is not None:
+                    return patched
+            feed = self._http.get_json(ENDPOINTS["game_feed"].format(game_id=game_id))
+        return self._parse_game_feed(feed, fetch="full")
+
+    async def aget_game_feed(
+        self, game_id: int, *, prior: MlbGameFeed | None = None
+    ) -> MlbGameFeed:
+        if prior is not None and prior.is_final:
+            return replace(prior, fetch="unchanged")
+        if prior is not None and prior.timecode:
+            payload = await self.async_http.get_json_value(
+                ENDPOINTS["game_feed_diff"].format(game_id=game_id),
+                params={"startTimecode": prior.timecode},
+            )
+            patched = self._patched_feed(prior, payload)
+            if patched is not None:
+                return patched
+        feed = await self.async_http.get_json(ENDPOINTS["game_feed"].format(game_id=game_id))
+        return self._parse_game_feed(feed, fetch="full")
+
+    def list_game_feeds(
+        self,
+        game_ids: Iterable[int],
+        *,
+        priors: dict[int, MlbGameFeed] | None = None,
+        max_concurrency: int = 8,
+    ) -> list[MlbGameFeed]:
+        """Fetch several games' feeds concurrently, in the order of `game_ids`.
+
+        `priors` maps game ids to their last known feed (see `get_game_feed`).
+        Feeds that still fail after retries are reported together in a
+        `GameFeedFetchError`, which also carries the feeds that succeeded.
+        """
+
+        priors = priors or {}
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = [
+                (game_id, pool.submit(self.get_game_feed, game_id, prior=priors.get(game_id)))
+                for game_id in game_ids
+            ]
+            with self._stage("fetch_game_feed"):
+                done = [(game_id, future.exception(), future) for game_id, future in futures]
+
+        feeds = [future.result() for _, exc, future in done if exc is None]
+        failures = {game_id: exc for game_id, exc, _ in done if exc is not None}
+        if failures:
+            raise GameFeedFetchError(failures, feeds)
+        return feeds
+
+    async def alist_game_feeds(
+        self,
+        game_ids: Iterable[int],
+        *,
+        priors: dict[int, MlbGameFeed] | None = None,
+        max_concurrency: int = 8,
+    ) -> list[MlbGameFeed]:
+        """asyncio form of `list_game_feeds`."""
+
+        priors = priors or {}
+        ids = list(game_ids)
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(game_id: int) -> MlbGameFeed:
+            async with sem:
+                return await self.aget_game_feed(game_id, prior=priors.get(game_id))
 
-        return out
+        results = await asyncio.gather(*(_one(g) for g in ids), return_exceptions=True)
+        feeds = [r for r in results if isinstance(r, MlbGameFeed)]
+        failures = {g: r for g, r in zip(ids, results, strict=True) if isinstance(r, BaseException)}
+        if failures:
+            raise GameFeedFetchError(failures, feeds)
+        return feeds
@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+from cityscape.integrations.nba.stub import NbaStubSource
+
+__all__ = ["NbaStubSource"]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import Any
+
+from cityscape.integrations.leagues import Endpoint, LoadChunk, schedule_windows
+from cityscape.integrations.nba.stub import NbaStubSource
+from cityscape.utils.db import RawTable, UpsertTarget, ensure_raw_tables
+from cityscape.utils.payloads import canonical_json
+
+__all__ = ["NBA_GAMES", "NBA_RAW_TABLES", "NBA_TEAMS", "NbaConnector"]
+
+NBA_TEAMS = RawTable(
+    target=UpsertTarget(
+        table="raw.nba_teams",
+        key=("team_id", "season"),
+        columns=("team_id", "season", "team_name", "team_abbr", "conference", "raw"),
+    ),
+    ddl="""
+        create table if not exists raw.nba_teams (
+          team_id integer not null,
+          season integer not null,
+          team_name varchar not null,
+          team_abbr varchar null,
+          conference varchar null,
+          raw jsonb not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (team_id, season)
+        ) partition by list (season)
+    """,
+)
+
+NBA_GAMES = RawTable(
+    target=UpsertTarget(
+        table="raw.nba_games",
+        key=("game_id", "season"),
+        columns=(
+            "game_id",
+            "season",
+            "game_date",
+            "status",
+            "home_team_id",
+            "away_team_id",
+            "home_score",
+            "away_score",
+            "raw",
+        ),
+    ),
+    ddl="""
+        create table if not exists raw.nba_games (
+          game_id bigint not null,
+          season integer not null,
+          game_date date null,
+          status varchar null,
+          home_team_id integer null,
+          away_team_id integer null,
+          home_score integer null,
+          away_score integer null,
+          raw jsonb not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (game_id, season)
+        ) partition by list (season)
+    """,
+    indexes=("game_date", "loaded_at"),
+)
+
+NBA_RAW_TABLES: tuple[RawTable, ...] = (NBA_TEAMS, NBA_GAMES)
+
+
+def _team_id(side: Any) -> int | None:
+    return int(side["id"]) if isinstance(side, dict) and side.get("id") is not None else None
+
+
+class NbaConnector:
+    """NBA for the shared ingest engine, backed by `NbaStubSource` for now.
+
+    Fetches the season's teams, then its games one calendar month at a time.
+    """
+
+    league = "nba"
+    tables = NBA_RAW_TABLES
+
+    def __init__(self, source: NbaStubSource | None = None) -> None:
+        self.source = source or NbaStubSource()
+
+    def ensure_storage(self, conn, seasons: Iterable[int]) -> None:
+        ensure_raw_tables(conn, self.tables, seasons)
+
+    def endpoints(
+        self, season: int, *, start_date: date | None = None, end_date: date | None = None
+    ) -> list[Endpoint]:
+        first, last = self.source.season_bounds(season)
+        windows = schedule_windows(start_date or first, end_date or last, "month")
+        return [
+            Endpoint(self.league, "teams", season),
+            *(Endpoint(self.league, "games", season, start, end) for start, end in windows),
+        ]
+
+    def fetch(self, endpoint: Endpoint) -> Any:
+        if endpoint.name == "teams":
+            return self.source.teams(endpoint.season)
+        if endpoint.name == "games":
+            return self.source.games(
+                endpoint.season, start_date=endpoint.start_date, end_date=endpoint.end_date
+            )
+        raise ValueError(f"Unknown NBA endpoint {endpoint.name!r}")
+
+    def settled(self, endpoint: Endpoint, payload: Any) -> bool:
+        _, last = self.source.season_bounds(endpoint.season)
+        if last >= (self.source.today or date.today()):
+            return False
+        return all(g.get("status") == "Final" for g in payload.get("games", []))
+
+    def load_options(self) -> dict[str, Any]:
+        return {}
+
+    def parse(self, endpoint: Endpoint, payload: Any) -> Iterator[LoadChunk]:
+        if endpoint.name == "teams":
+            teams = [t for t in payload.get("teams", []) if isinstance(t, dict)]
+            yield LoadChunk(
+                NBA_TEAMS.target,
+                {
+                    "team_id": [int(t["id"]) for t in teams],
+                    "season": [endpoint.season] * len(teams),
+                    "team_name": [str(t.get("full_name") or "") for t in teams],
+                    "team_abbr": [t.get("abbreviation") for t in teams],
+                    "conference": [t.get("conference") for t in teams],
+                    "raw": [canonical_json(t) for t in teams],
+                },
+            )
+            return
+
+        games = [g for g in payload.get("games", []) if isinstance(g, dict)]
+        if not games:
+            return
+        yield LoadChunk(
+            NBA_GAMES.target,
+            {
+                "game_id": [int(g["id"]) for g in games],
+                "season": [endpoint.season] * len(games),
+                "game_date": [
+                    date.fromisoformat(g["date"]) if g.get("date") else None for g in games
+                ],
+                "status": [g.get("status") for g in games],
+                "home_team_id": [_team_id(g.get("home_team")) for g in games],
+                "away_team_id": [_team_id(g.get("visitor_team")) for g in games],
+                "home_score": [g.get("home_team_score") for g in games],
+                "away_score": [g.get("visitor_team_score") for g in games],
+                "raw": [canonical_json(g) for g in games],
+            },
+        )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+__all__ = ["NBA_TEAMS", "NbaStubSource"]
+
+# (abbreviation, name, conference)
+NBA_TEAMS: tuple[tuple[str, str, str], ...] = (
+    ("ATL", "Atlanta Hawks", "East"),
+    ("BOS", "Boston Celtics", "East"),
+    ("BKN", "Brooklyn Nets", "East"),
+    ("CHA", "Charlotte Hornets", "East"),
+    ("CHI", "Chicago Bulls", "East"),
+    ("CLE", "Cleveland Cavaliers", "East"),
+    ("DET", "Detroit Pistons", "East"),
+    ("IND", "Indiana Pacers", "East"),
+    ("MIA", "Miami Heat", "East"),
+    ("MIL", "Milwaukee Bucks", "East"),
+    ("NYK", "New York Knicks", "East"),
+    ("ORL", "Orlando Magic", "East"),
+    ("PHI", "Philadelphia 76ers", "East"),
+    ("TOR", "Toronto Raptors", "East"),
+    ("WAS", "Washington Wizards", "East"),
+    ("DAL", "Dallas Mavericks", "West"),
+    ("DEN", "Denver Nuggets", "West"),
+    ("GSW", "Golden State Warriors", "West"),
+    ("HOU", "Houston Rockets", "West"),
+    ("LAC", "LA Clippers", "West"),
+    ("LAL", "Los Angeles Lakers", "West"),
+    ("MEM", "Memphis Grizzlies", "West"),
+    ("MIN", "Minnesota Timberwolves", "West"),
+    ("NOP", "New Orleans Pelicans", "West"),
+    ("OKC", "Oklahoma City Thunder", "West"),
+    ("PHX", "Phoenix Suns", "West"),
+    ("POR", "Portland Trail Blazers", "West"),
+    ("SAC", "Sacramento Kings", "West"),
+    ("SAS", "San Antonio Spurs", "West"),
+    ("UTA", "Utah Jazz", "West"),
+)
+
+# Games per day of the synthetic schedule (~1230 over a regular season, like the real one).
+_GAMES_PER_DAY = 7
+
+
+class NbaStubSource:
+    """Local stand-in for an NBA stats API, until a real source is wired up.
+
+    Serves `teams` and `games` responses for a season (season 2024 is 2024-25):
+    from `<root>/<season>/{teams,games}.json` when `root` is given (e.g.
+    responses recorded from a real API), otherwise from a synthetic league
+    generated deterministically per season. Synthetic games dated before
+    `today` are Final with scores; later ones are Scheduled. `latency_s` is
+    slept per request, to stand in for a network round trip.
+    """
+
+    def __init__(
+        self, *, root: Path | None = None, latency_s: float = 0.0, today: date | None = None
+    ) -> None:
+        self.root = root
+        self.latency_s = latency_s
+        self.today = today
+
+    @staticmethod
+    def season_bounds(season: int) -> tuple[date, date]:
+        """First and last day of the regular season."""
+
+        return date(season, 10, 22), date(season + 1, 4, 13)
+
+    def _recorded(self, season: int, name: str) -> dict[str, Any] | None:
+        if self.root is None:
+            return None
+        path = self.root / str(season) / f"{name}.json"
+        return json.loads(path.read_bytes()) if path.exists() else None
+
+    def teams(self, season: int) -> dict[str, Any]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        recorded = self._recorded(season, "teams")
+        if recorded is not None:
+            return recorded
+        return {
+            "teams": [
+                {
+                    "id": i,
+                    "abbreviation": abbr,
+                    "full_name": name,
+                    "conference": conference,
+                }
+                for i, (abbr, name, conference) in enumerate(NBA_TEAMS, start=1)
+            ]
+        }
+
+    def games(
+        self, season: int, *, start_date: date | None = None, end_date: date | None = None
+    ) -> dict[str, Any]:
+        """Games of `season` dated within [start_date, end_date] (inclusive), by date."""
+
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        recorded = self._recorded(season, "games")
+        games = recorded["games"] if recorded is not None else self._synthetic_games(season)
+        start = (start_date or date.min).isoformat()
+        end = (end_date or date.max).isoformat()
+        return {"games": [g for g in games if start <= g["date"] <= end]}
+
+    def _synthetic_games(self, season: int) -> list[dict[str, Any]]:
+        rng = random.Random(season)
+        today = self.today or date.today()
+        first, last = self.season_bounds(season)
+        team_ids = list(range(1, len(NBA_TEAMS) + 1))
+        games: list[dict[str, Any]] = []
+        day = first
+        while day <= last:
+            rng.shuffle(team_ids)
+            for n in range(_GAMES_PER_DAY):
+                home, visitor = team_ids[2 * n], team_ids[2 * n + 1]
+                # Drawn for every game, so a game keeps its teams and result as `today` moves.
+                home_score = rng.randint(90, 135)
+                visitor_score = rng.choice([s for s in range(90, 136) if s != home_score])
+                final = day < today
+                games.append(
+                    {
+                        "id": season * 100_000 + len(games) + 1,
+                        "date": day.isoformat(),
+                        "season": season,
+                        "status": "Final" if final else "Scheduled",
+                        "home_team": {"id": home},
+                        "visitor_team": {"id": visitor},
+                        "home_team_score": home_score if final else None,
+                        "visitor_team_score": visitor_score if final else None,
+                    }
+                )
+            day += timedelta(days=1)
+        return games
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Literal
+
+from cityscape.utils.settings import get_settings
+
+__all__ = [
+    "OUTCOMES",
+    "CircuitOpenError",
+    "Outcome",
+    "RateLimiter",
+    "default_rate_limiter",
+]
+
+# How a request went, as far as the limiter cares: "throttled" is a 429/503
+# (slow down, maybe for Retry-After seconds), "failed" a retryable error.
+# Permanent errors (404, bad params) say nothing about load and count as "ok".
+Outcome = Literal["ok", "throttled", "failed"]
+OUTCOMES: tuple[str, ...] = ("ok", "throttled", "failed")
+
+# How often a caller waiting for a free concurrency slot re-checks.
+_SLOT_POLL_S = 0.01
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+    def __init__(self, name: str, retry_in_s: float) -> None:
+        self.retry_in_s = retry_in_s
+        super().__init__(
+            f"Circuit {name!r} is open after repeated failures; retry in {retry_in_s:.1f}s"
+        )
+
+
+@dataclass(slots=True)
+class _SharedState:
+    tokens: float
+    updated_at: float
+    cooldown_until: float = 0.0
+    failures: int = 0
+    open_until: float = 0.0
+
+
+class _MemoryState:
+    """Limiter state shared by the threads and tasks of one process."""
+
+    def __init__(self, burst: float) -> None:
+        self._state = _SharedState(tokens=burst, updated_at=time.time())
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[_SharedState]:
+        with self._lock:
+            yield self._state
+
+
+class _SqliteState:
+    """Limiter state shared by every process on the host through one SQLite file.
+
+    Each transaction is `begin immediate`, so read-modify-write cycles of
+    different processes are serialized by SQLite's file lock.
+    """
+
+    def __init__(self, path: str | Path, name: str, burst: float) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._name = name
+        self._burst = burst
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute("pragma synchronous=off")
+        self._db.execute(
+            """
+            create table if not exists limiters (
+              name text primary key,
+              tokens real not null,
+              updated_at real not null,
+              cooldown_until real not null,
+              failures integer not null,
+              open_until real not null
+            )
+            """
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[_SharedState]:
+        with self._lock:
+            self._db.execute("begin immediate")
+            try:
+                row = self._db.execute(
+                    """
+                    select tokens, updated_at, cooldown_until, failures, open_until
+                    from limiters where name = ?
+                    """,
+                    (self._name,),
+                ).fetchone()
+                state = (
+                    _SharedState(*row)
+                    if row
+                    else _SharedState(tokens=self._burst, updated_at=time.time())
+                )
+                yield state
+                self._db.execute(
+                    """
+                    insert into limiters
+                      (name, tokens, updated_at, cooldown_until, failures, open_until)
+                    values (?, ?, ?, ?, ?, ?)
+                    on conflict (name) do update set
+                      tokens = excluded.tokens,
+                      updated_at = excluded.updated_at,
+                      cooldown_until = excluded.cooldown_until,
+                      failures = excluded.failures,
+                      open_until = excluded.open_until
+                    """,
+                    (
+                        self._name,
+                        state.tokens,
+                        state.updated_at,
+                        state.cooldown_until,
+                        state.failures,
+                        state.open_until,
+                    ),
+                )
+            except BaseException:
+                self._db.execute("rollback")
+                raise
+            self._db.execute("commit")
+
+
+class RateLimiter:
+    """Request admission for one upstream host: token bucket, AIMD concurrency, circuit breaker.
+
+    A request needs a token (refilled at `rate_per_s`, up to `burst`) and a free
+    concurrency slot. The concurrency limit follows AIMD: each "ok" outcome adds
+    1/limit, each "throttled" or "failed" one halves it (between
+    `min_concurrency` and `max_concurrency`). A Retry-After on a throttled
+    response pauses every caller until it has passed. After `failure_threshold`
+    consecutive non-ok outcomes the circuit opens: requests fail fast with
+    `CircuitOpenError` for `reset_s`, then one probe is let through, and its
+    success closes the circuit again.
+
+    One instance is safe to share between threads and asyncio tasks. With
+    `state_path`, the token bucket, Retry-After pause and circuit state live in
+    a SQLite file (keyed by `name`) shared by every process that uses the same
+    path; the concurrency limit stays per process.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_per_s: float = 10.0,
+        burst: float | None = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        failure_threshold: int = 10,
+        reset_s: float = 30.0,
+        jitter: float = 0.1,
+        name: str = "default",
+        state_path: str | Path | None = None,
+    ) -> None:
+        if rate_per_s <= 0:
+            raise ValueError(f"rate_per_s must be positive, got {rate_per_s}")
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError(
+                "Need 1 <= min_concurrency <= max_concurrency, "
+                f"got {min_concurrency} and {max_concurrency}"
+            )
+        self.name = name
+        self.rate_per_s = rate_per_s
+        self.burst = burst if burst is not None else max(1.0, rate_per_s)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.reset_s = reset_s
+        self.jitter = jitter
+
+        self._limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._shared: _MemoryState | _SqliteState = (
+            _SqliteState(state_path, name, self.burst) if state_path else _MemoryState(self.burst)
+        )
+
+    @property
+    def concurrency(self) -> int:
+        """Current concurrency limit (requests allowed in flight at once)."""
+
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> float | None:
+        """Take a slot and a token if both are free now.
+
+        Returns 0.0 on success, the seconds until a token (or the end of a
+        Retry-After pause) otherwise, or None when every slot is taken. Raises
+        `CircuitOpenError` while the circuit is open.
+        """
+
+        # The slot is reserved under the process-local lock; the shared state is
+        # read outside it, so a slow state file never holds up `release()`.
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                return None
+            self._in_flight += 1
+        try:
+            wait_s = self._take_token()
+        except BaseException:
+            self._free_slot()
+            raise
+        if wait_s:
+            self._free_slot()
+        return wait_s
+
+    def _take_token(self) -> float:
+        with self._shared.transaction() as state:
+            now = time.time()
+            if state.open_until > now:
+                raise CircuitOpenError(self.name, state.open_until - now)
+            if state.cooldown_until > now:
+                return state.cooldown_until - now
+
+            elapsed = max(0.0, now - state.updated_at)
+            state.tokens = min(self.burst, state.tokens + elapsed * self.rate_per_s)
+            state.updated_at = now
+            if state.tokens < 1.0:
+                return (1.0 - state.tokens) / self.rate_per_s
+            state.tokens -= 1.0
+            if state.failures >= self.failure_threshold:
+                # Half-open: this caller is the probe; keep everyone else out meanwhile.
+                state.open_until = now + self.reset_s
+        return 0.0
+
+    def _free_slot(self) -> None:
+        with self._released:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._released.notify()
+
+    def _jittered(self, wait_s: float) -> float:
+        return wait_s * (1.0 + random.uniform(0.0, self.jitter))
+
+    def acquire(self) -> None:
+        """Block until a request may be sent; pair every call with `release()`."""
+
+        while True:
+            wait_s = self.try_acquire()
+            if wait_s == 0.0:
+                return
+            if wait_s is None:
+                with self._released:
+                    if self._in_flight >= int(self._limit):
+                        self._released.wait(timeout=_SLOT_POLL_S * 10)
+                continue
+            time.sleep(self._jittered(wait_s))
+
+    async def aacquire(self) -> None:
+        """asyncio form of `acquire()`."""
+
+        while True:
+            wait_s = await self._atry_acquire()
+            if wait_s == 0.0:
+                return
+            await asyncio.sleep(_SLOT_POLL_S if wait_s is None else self._jittered(wait_s))
+
+    async def _atry_acquire(self) -> float | None:
+        # The SQLite state can block for seconds on a busy file, so that step runs
+        # off the event loop; a slot won by a cancelled caller is handed back.
+        if isinstance(self._shared, _MemoryState):
+            return self.try_acquire()
+        attempt = asyncio.ensure_future(asyncio.to_thread(self.try_acquire))
+        try:
+            return await asyncio.shield(attempt)
+        except asyncio.CancelledError:
+            attempt.add_done_callback(self._undo_acquire)
+            raise
+
+    def _undo_acquire(self, attempt: asyncio.Future[float | None]) -> None:
+        if not attempt.cancelled() and attempt.exception() is None and attempt.result() == 0.0:
+            self._free_slot()
+
+    def release(self, outcome: Outcome, *, retry_after_s: float | None = None) -> None:
+        """Return the slot taken by `acquire()` and feed the outcome back."""
+
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome {outcome!r}; expected one of {OUTCOMES}")
+
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if outcome == "ok":
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            else:
+                self._limit = max(float(self.min_concurrency), self._limit / 2.0)
+
+        with self._shared.transaction() as state:
+            now = time.time()
+            if outcome == "ok":
+                state.failures = 0
+                state.open_until = 0.0
+            else:
+                state.failures += 1
+                if state.failures >= self.failure_threshold:
+                    state.open_until = now + self.reset_s
+                if outcome == "throttled" and retry_after_s:
+                    state.cooldown_until = max(state.cooldown_until, now + retry_after_s)
+        with self._released:
+            self._released.notify_all()
+
+    async def arelease(self, outcome: Outcome, *, retry_after_s: float | None = None) -> None:
+        """asyncio form of `release()`; the SQLite state is written off the event loop."""
+
+        if isinstance(self._shared, _MemoryState):
+            self.release(outcome, retry_after_s=retry_after_s)
+        else:
+            await asyncio.to_thread(self.release, outcome, retry_after_s=retry_after_s)
+
+
+@cache
+def default_rate_limiter(name: str) -> RateLimiter:
+    """Process-wide limiter for host `name`, configured by the `CITYSCAPE_HTTP_*` settings.
+
+    `CITYSCAPE_HTTP_RATE` (requests/s, default 10) and
+    `CITYSCAPE_HTTP_MAX_CONCURRENCY` (default 16) set the limits;
+    `CITYSCAPE_HTTP_RATE_STATE` (a file path) shares them across processes.
+    """
+
+    settings = get_settings()
+    return RateLimiter(
+        rate_per_s=settings.http_rate_per_s or 10.0,
+        max_concurrency=settings.http_max_concurrency or 16,
+        name=name,
+        state_path=settings.http_rate_state_path,
+    )
@@ -0,0 +1,95 @@
+"""In-process result cache of the read API."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from cityscape.integrations.cache import CacheStats
+
+__all__ = ["ResultCache"]
+
+
+class ResultCache:
+    """LRU cache of encoded response bodies, bounded by entries and bytes, with a TTL.
+
+    Keys carry the watermark of the table they were read from (see
+    `cityscape.serve.server`), so a load makes older entries unreachable;
+    `drop` frees them right away instead of waiting for the LRU. One instance
+    is shared by every request thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (body, expires_at), least recently used first
+        self._entries: OrderedDict[Hashable, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        """Store `body`; a body larger than a quarter of `max_bytes` is not cached."""
+
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, self._clock() + self.ttl_s)
+            self._size += len(body)
+            self._stores += 1
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def drop(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove the entries whose key matches `predicate`; returns how many."""
+
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        body, _ = self._entries.pop(key)
+        self._size -= len(body)
@@ -0,0 +1,179 @@
+"""Game queries of the read API: routes, keyset pagination and SQL over core_<league>__games."""
+
+from __future__ import annotations
+
+import base64
+import re
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Any
+from urllib.parse import urlencode
+
+import orjson
+from psycopg2 import sql
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "GAME_COLUMNS",
+    "MAX_PAGE_SIZE",
+    "GameQuery",
+    "fetch_games",
+    "parse_game_query",
+]
+
+# Columns every core_<league>__games model has (see dbt/models/core).
+GAME_COLUMNS: tuple[str, ...] = (
+    "game_id",
+    "season",
+    "game_date",
+    "home_team_id",
+    "home_team_name",
+    "away_team_id",
+    "away_team_name",
+    "loaded_at",
+)
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10_000
+
+# /v1/<league>/games, /v1/<league>/seasons/<season>/games, /v1/<league>/teams/<team>/games
+_ROUTE = re.compile(
+    r"^/v1/(?P<league>[a-z]+)(?:/seasons/(?P<season>\d{4})|/teams/(?P<team>[\w-]+))?/games/?$"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GameQuery:
+    """One page of games of a league, filtered by any of season, date and team.
+
+    Pages are ordered by (game_date, game_id); `after` is the last key of the
+    previous page. Hashable, so it doubles as the result cache key.
+    """
+
+    league: str
+    season: int | None = None
+    game_date: date | None = None
+    team_id: int | None = None
+    limit: int = DEFAULT_PAGE_SIZE
+    after: tuple[date | None, str] | None = None
+
+    def url(self, *, after: tuple[date | None, str] | None = None) -> str:
+        """Canonical URL of this query, or of its page after `after`."""
+
+        params: dict[str, Any] = {"limit": self.limit}
+        if self.season is not None:
+            params["season"] = self.season
+        if self.game_date is not None:
+            params["date"] = self.game_date.isoformat()
+        if self.team_id is not None:
+            params["team"] = self.team_id
+        after = after or self.after
+        if after is not None:
+            params["cursor"] = _encode_cursor(after)
+        return f"/v1/{self.league}/games?{urlencode(sorted(params.items()))}"
+
+
+def _encode_cursor(after: tuple[date | None, str]) -> str:
+    game_date, game_id = after
+    token = orjson.dumps([game_date.isoformat() if game_date else None, game_id])
+    return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+
+def _decode_cursor(token: str) -> tuple[date | None, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        game_date, game_id = orjson.loads(raw)
+        return (date.fromisoformat(game_date) if game_date else None), str(game_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor {token!r}") from exc
+
+
+def _one(params: Mapping[str, Sequence[str]], name: str) -> str | None:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def parse_game_query(
+    path: str, params: Mapping[str, Sequence[str]], *, page_size: int = DEFAULT_PAGE_SIZE
+) -> GameQuery:
+    """The query of a request, from its path and query string (as from `parse_qs`).
+
+    Raises LookupError for an unknown route and ValueError for bad parameters.
+    """
+
+    match = _ROUTE.match(path)
+    if match is None:
+        raise LookupError(path)
+
+    season = match["season"] or _one(params, "season")
+    team_id = match["team"] or _one(params, "team")
+    game_date = _one(params, "date")
+    limit = _one(params, "limit")
+    cursor = _one(params, "cursor")
+    try:
+        query = GameQuery(
+            league=match["league"],
+            season=int(season) if season else None,
+            game_date=date.fromisoformat(game_date) if game_date else None,
+            team_id=int(team_id) if team_id else None,
+            limit=int(limit) if limit else page_size,
+        )
+    except ValueError as exc:
+        raise ValueError(f"Invalid parameter: {exc}") from exc
+    if not 1 <= query.limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return replace(query, after=_decode_cursor(cursor)) if cursor else query
+
+
+def _page_sql(table: str, query: GameQuery) -> tuple[sql.Composed, list[Any]]:
+    where: list[sql.Composable] = []
+    args: list[Any] = []
+    if query.season is not None:
+        where.append(sql.SQL("season = %s"))
+        args.append(query.season)
+    if query.game_date is not None:
+        where.append(sql.SQL("game_date = %s"))
+        args.append(query.game_date)
+    if query.team_id is not None:
+        # Staging casts the team ids to varchar, so bind the id as text to match.
+        where.append(sql.SQL("(home_team_id = %s or away_team_id = %s)"))
+        args += [str(query.team_id), str(query.team_id)]
+    if query.after is not None:
+        # Keyset pagination; a game without a date sorts last (nulls last, as in the order by).
+        after_date, after_id = query.after
+        if after_date is None:
+            where.append(sql.SQL("game_date is null and game_id > %s"))
+            args.append(after_id)
+        else:
+            where.append(
+                sql.SQL(
+                    "(game_date > %s or game_date is null or (game_date = %s and game_id > %s))"
+                )
+            )
+            args += [after_date, after_date, after_id]
+
+    schema, name = table.split(".", 1)
+    statement = sql.SQL(
+        "select {columns} from {table} where {where} order by game_date, game_id limit %s"
+    ).format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, GAME_COLUMNS)),
+        table=sql.Identifier(schema, name),
+        where=sql.SQL(" and ").join(where) if where else sql.SQL("true"),
+    )
+    # One row past the page tells whether there is a next one.
+    return statement, [*args, query.limit + 1]
+
+
+def fetch_games(conn, table: str, query: GameQuery, *, itersize: int = 2000) -> Iterator[tuple]:
+    """Rows of `query`'s page plus, if there is a next page, its first row.
+
+    Read through a server-side cursor, `itersize` rows per round trip, so a
+    large page is never held in memory whole.
+    """
+
+    statement, args = _page_sql(table, query)
+    with conn.cursor(name=f"cityscape_serve_{id(query):x}") as cur:
+        cur.itersize = min(itersize, query.limit + 1)
+        cur.execute(statement, args)
+        yield from cur
@@ -0,0 +1,284 @@
+"""`cityscape serve`: a local read-only HTTP API over the core game tables.
+
+    GET /v1/<league>/games?date=2024-04-01
+    GET /v1/<league>/games?season=2024&team=147
+    GET /v1/<league>/seasons/<season>/games
+    GET /v1/<league>/teams/<team_id>/games?season=2024
+    GET /healthz
+
+Game endpoints return `{"league": ..., "games": [...], "count": n, "next": url}`,
+ordered by (game_date, game_id), `limit` games per page (default 1000);
+`next` is the URL of the following page, or null on the last one.
+
+Every response is keyed on its table's watermark: the highest `loaded_at`
+(the raw load time carried through dbt) and the table's oid, read at most
+once per `watermark_s`. ETags derive from it, so a dashboard refresh
+with `If-None-Match` gets a 304 without the query running, and the encoded
+body is kept in an in-process LRU/TTL cache (`ResultCache`) until the next
+dbt run moves the watermark. A page missing from the cache is streamed with
+chunked transfer encoding as rows arrive from a server-side cursor.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Generator
+from contextlib import closing
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import orjson
+from psycopg2 import sql
+
+from cityscape.serve.cache import ResultCache
+from cityscape.serve.queries import (
+    DEFAULT_PAGE_SIZE,
+    GAME_COLUMNS,
+    GameQuery,
+    fetch_games,
+    parse_game_query,
+)
+from cityscape.utils.db import PostgresConfig, get_pool, postgres_config
+from cityscape.utils.logger import get_logger
+
+__all__ = ["ReadApi", "make_server", "serve"]
+
+# Bytes of encoded rows per chunk written to the client.
+_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class _Watermark:
+    value: str
+    checked_at: float
+
+
+class ReadApi:
+    """Queries, watermarks and the result cache behind the HTTP handler."""
+
+    def __init__(
+        self,
+        *,
+        cfg: PostgresConfig | None = None,
+        schema: str = "core",
+        cache: ResultCache | None = None,
+        watermark_s: float = 1.0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        self.pool = get_pool(cfg or postgres_config())
+        self.schema = schema
+        self.cache = cache or ResultCache()
+        self.watermark_s = watermark_s
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._tables: dict[str, str | None] = {}
+        self._watermarks: dict[str, _Watermark] = {}
+
+    def table(self, league: str) -> str | None:
+        """`<schema>.core_<league>__games`, or None when the model was never built."""
+
+        with self._lock:
+            if league in self._tables:
+                return self._tables[league]
+        table = f"{self.schema}.core_{league}__games"
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("select to_regclass(%s) is not null", (table,))
+            found = table if cur.fetchone()[0] else None
+        with self._lock:
+            # A missing table is looked up again next time (dbt may build it meanwhile).
+            if found is not None:
+                self._tables[league] = found
+        return found
+
+    def watermark(self, table: str) -> str:
+        """Highest `loaded_at` and oid of `table`, re-read at most every `watermark_s`."""
+
+        now = time.monotonic()
+        with self._lock:
+            known = self._watermarks.get(table)
+        if known is not None and now - known.checked_at < self.watermark_s:
+            return known.value
+
+        schema, name = table.split(".", 1)
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("select (select max(loaded_at) from {}), %s::regclass::oid").format(
+                    sql.Identifier(schema, name)
+                ),
+                (table,),
+            )
+            loaded_at, oid = cur.fetchone()
+        value = f"{oid}:{loaded_at.isoformat() if loaded_at else ''}"
+        with self._lock:
+            self._watermarks[table] = _Watermark(value, now)
+        if known is not None and known.value != value:
+            dropped = self.cache.drop(lambda key: key[0] == table and key[1] != value)
+            get_logger("cityscape.serve").info(
+                f"{table} reloaded ({known.value} -> {value}); dropped {dropped} cached pages"
+            )
+        return value
+
+    @staticmethod
+    def etag(table: str, watermark: str, query: GameQuery) -> str:
+        digest = hashlib.sha256(f"{table}|{watermark}|{query.url()}".encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def iter_page(self, table: str, query: GameQuery) -> Generator[bytes]:
+        """The response body of `query`, in chunks of about 64 KiB, read as it is sent."""
+
+        count = 0
+        last: tuple[Any, str] | None = None
+        more = False
+        parts = [b'{"league":', orjson.dumps(query.league), b',"games":[']
+        size = sum(map(len, parts))
+        with self.pool.connection() as conn, closing(fetch_games(conn, table, query)) as rows:
+            for row in rows:
+                if count == query.limit:
+                    more = True
+                    break
+                part = orjson.dumps(dict(zip(GAME_COLUMNS, row, strict=True)))
+                if count:
+                    part = b"," + part
+                parts.append(part)
+                size += len(part)
+                count += 1
+                last = (row[2], row[0])
+                if size >= _CHUNK_BYTES:
+                    yield b"".join(parts)
+                    parts, size = [], 0
+        next_url = query.url(after=last) if more else None
+        parts.append(b'],"count":%d,"next":%s}' % (count, orjson.dumps(next_url)))
+        yield b"".join(parts)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._sent_headers = False
+        try:
+            self._get()
+        except Exception as exc:
+            get_logger("cityscape.serve").exception(f"GET {self.path} failed: {exc!r}")
+            if self._sent_headers:
+                # Mid-stream: the client sees a truncated chunked body.
+                self.close_connection = True
+            else:
+                self._send_json(500, {"error": "Internal error"})
+
+    def _get(self) -> None:
+        api = self.server.api
+        url = urlsplit(self.path)
+        if url.path == "/healthz":
+            self._send_json(200, {"ok": True, "cache": api.cache.stats().as_dict()})
+            return
+        try:
+            query = parse_game_query(url.path, parse_qs(url.query), page_size=api.page_size)
+        except LookupError:
+            self._send_json(404, {"error": f"No route for {url.path}"})
+            return
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+
+        table = api.table(query.league)
+        if table is None:
+            self._send_json(404, {"error": f"No core games table for league {query.league!r}"})
+            return
+        watermark = api.watermark(table)
+        etag = api.etag(table, watermark, query)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in self._if_none_match():
+            self._send(304, headers)
+            return
+
+        key = (table, watermark, query)
+        body = api.cache.get(key)
+        if body is not None:
+            self._send(200, {**headers, "X-Cache": "hit"}, body)
+            return
+        self._stream({**headers, "X-Cache": "miss"}, api.iter_page(table, query), key)
+
+    def _if_none_match(self) -> set[str]:
+        value = self.headers.get("If-None-Match") or ""
+        return {tag.strip().removeprefix("W/") for tag in value.split(",") if tag.strip()}
+
+    def _stream(self, headers: dict[str, str], chunks: Generator[bytes], key: Any) -> None:
+        cache = self.server.api.cache
+        # Closing the generator returns its connection even if the client goes away.
+        with closing(chunks):
+            # The first chunk runs the query, so a database error can still become a 500.
+            chunk = next(chunks)
+            self._start(200, {**headers, "Transfer-Encoding": "chunked"})
+
+            # Only a page small enough to be cached is kept once sent.
+            kept: list[bytes] | None = []
+            size = 0
+            while chunk is not None:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                if kept is not None:
+                    size += len(chunk)
+                    kept = kept if size <= cache.max_bytes // 4 else None
+                    if kept is not None:
+                        kept.append(chunk)
+                chunk = next(chunks, None)
+        self.wfile.write(b"0\r\n\r\n")
+        if kept is not None:
+            cache.put(key, b"".join(kept))
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        self._send(status, {"Cache-Control": "no-store"}, orjson.dumps(payload))
+
+    def _send(self, status: int, headers: dict[str, str], body: bytes = b"") -> None:
+        if status == 304:
+            self._start(status, headers, content_type=False)
+            return
+        self._start(status, {**headers, "Content-Length": str(len(body))})
+        self.wfile.write(body)
+
+    def _start(self, status: int, headers: dict[str, str], *, content_type: bool = True) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self._sent_headers = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        get_logger("cityscape.serve").info(f"{self.address_string()} {format % args}")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: ReadApi) -> None:
+        super().__init__(address, _Handler)
+        self.api = api
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, **api_options: Any) -> _Server:
+    """An HTTP server over a `ReadApi(**api_options)`; `port=0` picks a free port."""
+
+    return _Server((host, port), ReadApi(**api_options))
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, **api_options: Any) -> None:
+    """Serve the read API until interrupted."""
+
+    server = make_server(host, port, **api_options)
+    logger = get_logger("cityscape.serve")
+    address, bound = server.server_address[:2]
+    logger.info(f"Serving core tables of schema {server.api.schema} on http://{address}:{bound}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Stopped; result cache {server.api.cache.stats().as_dict()}")
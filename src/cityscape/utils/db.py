@@ -1,11 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Iterable
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from functools import cache
+from typing import Any, Literal
 
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
 
+from cityscape.utils.partitions import (
+    ensure_list_partition,
+    migrate_to_partitioned,
+    swap_partition,
+)
+from cityscape.utils.settings import get_settings
+
+# How `upsert_*` writes rows:
+# - "batch": a prepared INSERT ... SELECT FROM unnest(arrays) ON CONFLICT (works in autocommit)
+# - "copy": stream rows with COPY into a temp staging table, then one set-based upsert
+LoadMethod = Literal["batch", "copy"]
+LOAD_METHODS: tuple[str, ...] = ("batch", "copy")
+
 
 @dataclass(frozen=True, slots=True)
 class PostgresConfig:
@@ -16,6 +42,19 @@ class PostgresConfig:
     dbname: str
 
 
+def postgres_config() -> PostgresConfig:
+    """The Postgres connection settings from the environment (see `get_settings`)."""
+
+    settings = get_settings()
+    return PostgresConfig(
+        host=settings.postgres_host or "postgres",
+        port=settings.postgres_port or 5432,
+        user=settings.postgres_user or "postgres",
+        password=settings.postgres_password or "postgres",
+        dbname=settings.postgres_dbname or "cityscape",
+    )
+
+
 def connect(cfg: PostgresConfig):
     return psycopg2.connect(
         host=cfg.host,
@@ -26,114 +65,1012 @@ def connect(cfg: PostgresConfig):
     )
 
 
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection frees up within the pool's timeout."""
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """Usage counters of a `ConnectionPool` since it was created."""
+
+    max_size: int
+    open: int
+    in_use: int
+    checkouts: int
+    connects: int
+    discarded: int
+    waits: int
+    wait_s: float
+
+    @property
+    def idle(self) -> int:
+        return self.open - self.in_use
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            "max_size": self.max_size,
+            "open": self.open,
+            "in_use": self.in_use,
+            "idle": self.idle,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "discarded": self.discarded,
+            "waits": self.waits,
+            "wait_s": round(self.wait_s, 3),
+        }
+
+
+class ConnectionPool:
+    """Thread-safe pool of up to `max_size` connections to one database.
+
+    `connection()` lends a connection for the duration of a `with` block, with
+    the semantics of `with psycopg2.connect(...) as conn`: commit on a clean
+    exit, rollback on an exception. Connections go back with autocommit off and
+    default session settings; closed or broken ones are dropped and replaced
+    on demand. When every connection is lent out, callers wait up to
+    `timeout_s` before `PoolTimeoutError`.
+    """
+
+    def __init__(self, cfg: PostgresConfig, *, max_size: int = 10, timeout_s: float = 30.0) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+        self.cfg = cfg
+        self.max_size = max_size
+        self.timeout_s = timeout_s
+        self.pid = os.getpid()
+        self._idle: list[Any] = []
+        self._open = 0
+        self._in_use = 0
+        self._checkouts = self._connects = self._discarded = self._waits = 0
+        self._wait_s = 0.0
+        self._cond = threading.Condition()
+
+    def _checkout(self) -> Any:
+        deadline = time.monotonic() + self.timeout_s
+        conn = None
+        with self._cond:
+            waited_from = None
+            while True:
+                while conn is None and self._idle:
+                    conn = self._idle.pop()
+                    if conn.closed:
+                        self._open -= 1
+                        self._discarded += 1
+                        conn = None
+                if conn is not None or self._open < self.max_size:
+                    break
+                if waited_from is None:
+                    waited_from = time.monotonic()
+                    self._waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._wait_s += time.monotonic() - waited_from
+                    raise PoolTimeoutError(
+                        f"No Postgres connection free after {self.timeout_s:.0f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+            if waited_from is not None:
+                self._wait_s += time.monotonic() - waited_from
+            self._checkouts += 1
+            self._in_use += 1
+            if conn is None:
+                # Reserve the slot; connect outside the lock.
+                self._open += 1
+                self._connects += 1
+        if conn is not None:
+            return conn
+        try:
+            return connect(self.cfg)
+        except BaseException:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, conn: Any, *, discard: bool) -> None:
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = False
+                conn.set_session(
+                    isolation_level="DEFAULT", readonly="DEFAULT", deferrable="DEFAULT"
+                )
+            except psycopg2.Error:
+                discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard or conn.closed:
+                self._open -= 1
+                self._discarded += 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+        if discard and not conn.closed:
+            conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._checkout()
+        discard = False
+        try:
+            yield conn
+            if not conn.closed and not conn.autocommit:
+                conn.commit()
+        except BaseException as exc:
+            # A lost server connection leaves nothing worth reusing.
+            discard = isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not conn.closed and not discard:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            raise
+        finally:
+            self._checkin(conn, discard=discard)
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return PoolStats(
+                max_size=self.max_size,
+                open=self._open,
+                in_use=self._in_use,
+                checkouts=self._checkouts,
+                connects=self._connects,
+                discarded=self._discarded,
+                waits=self._waits,
+                wait_s=self._wait_s,
+            )
+
+    def close(self) -> None:
+        """Close the idle connections; lent ones are closed when they come back."""
+
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            conn.close()
+
+
+_pools: dict[PostgresConfig, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(cfg: PostgresConfig, *, max_size: int | None = None) -> ConnectionPool:
+    """Process-wide `ConnectionPool` for `cfg`, created on first use.
+
+    `max_size` defaults to `CITYSCAPE_PG_POOL_SIZE` (10). A forked child gets a
+    fresh pool rather than sharing its parent's sockets.
+    """
+
+    with _pools_lock:
+        pool = _pools.get(cfg)
+        if pool is None or pool.pid != os.getpid():
+            size = max_size or get_settings().postgres_pool_size or 10
+            pool = _pools[cfg] = ConnectionPool(cfg, max_size=size)
+        return pool
+
+
+@atexit.register
+def close_pools() -> None:
+    with _pools_lock:
+        pools = [p for p in _pools.values() if p.pid == os.getpid()]
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+@cache
+def write_slots(limit: int) -> threading.BoundedSemaphore:
+    """Process-wide semaphore bounding concurrent Postgres writers.
+
+    Every caller asking for the same `limit` shares one semaphore, so parallel
+    ingests can fetch freely while at most `limit` of them hold a write transaction.
+    """
+
+    if limit < 1:
+        raise ValueError(f"write_slots limit must be >= 1, got {limit}")
+    return threading.BoundedSemaphore(limit)
+
+
 def ensure_raw_schema(conn) -> None:
     with conn.cursor() as cur:
         cur.execute("create schema if not exists raw")
 
 
-def ensure_mlb_tables(conn) -> None:
+# Raw MLB tables are list-partitioned by season (one partition per season,
+# e.g. raw.mlb_games_2024); the primary keys include the partition key.
+_MLB_TABLE_DDL: dict[str, str] = {
+    "raw.mlb_teams": """
+        create table if not exists raw.mlb_teams (
+          team_id integer not null,
+          season integer not null,
+          team_name varchar not null,
+          team_abbr varchar null,
+          league_id integer null,
+          division_id integer null,
+          raw jsonb not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (team_id, season)
+        ) partition by list (season)
+    """,
+    "raw.mlb_games": """
+        create table if not exists raw.mlb_games (
+          game_id bigint not null,
+          season integer not null,
+          game_date date null,
+          game_type varchar null,
+          status varchar null,
+          home_team_id integer null,
+          away_team_id integer null,
+          home_score integer null,
+          away_score integer null,
+          raw jsonb not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (game_id, season)
+        ) partition by list (season)
+    """,
+    # Full schedule payloads when raw.mlb_games keeps only a projection (raw_retention="archive").
+    "raw.mlb_games_archive": """
+        create table if not exists raw.mlb_games_archive (
+          game_id bigint not null,
+          season integer not null,
+          codec varchar not null,
+          payload bytea not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (game_id, season)
+        ) partition by list (season)
+    """,
+    # Latest version of each game's live feed; `timecode` is the feed's
+    # metaData.timeStamp, the starting point for the next diffPatch request.
+    "raw.mlb_game_feeds": """
+        create table if not exists raw.mlb_game_feeds (
+          game_id bigint not null,
+          season integer not null,
+          game_date date null,
+          abstract_state varchar null,
+          detailed_state varchar null,
+          timecode varchar null,
+          feed jsonb not null,
+          row_digest text null,
+          loaded_at timestamptz not null default now(),
+          primary key (game_id, season)
+        ) partition by list (season)
+    """,
+}
+
+# Secondary indexes, declared on the partitioned parents so every partition gets them.
+MLB_RAW_INDEXES: dict[str, tuple[str, ...]] = {
+    "raw.mlb_teams": ("loaded_at",),
+    "raw.mlb_games": ("game_date", "status", "loaded_at"),
+    "raw.mlb_games_archive": ("loaded_at",),
+    "raw.mlb_game_feeds": ("game_date", "loaded_at"),
+}
+
+
+class UnpartitionedTableError(RuntimeError):
+    """Raised when a raw table is still the plain table an earlier version created."""
+
+    def __init__(self, tables: list[str]) -> None:
+        self.tables = tables
+        super().__init__(
+            f"{', '.join(tables)} not partitioned by season yet; run `cityscape migrate` "
+            "(it drops the views over them, so run `make dbt-run` afterwards)"
+        )
+
+
+def unpartitioned_tables(conn, tables: Iterable[str]) -> list[str]:
+    """Those of `tables` that exist as plain, unpartitioned tables."""
+
     with conn.cursor() as cur:
         cur.execute(
             """
-            create table if not exists raw.mlb_teams (
-              team_id integer not null,
-              season integer not null,
-              team_name varchar not null,
-              team_abbr varchar null,
-              league_id integer null,
-              division_id integer null,
-              raw jsonb not null,
-              loaded_at timestamptz not null default now(),
-              primary key (team_id, season)
-            );
-            """
+            select t.name
+            from unnest(%s::text[]) with ordinality as t (name, i)
+            join pg_class c on c.oid = to_regclass(t.name)
+            where c.relkind = 'r'
+            order by t.i
+            """,
+            (list(tables),),
         )
+        return [name for (name,) in cur.fetchall()]
+
+
+def _require_partitioned(conn, tables: Iterable[str]) -> None:
+    plain = unpartitioned_tables(conn, tables)
+    if plain:
+        raise UnpartitionedTableError(plain)
+
+
+def ensure_mlb_tables(conn) -> None:
+    """Create the raw MLB tables (partitioned by season) and their indexes.
+
+    Raises UnpartitionedTableError when one is still a plain table from an
+    earlier version (see `migrate_raw_tables`). Only missing objects are
+    created, so repeat calls take no locks that would wait on running loads.
+    """
+
+    _require_partitioned(conn, _MLB_TABLE_DDL)
+    for table, ddl in _MLB_TABLE_DDL.items():
+        schema, _, name = table.partition(".")
+        with conn.cursor() as cur:
+            cur.execute("select to_regclass(%s)", (table,))
+            (existing,) = cur.fetchone()
+            if existing is None:
+                cur.execute(ddl)
+            for column in MLB_RAW_INDEXES[table]:
+                cur.execute(f"create index if not exists {name}_{column}_idx on {table} ({column})")
+
+    with conn.cursor() as cur:
+        # Archive payloads are already compressed, so skip TOAST compression
+        # (inherited by partitions).
         cur.execute(
-            """
-            create table if not exists raw.mlb_games (
-              game_id bigint not null,
-              season integer not null,
-              game_date date null,
-              game_type varchar null,
-              status varchar null,
-              home_team_id integer null,
-              away_team_id integer null,
-              home_score integer null,
-              away_score integer null,
-              raw jsonb not null,
-              loaded_at timestamptz not null default now(),
-              primary key (game_id, season)
-            );
-            """
+            "select attstorage from pg_attribute"
+            " where attrelid = 'raw.mlb_games_archive'::regclass and attname = 'payload'"
+        )
+        if cur.fetchone()[0] != "e":
+            cur.execute(
+                "alter table raw.mlb_games_archive alter column payload set storage external"
+            )
+
+
+def ensure_mlb_season_partitions(conn, season: int) -> None:
+    """Create the `season` partition of every raw MLB table if it does not exist yet.
+
+    Creating a partition briefly locks its parent table, so call this (and commit)
+    before starting a long load rather than inside one.
+    """
+
+    for target in MLB_RAW_TARGETS:
+        ensure_list_partition(conn, target.table, season)
+
+
+# (database, "tables" | season) pairs `ensure_mlb_storage` has created in this process.
+_storage_ready: set[tuple[str, str | int]] = set()
+_storage_lock = threading.Lock()
+
+
+def ensure_mlb_storage(conn, seasons: Iterable[int] = ()) -> None:
+    """Create the raw schema, the MLB tables and `seasons`' partitions, once per process.
+
+    Only what this process has not ensured yet for the connection's database is
+    checked; that is committed at once, releasing the DDL locks before the
+    caller's load. Call `forget_mlb_storage()` after dropping tables or
+    partitions behind its back.
+    """
+
+    db = conn.dsn
+    with _storage_lock:
+        tables = (db, "tables") not in _storage_ready
+        todo = [s for s in dict.fromkeys(seasons) if (db, s) not in _storage_ready]
+        if not tables and not todo:
+            return
+        if tables:
+            ensure_raw_schema(conn)
+            ensure_mlb_tables(conn)
+        for season in todo:
+            ensure_mlb_season_partitions(conn, season)
+        conn.commit()
+        _storage_ready.update([(db, "tables"), *((db, s) for s in todo)])
+
+
+def forget_mlb_storage() -> None:
+    """Make the next `ensure_mlb_storage` (or `ensure_raw_tables`) call check everything again."""
+
+    with _storage_lock:
+        _storage_ready.clear()
+        _raw_tables_ready.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class RawTable:
+    """A raw landing table: how to create it, how to upsert into it, what to index.
+
+    `ddl` creates the table list-partitioned by season (`create table if not
+    exists ... partition by list (season)`), with `target.key` as primary key.
+    """
+
+    target: UpsertTarget
+    ddl: str
+    indexes: tuple[str, ...] = ("loaded_at",)
+
+
+# (database, table, None | season) triples `ensure_raw_tables` has created in this process.
+_raw_tables_ready: set[tuple[str, str, int | None]] = set()
+
+
+def ensure_raw_tables(conn, tables: Iterable[RawTable], seasons: Iterable[int] = ()) -> None:
+    """Create `tables`, their indexes and `seasons`' partitions in the raw schema, once per process.
+
+    The generic form of `ensure_mlb_storage` for tables described by a
+    `RawTable`; what it creates is committed at once. Raises
+    UnpartitionedTableError when a plain table already uses one of the names
+    (see `migrate_raw_tables`).
+    """
+
+    db = conn.dsn
+    tables = list(tables)
+    seasons = list(dict.fromkeys(seasons))
+    with _storage_lock:
+        todo = [t for t in tables if (db, t.target.table, None) not in _raw_tables_ready]
+        parts = [
+            (t, s)
+            for t in tables
+            for s in seasons
+            if (db, t.target.table, s) not in _raw_tables_ready
+        ]
+        if not todo and not parts:
+            return
+        if todo:
+            ensure_raw_schema(conn)
+            _require_partitioned(conn, [t.target.table for t in todo])
+        for t in todo:
+            table = t.target.table
+            _, _, name = table.partition(".")
+            with conn.cursor() as cur:
+                cur.execute(t.ddl)
+                for column in t.indexes:
+                    cur.execute(
+                        f"create index if not exists {name}_{column}_idx on {table} ({column})"
+                    )
+        for t, season in parts:
+            ensure_list_partition(conn, t.target.table, season)
+        conn.commit()
+        _raw_tables_ready.update((db, t.target.table, None) for t in todo)
+        _raw_tables_ready.update((db, t.target.table, s) for t, s in parts)
+
+
+def migrate_raw_tables(conn, tables: Iterable[RawTable]) -> dict[str, int]:
+    """Rebuild the plain tables among `tables` as partitioned by season, then commit.
+
+    Rows are copied under the table's lock (an empty placeholder, e.g. one
+    made so dbt sources resolve, is simply replaced) and views over the old
+    table are dropped with it (rebuild them with `dbt run`), so run this on its
+    own, not next to loads. Returns the rows moved per migrated table.
+    """
+
+    by_name = {t.target.table: t for t in tables}
+    moved: dict[str, int] = {}
+    for table in unpartitioned_tables(conn, by_name):
+        raw = by_name[table]
+        _, _, name = table.partition(".")
+        with conn.cursor() as cur:
+            cur.execute(f"select exists (select 1 from {table})")
+            if cur.fetchone()[0]:
+                moved[table] = migrate_to_partitioned(conn, table, raw.ddl)
+            else:
+                cur.execute(f"drop table {table} cascade")
+                cur.execute(raw.ddl)
+                moved[table] = 0
+            for column in raw.indexes:
+                cur.execute(f"create index if not exists {name}_{column}_idx on {table} ({column})")
+    conn.commit()
+    forget_mlb_storage()
+    return moved
+
+
+@dataclass(frozen=True, slots=True)
+class UpsertCounts:
+    """Outcome of an upsert: rows inserted, rows updated, and rows skipped as unchanged."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def __add__(self, other: UpsertCounts) -> UpsertCounts:
+        return UpsertCounts(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+        )
+
+    def as_dict(self, prefix: str = "") -> dict[str, int]:
+        return {
+            f"{prefix}inserted": self.inserted,
+            f"{prefix}updated": self.updated,
+            f"{prefix}unchanged": self.unchanged,
+        }
+
+
+def _digest_default(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(value).hexdigest()
+    return str(value)
+
+
+def row_digest(row: dict[str, Any], columns: Iterable[str]) -> str:
+    """Stable sha256 of a row's values (including nested jsonb), independent of key order."""
+
+    canonical = json.dumps(
+        [row[c] for c in columns],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_digest_default,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class UpsertTarget:
+    """Describes a raw landing table for the generic upsert helpers.
+
+    Every write also stores `row_digest(row, columns)` in `digest_column`; conflicting
+    rows whose digest is unchanged are left untouched (no new tuple, no `loaded_at` bump).
+    """
+
+    table: str
+    key: tuple[str, ...]
+    columns: tuple[str, ...]
+    json_columns: tuple[str, ...] = ("raw",)
+    digest_column: str = "row_digest"
+
+    @property
+    def staging_table(self) -> str:
+        return "_stg_" + self.table.replace(".", "_")
+
+    @property
+    def write_columns(self) -> tuple[str, ...]:
+        return (*self.columns, self.digest_column)
+
+    def _upsert_clause(self) -> str:
+        updates = ",\n      ".join(
+            f"{c} = excluded.{c}" for c in self.write_columns if c not in self.key
+        )
+        # The subquery runs on the statement's snapshot, so it finds the key only if
+        # the row existed before (an update). `xmax` is not readable on partitioned tables.
+        prior = " and ".join(f"prior.{c} = {self.table}.{c}" for c in self.key)
+        return (
+            f"on conflict ({', '.join(self.key)}) do update set\n"
+            f"      {updates},\n"
+            f"      loaded_at = now()\n"
+            f"    where {self.table}.{self.digest_column}\n"
+            f"      is distinct from excluded.{self.digest_column}\n"
+            f"    returning not exists (select 1 from {self.table} prior where {prior}) as inserted"
         )
 
+    @property
+    def statement_name(self) -> str:
+        return "cityscape_upsert_" + self.table.replace(".", "_")
+
+    def prepare_sql(self, types: dict[str, str]) -> str:
+        """PREPARE an upsert taking one array per write column (`types`: column -> SQL type)."""
+
+        params = ", ".join(f"{types[c]}[]" for c in self.write_columns)
+        args = ", ".join(f"${i}" for i in range(1, len(self.write_columns) + 1))
+        return (
+            f"prepare {self.statement_name} ({params}) as\n"
+            f"    insert into {self.table} ({', '.join(self.write_columns)})\n"
+            f"    select * from unnest({args})\n"
+            f"    {self._upsert_clause()}"
+        )
+
+    def execute_sql(self, types: dict[str, str]) -> str:
+        casts = ", ".join(f"%s::{types[c]}[]" for c in self.write_columns)
+        return f"execute {self.statement_name} ({casts})"
+
+    def merge_sql(self) -> str:
+        # `distinct on` keeps the last copy of a key within one load, matching the
+        # last-write-wins behaviour of row-at-a-time upserts.
+        cols = ", ".join(self.write_columns)
+        key = ", ".join(self.key)
+        return (
+            f"with src as (\n"
+            f"    select distinct on ({key}) {cols}\n"
+            f"    from {self.staging_table}\n"
+            f"    order by {key}, _ord desc\n"
+            f"), written as (\n"
+            f"    insert into {self.table} ({cols})\n"
+            f"    select {cols} from src\n"
+            f"    {self._upsert_clause()}\n"
+            f")\n"
+            f"select\n"
+            f"  count(*) filter (where inserted),\n"
+            f"  count(*) filter (where not inserted),\n"
+            f"  (select count(*) from src) - count(*)\n"
+            f"from written"
+        )
+
+
+MLB_TEAMS = UpsertTarget(
+    table="raw.mlb_teams",
+    key=("team_id", "season"),
+    columns=("team_id", "season", "team_name", "team_abbr", "league_id", "division_id", "raw"),
+)
+
+MLB_GAMES = UpsertTarget(
+    table="raw.mlb_games",
+    key=("game_id", "season"),
+    columns=(
+        "game_id",
+        "season",
+        "game_date",
+        "game_type",
+        "status",
+        "home_team_id",
+        "away_team_id",
+        "home_score",
+        "away_score",
+        "raw",
+    ),
+)
+
+MLB_GAMES_ARCHIVE = UpsertTarget(
+    table="raw.mlb_games_archive",
+    key=("game_id", "season"),
+    columns=("game_id", "season", "codec", "payload"),
+    json_columns=(),
+)
+
+MLB_GAME_FEEDS = UpsertTarget(
+    table="raw.mlb_game_feeds",
+    key=("game_id", "season"),
+    columns=(
+        "game_id",
+        "season",
+        "game_date",
+        "abstract_state",
+        "detailed_state",
+        "timecode",
+        "feed",
+    ),
+    json_columns=("feed",),
+)
+
+MLB_RAW_TARGETS: tuple[UpsertTarget, ...] = (
+    MLB_TEAMS,
+    MLB_GAMES,
+    MLB_GAMES_ARCHIVE,
+    MLB_GAME_FEEDS,
+)
+
+
+MLB_RAW_TABLES: tuple[RawTable, ...] = tuple(
+    RawTable(target, _MLB_TABLE_DDL[target.table], MLB_RAW_INDEXES[target.table])
+    for target in MLB_RAW_TARGETS
+)
 
-def upsert_mlb_teams(conn, rows: Iterable[dict[str, Any]]) -> int:
-    sql = """
-    insert into raw.mlb_teams (
-      team_id, season, team_name, team_abbr, league_id, division_id, raw
-    ) values (
-      %(team_id)s, %(season)s, %(team_name)s, %(team_abbr)s, %(league_id)s, %(division_id)s, %(raw)s
+
+@contextmanager
+def reload_season(conn, target: UpsertTarget, season: int) -> Iterator[UpsertTarget]:
+    """Drop-and-reload one season of `target` by partition swap instead of deletes.
+
+    Yields `target` pointed at an empty stand-in partition; upsert the season's
+    rows into it, and on exit it replaces the live partition in the caller's
+    transaction (see `cityscape.utils.partitions.swap_partition`).
+    """
+
+    with swap_partition(conn, target.table, season, key=target.key) as staging:
+        yield replace(target, table=staging)
+
+
+def _copy_text(value: Any) -> str:
+    """Encode one value as a field of Postgres COPY text format."""
+
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"))
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
     )
-    on conflict (team_id, season) do update set
-      team_name = excluded.team_name,
-      team_abbr = excluded.team_abbr,
-      league_id = excluded.league_id,
-      division_id = excluded.division_id,
-      raw = excluded.raw,
-      loaded_at = now()
+
+
+class _CopyStream(io.TextIOBase):
+    """Read-only file object that renders COPY lines lazily from an iterator of rows.
+
+    `copy_expert` pulls from it in chunks, so rows are never materialized as a
+    whole; `rows_read` counts rows as they are consumed.
     """
 
-    payload = []
+    def __init__(self, rows: Iterable[Any], columns: Sequence[Any]) -> None:
+        # `columns` are the keys read from each row: names for dicts, positions for tuples.
+        self._rows = iter(rows)
+        self._columns = columns
+        self._buf = ""
+        self.rows_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _line(self, row: Any) -> str:
+        return "\t".join(_copy_text(row[c]) for c in self._columns) + "\n"
+
+    def read(self, size: int | None = -1) -> str:
+        if size is None or size < 0:
+            out = self._buf + "".join(self._line(r) for r in self._counted())
+            self._buf = ""
+            return out
+
+        parts = [self._buf]
+        have = len(self._buf)
+        for row in self._counted():
+            line = self._line(row)
+            parts.append(line)
+            have += len(line)
+            if have >= size:
+                break
+        data = "".join(parts)
+        self._buf = data[size:]
+        return data[:size]
+
+    def _counted(self) -> Iterator[Any]:
+        for row in self._rows:
+            self.rows_read += 1
+            yield row
+
+
+def _with_digest(rows: Iterable[dict[str, Any]], target: UpsertTarget) -> Iterator[dict[str, Any]]:
     for r in rows:
-        payload.append(
-            {
-                **r,
-                "raw": psycopg2.extras.Json(r["raw"]),
-            }
+        yield {**r, target.digest_column: row_digest(r, target.columns)}
+
+
+def _counts_from_returning(flags: Iterable[tuple[bool]], distinct_rows: int) -> UpsertCounts:
+    inserted = updated = 0
+    for (was_inserted,) in flags:
+        if was_inserted:
+            inserted += 1
+        else:
+            updated += 1
+    return UpsertCounts(
+        inserted=inserted, updated=updated, unchanged=distinct_rows - inserted - updated
+    )
+
+
+# Per connection: upsert statements already PREPAREd in its session, with the
+# EXECUTE statement to call each one.
+_prepared: weakref.WeakKeyDictionary[Any, dict[str, str]] = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+
+def _prepared_upsert(conn, target: UpsertTarget) -> str:
+    """EXECUTE statement for `target`'s upsert, PREPAREd in `conn`'s session on first use.
+
+    Prepared statements outlive transactions (including rolled back ones), so
+    a pooled connection parses and plans each upsert once.
+    """
+
+    with _prepared_lock:
+        statements = _prepared.setdefault(conn, {})
+    execute = statements.get(target.statement_name)
+    if execute is not None:
+        return execute
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            select attname, format_type(atttypid, atttypmod)
+            from pg_attribute
+            where attrelid = to_regclass(%s) and attnum > 0 and not attisdropped
+            """,
+            (target.table,),
         )
+        types = dict(cur.fetchall())
+        cur.execute(target.prepare_sql(types))
+    execute = statements[target.statement_name] = target.execute_sql(types)
+    return execute
+
+
+def _execute_upsert(conn, target: UpsertTarget, columns: list[list[Any]]) -> UpsertCounts:
+    # One array per write column, unnested server-side by the prepared statement.
+    execute = _prepared_upsert(conn, target)
+    with conn.cursor() as cur:
+        cur.execute(execute, columns)
+        flags = cur.fetchall()
+    return _counts_from_returning(flags, len(columns[0]))
+
+
+def _upsert_batch(conn, target: UpsertTarget, rows: Iterable[dict[str, Any]]) -> UpsertCounts:
+    # Keyed by primary key so a repeated row keeps its last value (one statement
+    # cannot touch the same conflict target twice).
+    payload: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for r in _with_digest(rows, target):
+        key = tuple(r[c] for c in target.key)
+        payload.pop(key, None)
+        payload[key] = r
 
     if not payload:
-        return 0
+        return UpsertCounts()
+
+    json_columns = set(target.json_columns)
+    columns = [
+        [psycopg2.extras.Json(r[c]) if c in json_columns else r[c] for r in payload.values()]
+        for c in target.write_columns
+    ]
+    return _execute_upsert(conn, target, columns)
+
+
+def _upsert_copy(conn, target: UpsertTarget, rows: Iterable[dict[str, Any]]) -> UpsertCounts:
+    return _copy_upsert(conn, target, _CopyStream(_with_digest(rows, target), target.write_columns))
+
+
+def _copy_upsert(conn, target: UpsertTarget, stream: _CopyStream) -> UpsertCounts:
+    if conn.autocommit:
+        raise ValueError("COPY loads need a transaction; set conn.autocommit = False")
 
+    counts = UpsertCounts()
     with conn.cursor() as cur:
-        psycopg2.extras.execute_batch(cur, sql, payload, page_size=500)
-    return len(payload)
-
-
-def upsert_mlb_games(conn, rows: Iterable[dict[str, Any]]) -> int:
-    sql = """
-    insert into raw.mlb_games (
-      game_id, season, game_date, game_type, status,
-      home_team_id, away_team_id, home_score, away_score, raw
-    ) values (
-      %(game_id)s, %(season)s, %(game_date)s, %(game_type)s, %(status)s,
-      %(home_team_id)s, %(away_team_id)s, %(home_score)s, %(away_score)s, %(raw)s
-    )
-    on conflict (game_id, season) do update set
-      game_date = excluded.game_date,
-      game_type = excluded.game_type,
-      status = excluded.status,
-      home_team_id = excluded.home_team_id,
-      away_team_id = excluded.away_team_id,
-      home_score = excluded.home_score,
-      away_score = excluded.away_score,
-      raw = excluded.raw,
-      loaded_at = now()
-    """
-
-    payload = []
-    for r in rows:
-        payload.append(
-            {
-                **r,
-                "raw": psycopg2.extras.Json(r["raw"]),
-            }
+        # Temp tables skip WAL; `on commit drop` cleans up with the caller's transaction.
+        cur.execute(
+            f"create temp table if not exists {target.staging_table} "
+            f"(like {target.table} including defaults, _ord bigserial) on commit drop"
+        )
+        cur.execute(f"truncate {target.staging_table}")
+        cur.copy_expert(
+            f"copy {target.staging_table} ({', '.join(target.write_columns)}) from stdin",
+            stream,
         )
+        if stream.rows_read:
+            cur.execute(target.merge_sql())
+            inserted, updated, unchanged = cur.fetchone()
+            counts = UpsertCounts(inserted=inserted, updated=updated, unchanged=unchanged)
+        cur.execute(f"truncate {target.staging_table}")
+    return counts
 
-    if not payload:
-        return 0
+
+def upsert_rows(
+    conn,
+    target: UpsertTarget,
+    rows: Iterable[dict[str, Any]],
+    *,
+    method: LoadMethod = "batch",
+) -> UpsertCounts:
+    """Upsert rows into `target`, skipping rows whose content digest is unchanged.
+
+    Rows repeating a key within one call collapse to the last one, so
+    `UpsertCounts.total` is the number of distinct keys submitted.
+    """
+
+    if method == "batch":
+        return _upsert_batch(conn, target, rows)
+    if method == "copy":
+        return _upsert_copy(conn, target, rows)
+    raise ValueError(f"Unknown load method {method!r}; expected one of {LOAD_METHODS}")
+
+
+def _column_digests(target: UpsertTarget, columns: Mapping[str, Sequence[Any]]) -> list[str]:
+    """`row_digest` of every row of `columns`, without decoding the JSON columns.
+
+    The scalar columns are encoded as one JSON array per row and the JSON
+    columns' bytes spliced in after them, which is byte for byte what
+    `row_digest` hashes when those bytes are `canonical_json`.
+    """
+
+    n_json = len(target.json_columns)
+    scalar_columns = target.columns[: len(target.columns) - n_json]
+    if target.columns[len(scalar_columns) :] != target.json_columns:
+        raise ValueError(f"{target.table}: columnar upserts need the json columns last")
+
+    scalars = zip(*(columns[c] for c in scalar_columns), strict=True)
+    docs = (
+        zip(*(columns[c] for c in target.json_columns), strict=True)
+        if n_json
+        else [()] * len(columns[target.columns[0]])
+    )
+    digests: list[str] = []
+    for values, texts in zip(scalars, docs, strict=True):
+        head = json.dumps(
+            values, separators=(",", ":"), ensure_ascii=False, default=_digest_default
+        ).encode("utf-8")
+        canonical = b",".join([head[:-1], *(b"null" if t is None else t for t in texts)])
+        digests.append(hashlib.sha256(canonical + b"]").hexdigest())
+    return digests
+
+
+def upsert_columns(
+    conn,
+    target: UpsertTarget,
+    columns: Mapping[str, Sequence[Any]],
+    *,
+    method: LoadMethod = "batch",
+) -> UpsertCounts:
+    """Columnar `upsert_rows`: one equally long sequence per column of `target.columns`.
+
+    Values of `target.json_columns` are JSON documents already encoded as UTF-8
+    bytes (e.g. `GameBatch.raw`) and are written without being decoded. They
+    must be `cityscape.utils.payloads.canonical_json`, and come last in
+    `target.columns`, for the stored digests to equal `row_digest` of the same rows.
+    """
+
+    digests = _column_digests(target, columns)
+    data = [*(columns[c] for c in target.columns), digests]
+    json_positions = {target.write_columns.index(c) for c in target.json_columns}
+
+    if method == "copy":
+        texts = [
+            ((None if t is None else t.decode("utf-8")) for t in col)
+            if i in json_positions
+            else col
+            for i, col in enumerate(data)
+        ]
+        stream = _CopyStream(zip(*texts, strict=True), range(len(texts)))
+        return _copy_upsert(conn, target, stream)
+    if method != "batch":
+        raise ValueError(f"Unknown load method {method!r}; expected one of {LOAD_METHODS}")
+
+    # Last occurrence of each key wins, as in `_upsert_batch`.
+    last: dict[tuple[Any, ...], int] = {}
+    for i, key in enumerate(zip(*(columns[c] for c in target.key), strict=True)):
+        last.pop(key, None)
+        last[key] = i
+    if not last:
+        return UpsertCounts()
+    if len(last) < len(digests):
+        keep = list(last.values())
+        data = [[col[i] for i in keep] for col in data]
+
+    arrays = [
+        [None if t is None else t.decode("utf-8") for t in col]
+        if i in json_positions
+        else list(col)
+        for i, col in enumerate(data)
+    ]
+    return _execute_upsert(conn, target, arrays)
+
+
+def upsert_mlb_teams(
+    conn, rows: Iterable[dict[str, Any]], *, method: LoadMethod = "batch"
+) -> UpsertCounts:
+    return upsert_rows(conn, MLB_TEAMS, rows, method=method)
+
+
+def upsert_mlb_games(
+    conn, rows: Iterable[dict[str, Any]], *, method: LoadMethod = "batch"
+) -> UpsertCounts:
+    return upsert_rows(conn, MLB_GAMES, rows, method=method)
+
+
+def upsert_mlb_games_archive(
+    conn, rows: Iterable[dict[str, Any]], *, method: LoadMethod = "batch"
+) -> UpsertCounts:
+    return upsert_rows(conn, MLB_GAMES_ARCHIVE, rows, method=method)
+
+
+def upsert_mlb_game_feeds(
+    conn, rows: Iterable[dict[str, Any]], *, method: LoadMethod = "batch"
+) -> UpsertCounts:
+    return upsert_rows(conn, MLB_GAME_FEEDS, rows, method=method)
+
+
+def stored_mlb_game_feeds(
+    conn, *, season: int, game_ids: Iterable[int], final_state: str = "Final"
+) -> dict[int, dict[str, Any]]:
+    """Stored raw.mlb_game_feeds rows for `game_ids`, keyed by game id.
+
+    The (multi-MB) `feed` column is only read for games that are not yet
+    `final_state`; for final games it is None, as they are never fetched again.
+    """
 
     with conn.cursor() as cur:
-        psycopg2.extras.execute_batch(cur, sql, payload, page_size=500)
-    return len(payload)
+        cur.execute(
+            """
+            select game_id, season, game_date, abstract_state, detailed_state, timecode,
+                   case when abstract_state = %s then null else feed end as feed
+            from raw.mlb_game_feeds
+            where season = %s and game_id = any(%s)
+            """,
+            (final_state, season, list(game_ids)),
+        )
+        columns = [d[0] for d in cur.description]
+        return {row[0]: dict(zip(columns, row, strict=True)) for row in cur.fetchall()}
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable
+from typing import Any
+
+__all__ = ["JsonPatchError", "apply_patch"]
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch operation does not apply to the document (bad path, failed test)."""
+
+
+def _tokens(pointer: str) -> list[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container: list[Any], token: str, *, insert: bool = False) -> int:
+    if insert and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise JsonPatchError(f"Array index {index} out of range")
+    return index
+
+
+def _walk(doc: Any, tokens: list[str]) -> Any:
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Missing key {token!r}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise JsonPatchError(f"Cannot descend into {type(node).__name__} at {token!r}")
+    return node
+
+
+def _get(doc: Any, pointer: str) -> Any:
+    return _walk(doc, _tokens(pointer))
+
+
+def _add(doc: Any, pointer: str, value: Any) -> Any:
+    tokens = _tokens(pointer)
+    if not tokens:
+        return value
+    parent = _walk(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], insert=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to {type(parent).__name__} at {pointer!r}")
+    return doc
+
+
+def _remove(doc: Any, pointer: str) -> tuple[Any, Any]:
+    """Remove the value at `pointer`; returns (doc, removed value)."""
+
+    tokens = _tokens(pointer)
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+    parent = _walk(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"Missing key {tokens[-1]!r}")
+        return doc, parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return doc, parent.pop(_index(parent, tokens[-1]))
+    raise JsonPatchError(f"Cannot remove from {type(parent).__name__} at {pointer!r}")
+
+
+def _replace(doc: Any, pointer: str, value: Any) -> Any:
+    tokens = _tokens(pointer)
+    if not tokens:
+        return value
+    parent = _walk(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"Missing key {tokens[-1]!r}")
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent[_index(parent, tokens[-1])] = value
+    else:
+        raise JsonPatchError(f"Cannot replace in {type(parent).__name__} at {pointer!r}")
+    return doc
+
+
+def _member(op: dict[str, Any], name: str) -> Any:
+    if name not in op:
+        raise JsonPatchError(f"{op.get('op')!r} operation without {name!r}: {op!r}")
+    return op[name]
+
+
+def apply_patch(doc: Any, operations: Iterable[dict[str, Any]]) -> Any:
+    """Apply RFC 6902 JSON Patch operations to `doc` in place and return the result.
+
+    Containers are modified in place (the return value differs from `doc` only
+    when an operation replaces the root), so a document that raised
+    `JsonPatchError` halfway may be partly patched; refetch it rather than reuse it.
+    """
+
+    for op in operations:
+        kind = op.get("op")
+        path = op.get("path")
+        if not isinstance(path, str):
+            raise JsonPatchError(f"Operation without a path: {op!r}")
+        if kind == "add":
+            doc = _add(doc, path, _member(op, "value"))
+        elif kind == "replace":
+            doc = _replace(doc, path, _member(op, "value"))
+        elif kind == "remove":
+            doc, _ = _remove(doc, path)
+        elif kind == "move":
+            source = _member(op, "from")
+            if path.startswith(f"{source}/"):
+                raise JsonPatchError(f"Cannot move {source!r} into its own child {path!r}")
+            doc, value = _remove(doc, source)
+            doc = _add(doc, path, value)
+        elif kind == "copy":
+            doc = _add(doc, path, copy.deepcopy(_get(doc, _member(op, "from"))))
+        elif kind == "test":
+            if _get(doc, path) != _member(op, "value"):
+                raise JsonPatchError(f"Test failed at {path!r}")
+        else:
+            raise JsonPatchError(f"Unknown patch operation {kind!r}")
+    return doc
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
 import logging
+from functools import cache, lru_cache
 from typing import Any
 
 __all__ = ["get_logger", "get_run_logger"]
 
 
+@lru_cache(maxsize=1)
+def _prefect_logging() -> Any:
+    """`prefect.logging`, imported on first use; None when Prefect is unavailable.
+
+    Cached so a missing or broken Prefect install costs one failed import, not
+    one per logger lookup.
+    """
+
+    try:
+        import prefect.logging
+
+        return prefect.logging
+    except Exception:
+        return None
+
+
+@cache
 def get_logger(name: str | None = None) -> Any:
     """Return a logger.
 
@@ -15,12 +33,13 @@ def get_logger(name: str | None = None) -> Any:
 
     # Prefect's `get_logger()` returns a standard logger configured with Prefect
     # logging settings, but does NOT send logs to the Prefect API.
-    try:
-        from prefect.logging import get_logger as prefect_get_logger
-
-        return prefect_get_logger(name)
-    except Exception:
-        return logging.getLogger(name)
+    prefect_logging = _prefect_logging()
+    if prefect_logging is not None:
+        try:
+            return prefect_logging.get_logger(name)
+        except Exception:
+            pass
+    return logging.getLogger(name)
 
 
 def get_run_logger() -> Any:
@@ -32,10 +51,12 @@ def get_run_logger() -> Any:
     - Outside Prefect run context, fall back to a normal logger.
     """
 
-    try:
-        from prefect.logging import get_run_logger as prefect_get_run_logger
-
-        return prefect_get_run_logger()
-    except Exception:
-        # Likely not running inside a flow/task (or Prefect not installed).
-        return get_logger("cityscape")
\ No newline at end of file
+    # Not cached: the run logger is bound to the current flow/task run.
+    prefect_logging = _prefect_logging()
+    if prefect_logging is not None:
+        try:
+            return prefect_logging.get_run_logger()
+        except Exception:
+            # Likely not running inside a flow/task.
+            pass
+    return get_logger("cityscape")
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+try:  # Unix only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+__all__ = [
+    "IngestMetrics",
+    "StageTimer",
+    "append_jsonl",
+    "peak_rss_bytes",
+    "timed_iter",
+    "write_prometheus_textfile",
+]
+
+T = TypeVar("T")
+
+_DONE: Any = object()
+
+
+class StageTimer:
+    """Accumulates wall time per named stage on the thread that created it.
+
+    Stages nest: time spent in an inner stage is not counted in the outer one,
+    so the totals add up to (at most) the elapsed wall time. Calls from other
+    threads (e.g. fetch workers) are ignored for the same reason.
+    """
+
+    def __init__(self) -> None:
+        self._owner = threading.get_ident()
+        self._stack: list[list[Any]] = []
+        self._totals: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def _add(self, name: str, seconds: float) -> None:
+        self._totals[name] = self._totals.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if threading.get_ident() != self._owner:
+            yield
+            return
+
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            inner, started = self._stack.pop()
+            self._add(inner, end - started)
+            if self._stack:
+                self._stack[-1][1] = end
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.perf_counter() - self._started
+
+    def totals(self) -> dict[str, float]:
+        return dict(self._totals)
+
+
+def timed_iter(iterable: Iterable[T], timer: StageTimer, name: str) -> Iterator[T]:
+    """Yield from `iterable`, charging the time spent producing each item to stage `name`."""
+
+    it = iter(iterable)
+    while True:
+        with timer.stage(name):
+            item = next(it, _DONE)
+        if item is _DONE:
+            return
+        yield item  # type: ignore[misc]
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far (None where unsupported)."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class IngestMetrics:
+    """Where one ingest run spent its time, plus HTTP and memory counters."""
+
+    wall_s: float
+    stages: dict[str, float] = field(default_factory=dict)
+    rows: int = 0
+    http_requests: int = 0
+    http_retries: int = 0
+    bytes_received: int = 0
+    peak_rss_bytes: int | None = None
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.wall_s if self.wall_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        other = max(0.0, self.wall_s - sum(self.stages.values()))
+        return {
+            "wall_s": round(self.wall_s, 3),
+            **{f"stage_{name}_s": round(s, 3) for name, s in sorted(self.stages.items())},
+            "stage_other_s": round(other, 3),
+            "rows_per_s": round(self.rows_per_s, 1),
+            "http_requests": self.http_requests,
+            "http_retries": self.http_retries,
+            "bytes_received": self.bytes_received,
+            "peak_rss_mb": (
+                None if self.peak_rss_bytes is None else round(self.peak_rss_bytes / 2**20, 1)
+            ),
+        }
+
+    def prometheus(self, labels: dict[str, Any]) -> str:
+        """Render as Prometheus text exposition format (for node_exporter's textfile collector)."""
+
+        def fmt(extra: dict[str, Any] | None = None) -> str:
+            merged = {**labels, **(extra or {})}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in merged.items()) + "}"
+
+        lines = [
+            "# HELP cityscape_ingest_stage_seconds Wall time spent per ingest stage.",
+            "# TYPE cityscape_ingest_stage_seconds gauge",
+            *(
+                f"cityscape_ingest_stage_seconds{fmt({'stage': name})} {s:.6f}"
+                for name, s in sorted(self.stages.items())
+            ),
+        ]
+        gauges = {
+            "wall_seconds": (self.wall_s, "Total wall time of the ingest run."),
+            "rows": (self.rows, "Rows written by the ingest run."),
+            "rows_per_second": (self.rows_per_s, "Rows written per second of wall time."),
+            "http_requests": (self.http_requests, "HTTP requests sent, including retries."),
+            "http_retries": (self.http_retries, "HTTP requests retried."),
+            "bytes_received": (self.bytes_received, "HTTP response bytes received."),
+        }
+        if self.peak_rss_bytes is not None:
+            gauges["peak_rss_bytes"] = (
+                self.peak_rss_bytes,
+                "Peak resident set size of the process.",
+            )
+        for name, (value, help_text) in gauges.items():
+            lines += [
+                f"# HELP cityscape_ingest_{name} {help_text}",
+                f"# TYPE cityscape_ingest_{name} gauge",
+                f"cityscape_ingest_{name}{fmt()} {value}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path: str | Path, text: str) -> None:
+    """Atomically replace `path` with `text` so a scraper never reads a partial file."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def append_jsonl(path: str | Path, record: dict[str, Any]) -> None:
+    """Append one JSON record as a line; a single write keeps concurrent appends whole."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+__all__ = [
+    "ensure_list_partition",
+    "is_partitioned",
+    "migrate_to_partitioned",
+    "partition_name",
+    "partition_oids",
+    "split_table",
+    "swap_partition",
+]
+
+
+def split_table(table: str) -> tuple[str, str]:
+    """(schema, name) of a possibly schema-qualified table name; the schema defaults to public."""
+
+    schema, _, name = table.rpartition(".")
+    return schema or "public", name
+
+
+def partition_name(table: str, value: int) -> str:
+    """Schema-qualified name of `table`'s list partition for `value` (e.g. raw.mlb_games_2024)."""
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"Partition values must be integers, got {value!r}")
+    schema, name = split_table(table)
+    return f"{schema}.{name}_{value}"
+
+
+def partition_oids(conn, tables: Sequence[str], value: int) -> list[int]:
+    """Oids of `tables`' partitions for `value`, 0 for a missing one.
+
+    A partition swap or drop-and-recreate gives the partition a new oid.
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            select coalesce(to_regclass(t.name)::oid, 0)
+            from unnest(%s::text[]) with ordinality as t (name, i)
+            order by t.i
+            """,
+            ([partition_name(table, value) for table in tables],),
+        )
+        return [int(oid) for (oid,) in cur.fetchall()]
+
+
+def _relkind(cur, table: str) -> str | None:
+    cur.execute("select relkind from pg_class where oid = to_regclass(%s)", (table,))
+    row = cur.fetchone()
+    return None if row is None else row[0]
+
+
+def is_partitioned(conn, table: str) -> bool:
+    with conn.cursor() as cur:
+        return _relkind(cur, table) == "p"
+
+
+def ensure_list_partition(conn, table: str, value: int) -> bool:
+    """Create the partition of `table` holding `value` if missing; True if it was created.
+
+    Creating a partition locks the parent exclusively, so existing partitions are
+    detected first and never re-created.
+    """
+
+    part = partition_name(table, value)
+    with conn.cursor() as cur:
+        if _relkind(cur, part) is not None:
+            return False
+        cur.execute(
+            f"create table if not exists {part} partition of {table} for values in (%s)", (value,)
+        )
+    return True
+
+
+def migrate_to_partitioned(conn, table: str, ddl: str, *, column: str = "season") -> int:
+    """Rebuild a plain (unpartitioned) `table` as the partitioned table created by `ddl`.
+
+    The old table is renamed aside, `ddl` creates the partitioned table under the
+    original name, one partition is created per distinct `column` value, rows are
+    copied over (columns the old table lacks take their defaults) and the old
+    table is dropped. Views over the old table are dropped
+    with it (they would keep pointing at the renamed table); rebuild them, e.g. with
+    `dbt run`. Indexes on the parent (created after this) propagate to every
+    partition. Returns the number of rows moved; a no-op (0) when `table` is
+    missing or already partitioned.
+    """
+
+    schema, name = split_table(table)
+    legacy = f"{name}_unpartitioned"
+    with conn.cursor() as cur:
+        if _relkind(cur, table) != "r":
+            return 0
+
+        cur.execute(f"alter table {table} rename to {legacy}")
+        # Index names are schema-wide; free them for the new table.
+        cur.execute(
+            "select indexrelid::regclass::text from pg_index where indrelid = to_regclass(%s)",
+            (f"{schema}.{legacy}",),
+        )
+        for (index,) in cur.fetchall():
+            _, index_name = split_table(index)
+            cur.execute(f"alter index {schema}.{index_name} rename to {legacy}_{index_name}")
+
+        cur.execute(ddl)
+        cur.execute(f"select distinct {column} from {schema}.{legacy} order by 1")
+        for (value,) in cur.fetchall():
+            ensure_list_partition(conn, table, value)
+
+        cur.execute(
+            """
+            select string_agg(quote_ident(new.attname), ', ' order by new.attnum)
+            from pg_attribute as new
+            join pg_attribute as old
+              on old.attrelid = to_regclass(%s) and old.attname = new.attname
+            where new.attrelid = to_regclass(%s) and new.attnum > 0
+              and not new.attisdropped and not old.attisdropped
+            """,
+            (f"{schema}.{legacy}", table),
+        )
+        (columns,) = cur.fetchone()
+        cur.execute(f"insert into {table} ({columns}) select {columns} from {schema}.{legacy}")
+        moved = cur.rowcount
+        cur.execute(f"drop table {schema}.{legacy} cascade")
+    return moved
+
+
+@contextmanager
+def swap_partition(
+    conn, table: str, value: int, *, key: tuple[str, ...], column: str = "season"
+) -> Iterator[str]:
+    """Yield an empty stand-in for `table`'s `value` partition; swap it in on clean exit.
+
+    Load the replacement rows into the yielded table (it has `key` as primary key,
+    so upserts work). On exit the current partition is detached and dropped and
+    the stand-in attached in its place, all in the caller's transaction, so
+    readers see the old rows or the new ones and no rows are deleted one by one.
+    Partition indexes are built on attach. If the block raises, nothing is swapped.
+    """
+
+    part = partition_name(table, value)
+    schema, part_name = split_table(part)
+    staging_name = f"{part_name}_reload"
+    staging = f"{schema}.{staging_name}"
+
+    with conn.cursor() as cur:
+        cur.execute(f"drop table if exists {staging}")
+        cur.execute(f"create table {staging} (like {table} including defaults including storage)")
+        cur.execute(
+            f"alter table {staging} add constraint {staging_name}_pkey"
+            f" primary key ({', '.join(key)})"
+        )
+        # Proves the partition bound up front so ATTACH skips its validation scan.
+        cur.execute(
+            f"alter table {staging} add constraint {staging_name}_bound"
+            f" check ({column} is not null and {column} = %s)",
+            (value,),
+        )
+
+    yield staging
+
+    with conn.cursor() as cur:
+        if _relkind(cur, part) is not None:
+            cur.execute(f"alter table {table} detach partition {part}")
+            cur.execute(f"drop table {part}")
+        cur.execute(f"alter table {staging} rename to {part_name}")
+        cur.execute(f"alter index {schema}.{staging_name}_pkey rename to {part_name}_pkey")
+        cur.execute(f"alter table {table} attach partition {part} for values in (%s)", (value,))
+        cur.execute(f"alter table {part} drop constraint {staging_name}_bound")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+
+__all__ = [
+    "JSON_ZLIB",
+    "canonical_json",
+    "compress_json",
+    "decompress_json",
+    "json_size",
+    "loads_json",
+    "project",
+]
+
+# Codec tag stored next to compressed payloads.
+JSON_ZLIB = "json+zlib"
+
+
+def project(payload: dict[str, Any], paths: Iterable[str]) -> dict[str, Any]:
+    """Keep only the given dotted key paths of a JSON object, preserving nesting.
+
+    `project(g, ["gamePk", "teams.home.score"])` gives
+    `{"gamePk": ..., "teams": {"home": {"score": ...}}}`. Paths that are missing
+    from `payload` are skipped.
+    """
+
+    out: dict[str, Any] = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        src: Any = payload
+        for key in parents:
+            src = src.get(key) if isinstance(src, dict) else None
+        if not isinstance(src, dict) or leaf not in src:
+            continue
+        dst = out
+        for key in parents:
+            dst = dst.setdefault(key, {})
+        dst[leaf] = src[leaf]
+    return out
+
+
+def loads_json(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode a JSON document straight from its bytes with orjson (~1.5x `json.loads`).
+
+    Gives the same values as `json.loads`, which still decodes what orjson
+    rejects (NaN, integers beyond 64 bits, UTF-16/32 bodies).
+    """
+
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def json_size(payload: Any) -> int:
+    """Size in bytes of the compact JSON encoding of `payload`."""
+
+    return len(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Compact UTF-8 JSON with sorted keys: the encoding `row_digest` hashes nested values in."""
+
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def compress_json(payload: Any, *, level: int = 6) -> bytes:
+    return zlib.compress(
+        json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), level
+    )
+
+
+def decompress_json(blob: bytes) -> Any:
+    return loads_json(zlib.decompress(blob))
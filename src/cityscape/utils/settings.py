@@ -12,6 +12,15 @@ class Settings:
     postgres_user: str | None = None
     postgres_password: str | None = None
     postgres_dbname: str | None = None
+    postgres_pool_size: int | None = None
+    http_cache_path: str | None = None
+    http_cache_max_mb: int | None = None
+    http_rate_per_s: float | None = None
+    http_max_concurrency: int | None = None
+    http_rate_state_path: str | None = None
+    metrics_textfile_dir: str | None = None
+    metrics_jsonl_path: str | None = None
+    dbt_project_dir: str | None = None
 
 
 def get_settings() -> Settings:
@@ -26,4 +35,27 @@ def get_settings() -> Settings:
         postgres_user=os.getenv("DBT_USER") or os.getenv("POSTGRES_USER") or os.getenv("PGUSER"),
         postgres_password=os.getenv("DBT_PASSWORD") or os.getenv("POSTGRES_PASSWORD") or os.getenv("PGPASSWORD"),
         postgres_dbname=os.getenv("DBT_DBNAME") or os.getenv("POSTGRES_DB") or os.getenv("PGDATABASE"),
+        postgres_pool_size=(
+            int(os.getenv("CITYSCAPE_PG_POOL_SIZE"))
+            if os.getenv("CITYSCAPE_PG_POOL_SIZE")
+            else None
+        ),
+        http_cache_path=os.getenv("CITYSCAPE_HTTP_CACHE") or None,
+        http_cache_max_mb=(
+            int(os.getenv("CITYSCAPE_HTTP_CACHE_MAX_MB"))
+            if os.getenv("CITYSCAPE_HTTP_CACHE_MAX_MB")
+            else None
+        ),
+        http_rate_per_s=(
+            float(os.getenv("CITYSCAPE_HTTP_RATE")) if os.getenv("CITYSCAPE_HTTP_RATE") else None
+        ),
+        http_max_concurrency=(
+            int(os.getenv("CITYSCAPE_HTTP_MAX_CONCURRENCY"))
+            if os.getenv("CITYSCAPE_HTTP_MAX_CONCURRENCY")
+            else None
+        ),
+        http_rate_state_path=os.getenv("CITYSCAPE_HTTP_RATE_STATE") or None,
+        metrics_textfile_dir=os.getenv("CITYSCAPE_METRICS_TEXTFILE_DIR") or None,
+        metrics_jsonl_path=os.getenv("CITYSCAPE_METRICS_JSONL") or None,
+        dbt_project_dir=os.getenv("CITYSCAPE_DBT_PROJECT_DIR") or None,
     )
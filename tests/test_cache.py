@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import httpx
+
+from cityscape.integrations.cache import ResponseCache, cache_key
+from cityscape.integrations.http import HttpClient
+from cityscape.integrations.mlb.statsapi import (
+    CACHE_TTLS,
+    MLB_STATSAPI_BASE_URL,
+    MlbStatsApi,
+)
+
+
+def test_cache_key_ignores_param_order() -> None:
+    assert cache_key("schedule", {"a": 1, "b": 2}) == cache_key("schedule", {"b": 2, "a": 1})
+
+
+def test_cache_expiry_and_counters(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "http.sqlite")
+    cache.put("fresh", {"v": 1}, ttl_s=60)
+    cache.put("stale", {"v": 2}, ttl_s=-1)
+
+    assert cache.get("fresh") == {"v": 1}
+    assert cache.get("stale") is None
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    blob = {"data": bytes(range(256)).hex()}
+    # ~300 bytes compressed: two entries fit, a third forces an eviction.
+    cache = ResponseCache(tmp_path / "http.sqlite", max_bytes=700)
+    cache.put("a", blob, ttl_s=None)
+    cache.put("b", blob, ttl_s=None)
+    cache.get("a")
+    cache.put("c", blob, ttl_s=None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == blob
+    assert cache.stats().evictions >= 1
+
+
+def test_completed_past_season_schedule_is_served_from_cache(tmp_path) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        game = {"gamePk": 1, "status": {"abstractGameState": "Final"}}
+        return httpx.Response(200, json={"dates": [{"games": [game]}]})
+
+    cache = ResponseCache(tmp_path / "http.sqlite")
+    http = HttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=httpx.MockTransport(handler))
+
+    MlbStatsApi(http=http, cache=cache).list_games(season=2019)
+    MlbStatsApi(http=http, cache=cache).list_games(season=2019)
+
+    assert calls == 1
+    assert cache.stats().hits == 1
+    # An empty past schedule (e.g. a window before opening day) is not kept forever.
+    ttl = MlbStatsApi.cache_ttl("schedule", {"season": 2019}, {"dates": []})
+    assert ttl == CACHE_TTLS["schedule"]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from cityscape import cli
+
+# Cumulative import time allowed for `cityscape.cli` (microseconds). Cron
+# wrappers and health checks start the CLI many times a minute; today it is a
+# few ms, so this only trips when a heavy import creeps back in.
+IMPORT_BUDGET_US = 50_000
+
+HEAVY_MODULES = ("prefect", "psycopg2", "httpx", "cityscape.automations", "cityscape.integrations")
+
+
+def _import_times(code: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_choices_match_the_validating_modules() -> None:
+    from cityscape.automations.export.parquet import COMPRESSIONS
+    from cityscape.automations.ingest.mlb import RAW_RETENTIONS
+    from cityscape.integrations.leagues import LEAGUES, SCHEDULE_WINDOWS
+    from cityscape.utils.db import LOAD_METHODS
+
+    assert cli.LOAD_METHODS == LOAD_METHODS
+    assert cli.SCHEDULE_WINDOWS == SCHEDULE_WINDOWS
+    assert cli.RAW_RETENTIONS == RAW_RETENTIONS
+    assert cli.COMPRESSIONS == COMPRESSIONS
+    assert cli.LEAGUES == LEAGUES
+
+
+def test_hello(capsys) -> None:
+    assert cli.main(["hello", "cron"]) == 0
+    assert capsys.readouterr().out == "hello, cron\n"
+
+
+def test_light_commands_skip_heavy_imports_and_stay_within_budget() -> None:
+    times = _import_times("from cityscape.cli import main; main(['hello']); main([])")
+
+    loaded = [m for m in times if any(m == h or m.startswith(f"{h}.") for h in HEAVY_MODULES)]
+    assert loaded == []
+    assert times["cityscape.cli"] < IMPORT_BUDGET_US
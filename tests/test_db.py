@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+
+from cityscape.utils import db
+from cityscape.utils.db import (
+    MLB_GAMES,
+    ConnectionPool,
+    PoolTimeoutError,
+    PostgresConfig,
+    UpsertCounts,
+    _copy_text,
+    _CopyStream,
+    row_digest,
+)
+
+
+def test_copy_text_escapes_copy_format() -> None:
+    assert _copy_text(None) == "\\N"
+    assert _copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert _copy_text(date(2024, 4, 1)) == "2024-04-01"
+    assert _copy_text({"k": "v\n"}) == '{"k":"v\\\\n"}'
+
+
+def test_copy_stream_reads_lazily_in_chunks() -> None:
+    rows = ({c: (i if c != "raw" else {"i": i}) for c in MLB_GAMES.columns} for i in range(100))
+    stream = _CopyStream(rows, MLB_GAMES.columns)
+
+    first = stream.read(64)
+    assert len(first) == 64
+    assert stream.rows_read < 100
+
+    rest = stream.read()
+    lines = (first + rest).splitlines()
+    assert len(lines) == 100 == stream.rows_read
+    assert lines[1].split("\t")[-1] == '{"i":1}'
+
+
+def test_merge_sql_dedupes_on_key() -> None:
+    sql = MLB_GAMES.merge_sql()
+    assert "distinct on (game_id, season)" in sql
+    assert "on conflict (game_id, season) do update set" in sql
+
+
+def test_row_digest_ignores_key_order_and_tracks_values() -> None:
+    row = {"game_id": 1, "season": 2024, "raw": {"a": 1, "b": [1, 2]}}
+    reordered = {"raw": {"b": [1, 2], "a": 1}, "season": 2024, "game_id": 1}
+    cols = ("game_id", "season", "raw")
+
+    assert row_digest(row, cols) == row_digest(reordered, cols)
+    assert row_digest(row, cols) != row_digest({**row, "raw": {"a": 2, "b": [1, 2]}}, cols)
+
+
+def test_upsert_counts_add_up() -> None:
+    total = UpsertCounts(inserted=1, updated=2, unchanged=3) + UpsertCounts(unchanged=4)
+    assert total == UpsertCounts(inserted=1, updated=2, unchanged=7)
+    assert (total.changed, total.total) == (3, 10)
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.autocommit = False
+        self.info = SimpleNamespace(transaction_status=psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+        self.commits = self.rollbacks = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def set_session(self, **kwargs) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+@pytest.fixture
+def pool(monkeypatch) -> ConnectionPool:
+    monkeypatch.setattr(db, "connect", lambda cfg: _FakeConnection())
+    cfg = PostgresConfig(host="h", port=5432, user="u", password="p", dbname="d")
+    return ConnectionPool(cfg, max_size=1, timeout_s=0.05)
+
+
+def test_pool_reuses_connections_and_commits_on_exit(pool: ConnectionPool) -> None:
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        second.autocommit = True
+
+    assert first is second and first.commits == 1
+    assert not second.autocommit
+    assert pool.stats().as_dict() | {"wait_s": 0} == {
+        "max_size": 1,
+        "open": 1,
+        "in_use": 0,
+        "idle": 1,
+        "checkouts": 2,
+        "connects": 1,
+        "discarded": 0,
+        "waits": 0,
+        "wait_s": 0,
+    }
+
+
+def test_pool_waits_for_a_free_connection_then_times_out(pool: ConnectionPool) -> None:
+    with pool.connection():
+        failed = []
+        waiter = threading.Thread(target=lambda: failed.append(_try_checkout(pool)))
+        waiter.start()
+        waiter.join()
+    assert failed == [True]
+    assert pool.stats().waits == 1
+
+
+def _try_checkout(pool: ConnectionPool) -> bool:
+    try:
+        with pool.connection():
+            return False
+    except PoolTimeoutError:
+        return True
+
+
+def test_pool_drops_connections_that_broke(pool: ConnectionPool) -> None:
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection() as broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+    with pool.connection() as fresh:
+        pass
+
+    assert broken.closed and fresh is not broken
+    assert (pool.stats().connects, pool.stats().discarded) == (2, 1)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from cityscape.automations.export.parquet import _arrow_type, _replace_dir, _state_key
+
+
+def test_arrow_types_follow_postgres_types() -> None:
+    pa = pytest.importorskip("pyarrow")
+
+    assert _arrow_type(pa, "int8") == pa.int64()
+    assert _arrow_type(pa, "date") == pa.date32()
+    assert _arrow_type(pa, "timestamptz") == pa.timestamp("us", tz="UTC")
+    # Types without a direct counterpart travel as text.
+    assert _arrow_type(pa, "jsonb") == pa.string()
+    assert _arrow_type(pa, "numeric") == pa.string()
+
+
+def test_incremental_state_is_kept_per_season_selection() -> None:
+    assert _state_key("raw.mlb_games", ()) == "raw.mlb_games"
+    assert _state_key("raw.mlb_games", (2023, 2024)) == "raw.mlb_games[2023,2024]"
+
+
+def test_replace_dir_swaps_in_the_new_files(tmp_path) -> None:
+    dest = tmp_path / "season=2024"
+    dest.mkdir()
+    (dest / "part-old.parquet").write_bytes(b"old")
+    src = tmp_path / ".tmp" / "season=2024"
+    src.mkdir(parents=True)
+    (src / "part-new.parquet").write_bytes(b"new")
+
+    _replace_dir(src, dest)
+
+    assert [p.name for p in dest.iterdir()] == ["part-new.parquet"]
+    assert not src.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".tmp", "season=2024"]
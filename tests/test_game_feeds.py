@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import copy
+import logging
+from contextlib import contextmanager
+from datetime import date
+
+import httpx
+import pytest
+
+from cityscape.automations.ingest import mlb as ingest
+from cityscape.integrations.http import HttpClient, HttpStats
+from cityscape.integrations.mlb.statsapi import MLB_STATSAPI_BASE_URL, MlbStatsApi
+
+FEED = {
+    "gamePk": 745444,
+    "metaData": {"timeStamp": "20240328_200000"},
+    "gameData": {
+        "game": {"pk": 745444, "season": "2024"},
+        "datetime": {"officialDate": "2024-03-28"},
+        "status": {"abstractGameState": "Live", "detailedState": "In Progress"},
+    },
+    "liveData": {"plays": {"allPlays": [{"result": "strikeout"}]}},
+}
+
+DIFF = [
+    {
+        "diff": [
+            {"op": "replace", "path": "/metaData/timeStamp", "value": "20240328_201500"},
+            {"op": "add", "path": "/liveData/plays/allPlays/-", "value": {"result": "single"}},
+            {"op": "replace", "path": "/gameData/status/abstractGameState", "value": "Final"},
+            {"op": "replace", "path": "/gameData/status/detailedState", "value": "Final"},
+        ]
+    }
+]
+
+
+def _api(diff: object) -> tuple[MlbStatsApi, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/feed/live/diffPatch"):
+            return httpx.Response(200, json=diff)
+        if request.url.path.endswith("/feed/live"):
+            return httpx.Response(200, json=copy.deepcopy(FEED))
+        return httpx.Response(404)
+
+    http = HttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=httpx.MockTransport(handler))
+    return MlbStatsApi(http=http), requests
+
+
+def test_game_feed_is_patched_from_the_last_timecode() -> None:
+    api, requests = _api(DIFF)
+
+    first = api.get_game_feed(745444)
+    assert (first.fetch, first.game_date, first.season) == ("full", date(2024, 3, 28), 2024)
+
+    second = api.get_game_feed(745444, prior=first)
+    assert requests[-1].url.params["startTimecode"] == "20240328_200000"
+    assert second.fetch == "patch"
+    assert second.is_final and second.timecode == "20240328_201500"
+    assert [p["result"] for p in second.feed["liveData"]["plays"]["allPlays"]] == [
+        "strikeout",
+        "single",
+    ]
+
+    # Final games are never fetched again.
+    assert api.get_game_feed(745444, prior=second).fetch == "unchanged"
+    assert len(requests) == 2
+
+
+def test_game_feed_refetches_when_the_diff_does_not_apply() -> None:
+    api, requests = _api(
+        [
+            {
+                "diff": [
+                    {"op": "replace", "path": "/metaData/timeStamp", "value": "20240328_201500"},
+                    {"op": "remove", "path": "/liveData/nope"},
+                ]
+            }
+        ]
+    )
+
+    prior = api.get_game_feed(745444)
+    feed = api.get_game_feed(745444, prior=prior)
+
+    assert feed.fetch == "full"
+    # The half-applied patch did not touch the prior feed.
+    assert prior.feed == FEED
+    assert [r.url.path.rsplit("/", 1)[-1] for r in requests] == ["live", "diffPatch", "live"]
+
+
+def test_list_game_feeds_keeps_input_order() -> None:
+    api, _ = _api([])
+    prior = api.get_game_feed(745444)
+
+    feeds = api.list_game_feeds([745444, 745445], priors={745444: prior})
+
+    assert [f.fetch for f in feeds] == ["unchanged", "full"]
+
+
+def test_feed_ingest_returns_its_connection_while_fetching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events: list[str] = []
+
+    class Conn:
+        def commit(self) -> None:
+            events.append("commit")
+
+    class Pool:
+        @contextmanager
+        def connection(self):
+            events.append("checkout")
+            yield Conn()
+            events.append("checkin")
+
+    class Api:
+        def http_stats(self) -> HttpStats:
+            return HttpStats()
+
+        def list_games(self, **_) -> list:
+            raw = {"gamePk": 745444, "status": {"abstractGameState": "Live"}}
+            return [ingest.MlbGame(745444, 2024, None, "R", "In Progress", 1, 2, 0, 0, raw=raw)]
+
+        def list_game_feeds(self, game_ids, **_) -> list:
+            events.append("fetch")
+            return []
+
+    monkeypatch.setattr(ingest, "get_run_logger", lambda: logging.getLogger(__name__))
+    monkeypatch.setattr(ingest, "postgres_config", lambda: None)
+    monkeypatch.setattr(ingest, "get_pool", lambda cfg: Pool())
+    monkeypatch.setattr(ingest, "MlbStatsApi", Api)
+    monkeypatch.setattr(ingest, "ensure_mlb_storage", lambda conn, seasons: None)
+    monkeypatch.setattr(ingest, "stored_mlb_game_feeds", lambda conn, **_: {})
+    monkeypatch.setattr(ingest, "upsert_rows", lambda conn, *a, **k: ingest.UpsertCounts())
+
+    ingest.ingest_mlb_game_feeds(game_date=date(2024, 3, 28))
+
+    # Read and commit, give the connection back, fetch, then take one again to write.
+    assert events == ["checkout", "commit", "checkin", "fetch", "checkout", "commit", "checkin"]
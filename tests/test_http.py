@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from cityscape.integrations.http import AsyncHttpClient, HttpClient, retry_after_s
+from cityscape.integrations.mlb.statsapi import MLB_STATSAPI_BASE_URL, MlbStatsApi
+from cityscape.integrations.ratelimit import RateLimiter
+
+SCHEDULE = {
+    "dates": [
+        {
+            "date": "2024-03-28",
+            "games": [
+                {
+                    "gamePk": 745444,
+                    "gameType": "R",
+                    "officialDate": "2024-03-28",
+                    "status": {"detailedState": "Final"},
+                    "teams": {
+                        "home": {"team": {"id": 147}, "score": 4},
+                        "away": {"team": {"id": 110}, "score": 2},
+                    },
+                }
+            ],
+        }
+    ]
+}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/v1/schedule"):
+        return httpx.Response(200, json=SCHEDULE)
+    if request.url.path.endswith("/v1/teams"):
+        return httpx.Response(200, json={"teams": [{"id": 147, "name": "New York Yankees"}]})
+    return httpx.Response(404)
+
+
+def test_http_client_reuses_one_pool() -> None:
+    http = HttpClient(base_url="https://example.test", transport=httpx.MockTransport(_handler))
+    http.get_json("v1/teams")
+    first = http.client
+    http.get_json("v1/teams")
+    assert http.client is first
+    http.close()
+
+
+def test_http_client_retries_then_raises() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(500)
+
+    http = HttpClient(
+        base_url="https://example.test",
+        retries=2,
+        backoff_s=0,
+        transport=httpx.MockTransport(handler),
+    )
+    try:
+        http.get_json("x")
+    except httpx.HTTPStatusError:
+        pass
+    else:
+        raise AssertionError("expected HTTPStatusError")
+    assert calls == 3
+    assert (http.stats().requests, http.stats().retries) == (3, 2)
+
+
+def test_http_client_raises_permanent_errors_at_once() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(404)
+
+    http = HttpClient(
+        base_url="https://example.test", backoff_s=0, transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        http.get_json("x")
+    assert calls == 1
+    assert http.stats().retries == 0
+
+
+def test_http_client_honours_retry_after_and_reports_to_limiter() -> None:
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    limiter = RateLimiter(rate_per_s=1000, initial_concurrency=4)
+
+    http = HttpClient(
+        base_url="https://example.test",
+        backoff_s=0,
+        limiter=limiter,
+        transport=httpx.MockTransport(lambda request: responses.pop(0)),
+    )
+    assert http.get_json("x") == {"ok": True}
+    assert http.stats().retries == 1
+    assert limiter.in_flight == 0
+    assert limiter.concurrency == 2  # halved by the 429, then +1/2
+
+
+def test_async_client_retries_transport_errors() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run() -> dict:
+        async with AsyncHttpClient(
+            base_url="https://example.test",
+            backoff_s=0,
+            limiter=RateLimiter(rate_per_s=1000),
+            transport=httpx.MockTransport(handler),
+        ) as http:
+            return await http.get_json("x")
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert calls == 2
+
+
+def test_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert retry_after_s(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+    when = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+    assert 28 < retry_after_s(httpx.Response(503, headers={"Retry-After": when})) <= 30
+    assert retry_after_s(httpx.Response(429)) is None
+
+
+def test_sync_and_async_endpoints_agree() -> None:
+    api = MlbStatsApi(
+        http=HttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=httpx.MockTransport(_handler)),
+        async_http=AsyncHttpClient(
+            base_url=MLB_STATSAPI_BASE_URL, transport=httpx.MockTransport(_handler)
+        ),
+    )
+
+    games = api.list_games(season=2024)
+
+    async def run() -> list:
+        try:
+            return await api.alist_games(season=2024)
+        finally:
+            await api.aclose()
+
+    assert asyncio.run(run()) == games
+    assert games[0].game_id == 745444
+    assert games[0].game_date == date(2024, 3, 28)
+    assert (games[0].home_team_id, games[0].home_score) == (147, 4)
+    assert api.list_teams(season=2024)[0].team_name == "New York Yankees"
+
+
+def test_iter_games_matches_list_games_and_is_lazy() -> None:
+    api = MlbStatsApi(
+        http=HttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=httpx.MockTransport(_handler))
+    )
+
+    games = api.iter_games(season=2024)
+    assert not isinstance(games, list)
+    assert list(games) == api.list_games(season=2024)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from cityscape.utils.jsonpatch import JsonPatchError, apply_patch
+
+
+def test_apply_patch_operations() -> None:
+    doc = {"a": {"b": 1, "c/d": [1, 2]}, "e": [{"x": 1}]}
+
+    out = apply_patch(
+        doc,
+        [
+            {"op": "replace", "path": "/a/b", "value": 2},
+            {"op": "add", "path": "/a/c~1d/-", "value": 3},
+            {"op": "add", "path": "/a/c~1d/0", "value": 0},
+            {"op": "remove", "path": "/e/0/x"},
+            {"op": "copy", "from": "/a/b", "path": "/e/0/y"},
+            {"op": "move", "from": "/a/b", "path": "/moved"},
+            {"op": "test", "path": "/moved", "value": 2},
+        ],
+    )
+
+    assert out is doc
+    assert doc == {"a": {"c/d": [0, 1, 2, 3]}, "e": [{"y": 2}], "moved": 2}
+
+
+def test_apply_patch_can_replace_the_root() -> None:
+    assert apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": [1]}]) == [1]
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        {"op": "replace", "path": "/missing", "value": 1},
+        {"op": "remove", "path": "/list/5"},
+        {"op": "add", "path": "/list/01", "value": 1},
+        {"op": "test", "path": "/list/0", "value": 2},
+        {"op": "move", "from": "/list", "path": "/list/0"},
+        {"op": "frobnicate", "path": "/list"},
+        {"op": "add", "path": "/x"},
+        {"op": "copy", "path": "/x"},
+    ],
+)
+def test_apply_patch_rejects_what_does_not_apply(op: dict) -> None:
+    with pytest.raises(JsonPatchError):
+        apply_patch({"list": [1]}, [op])
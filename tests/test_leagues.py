@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from cityscape.automations.ingest import engine
+from cityscape.automations.ingest.engine import LeagueJob, ingest_leagues
+from cityscape.automations.ingest.ledger import LedgerEntry
+from cityscape.integrations.leagues import Endpoint, LoadChunk
+from cityscape.integrations.nba.connector import NBA_GAMES, NbaConnector
+from cityscape.integrations.nba.stub import NbaStubSource
+from cityscape.utils.db import UpsertCounts
+
+
+def test_nba_stub_connector_plans_fetches_and_parses_a_season() -> None:
+    connector = NbaConnector(NbaStubSource(today=date(2025, 1, 1)))
+    endpoints = connector.endpoints(2024)
+
+    assert [str(e) for e in endpoints[:2]] == [
+        "nba:teams[2024]",
+        "nba:games[2024] 2024-10-22..2024-10-31",
+    ]
+    chunks = [c for e in endpoints for c in connector.parse(e, connector.fetch(e))]
+    games = [c for c in chunks if c.target == NBA_GAMES.target]
+    assert len(chunks[0]) == 30
+    assert sum(len(c) for c in games) == 174 * 7
+    assert games[0].columns["status"][0] == "Final"
+    assert games[-1].columns["status"][-1] == "Scheduled"
+
+    # A game keeps its teams as the season goes on.
+    later = NbaConnector(NbaStubSource(today=date(2025, 4, 1)))
+    (after,) = later.parse(endpoints[-1], later.fetch(endpoints[-1]))
+    assert after.columns["home_team_id"] == games[-1].columns["home_team_id"]
+
+
+class _SlowLeague:
+    """A league whose every request takes `latency_s`."""
+
+    tables = ()
+
+    def __init__(
+        self,
+        league: str,
+        *,
+        requests: int,
+        latency_s: float,
+        fail: bool = False,
+        settled: bool = True,
+    ):
+        self.league = league
+        self.requests = requests
+        self.latency_s = latency_s
+        self.fail = fail
+        self.is_settled = settled
+        self.options: dict[str, Any] = {}
+        self.fetched: list[str] = []
+
+    def ensure_storage(self, conn, seasons) -> None:
+        pass
+
+    def endpoints(self, season: int, *, start_date=None, end_date=None) -> list[Endpoint]:
+        return [Endpoint(self.league, f"page{i}", season) for i in range(self.requests)]
+
+    def fetch(self, endpoint: Endpoint) -> Any:
+        time.sleep(self.latency_s)
+        self.fetched.append(endpoint.name)
+        if self.fail or endpoint.name == "boom":
+            raise RuntimeError("source down")
+        return endpoint.name
+
+    def parse(self, endpoint: Endpoint, payload: Any) -> Iterator[LoadChunk]:
+        target = SimpleNamespace(table=f"raw.{self.league}_games", columns=("game_id",))
+        yield LoadChunk(target, {"game_id": [payload]})
+
+    def settled(self, endpoint: Endpoint, payload: Any) -> bool:
+        return self.is_settled
+
+    def load_options(self) -> dict[str, Any]:
+        return self.options
+
+
+@pytest.fixture
+def ledger(monkeypatch) -> dict[Endpoint, LedgerEntry]:
+    """An in-memory ingest ledger in place of raw.ingest_ledger."""
+
+    entries: dict[Endpoint, LedgerEntry] = {}
+
+    def plan(conn, endpoints):
+        return {e: entries.setdefault(e, LedgerEntry()) for e in endpoints}
+
+    def finish(conn, endpoint, *, counts, payload_digest, settled, wall_s, signature):
+        entries[endpoint] = LedgerEntry("done", settled, payload_digest, signature)
+
+    def fail(conn, endpoint, error):
+        entries[endpoint] = LedgerEntry("failed")
+
+    monkeypatch.setattr(engine, "ensure_ledger", lambda conn: None)
+    monkeypatch.setattr(engine, "plan_units", plan)
+    monkeypatch.setattr(engine, "finish_unit", finish)
+    monkeypatch.setattr(engine, "fail_unit", fail)
+    monkeypatch.setattr(engine, "partition_oids", lambda conn, tables, season: [])
+    return entries
+
+
+@pytest.fixture
+def fake_db(monkeypatch, ledger) -> list[str]:
+    loaded: list[str] = []
+
+    @contextmanager
+    def connection():
+        yield object()
+
+    pool = SimpleNamespace(connection=connection, stats=lambda: SimpleNamespace(as_dict=dict))
+    monkeypatch.setattr(engine, "get_pool", lambda cfg: pool)
+
+    def upsert(conn, target, columns, *, method):
+        loaded.append(f"{target.table}:{columns['game_id'][0]}")
+        return UpsertCounts(inserted=1)
+
+    monkeypatch.setattr(engine, "upsert_columns", upsert)
+    return loaded
+
+
+def test_leagues_run_side_by_side_and_fail_independently(fake_db: list[str]) -> None:
+    jobs = [
+        LeagueJob(_SlowLeague("aaa", requests=4, latency_s=0.1), 2024),
+        LeagueJob(_SlowLeague("bbb", requests=4, latency_s=0.1), 2024),
+        LeagueJob(_SlowLeague("ccc", requests=2, latency_s=0.05, fail=True), 2024),
+    ]
+
+    engine.get_run_logger()  # keep the one-off Prefect import out of the timing
+    started = time.perf_counter()
+    results = ingest_leagues(jobs, max_fetches=8)
+    elapsed = time.perf_counter() - started
+
+    # Each league alone takes 0.4s if fetched one request at a time.
+    assert elapsed < 0.35
+    assert [(r.league, r.ok, r.requests) for r in results] == [
+        ("aaa", True, 4),
+        ("bbb", True, 4),
+        ("ccc", False, 0),
+    ]
+    assert results[0].tables == {"raw.aaa_games": UpsertCounts(inserted=4)}
+    # Responses load in endpoint order within a league.
+    assert [x for x in fake_db if x.startswith("raw.aaa")] == [
+        f"raw.aaa_games:page{i}" for i in range(4)
+    ]
+
+
+def test_a_job_fetches_at_most_max_fetches_ahead_of_its_loads(
+    fake_db: list[str], monkeypatch
+) -> None:
+    league = _SlowLeague("aaa", requests=12, latency_s=0)
+    ahead: list[int] = []
+    upsert = engine.upsert_columns
+
+    def slow_upsert(conn, target, columns, *, method):
+        ahead.append(len(league.fetched) - len(fake_db))
+        time.sleep(0.01)
+        return upsert(conn, target, columns, method=method)
+
+    monkeypatch.setattr(engine, "upsert_columns", slow_upsert)
+    (result,) = ingest_leagues([LeagueJob(league, 2024)], max_fetches=2)
+    assert result.requests == 12
+    # The response being loaded, the one queued behind it and the one just submitted.
+    assert max(ahead) <= 3
+
+
+def test_rerun_resumes_from_the_ledger(fake_db: list[str], ledger) -> None:
+    class Interrupted(_SlowLeague):
+        def endpoints(self, season, *, start_date=None, end_date=None):
+            pages = super().endpoints(season)
+            return [*pages[:2], Endpoint(self.league, "boom", season), *pages[2:]]
+
+    first = Interrupted("aaa", requests=4, latency_s=0)
+    assert not ingest_leagues([LeagueJob(first, 2024)])[0].ok
+    assert ledger[Endpoint("aaa", "boom", 2024)].status == "failed"
+
+    # The units loaded before the failure are settled, so only the rest is fetched.
+    second = _SlowLeague("aaa", requests=4, latency_s=0)
+    (result,) = ingest_leagues([LeagueJob(second, 2024)])
+    assert result.ok and result.skipped == 2
+    assert second.fetched == ["page2", "page3"]
+
+    # Unsettled units are fetched again, but an identical response is not reloaded.
+    fake_db.clear()
+    for endpoint, entry in ledger.items():
+        ledger[endpoint] = replace(entry, settled=False)
+    (result,) = ingest_leagues([LeagueJob(_SlowLeague("aaa", requests=4, latency_s=0), 2024)])
+    assert (result.requests, result.unchanged, fake_db) == (4, 4, [])
+
+    refreshed = _SlowLeague("aaa", requests=4, latency_s=0)
+    (result,) = ingest_leagues([LeagueJob(refreshed, 2024)], refresh=True)
+    assert len(refreshed.fetched) == 4 and len(fake_db) == 4
+
+
+def test_units_load_again_under_other_load_options(fake_db: list[str]) -> None:
+    assert ingest_leagues([LeagueJob(_SlowLeague("aaa", requests=3, latency_s=0), 2024)])[0].ok
+
+    same = _SlowLeague("aaa", requests=3, latency_s=0)
+    (result,) = ingest_leagues([LeagueJob(same, 2024)])
+    assert result.skipped == 3 and same.fetched == []
+
+    # E.g. another raw retention: the settled units are fetched and written again.
+    fake_db.clear()
+    projected = _SlowLeague("aaa", requests=3, latency_s=0)
+    projected.options = {"raw_keys": ["gamePk"]}
+    (result,) = ingest_leagues([LeagueJob(projected, 2024)])
+    assert (result.skipped, result.unchanged, len(fake_db)) == (0, 0, 3)
+
+    (result,) = ingest_leagues([LeagueJob(projected, 2024)], load_method="copy")
+    assert result.skipped == 0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from cityscape.utils.metrics import IngestMetrics, StageTimer, append_jsonl, timed_iter
+
+
+def test_stage_timer_charges_nested_time_to_inner_stage_only() -> None:
+    timer = StageTimer()
+    with timer.stage("outer"):
+        time.sleep(0.01)
+        with timer.stage("inner"):
+            time.sleep(0.03)
+
+    totals = timer.totals()
+    assert totals["inner"] >= 0.03
+    assert 0.01 <= totals["outer"] < 0.03
+
+
+def test_stage_timer_ignores_other_threads() -> None:
+    timer = StageTimer()
+
+    def work() -> None:
+        with timer.stage("worker"):
+            pass
+
+    t = threading.Thread(target=work)
+    t.start()
+    t.join()
+    assert "worker" not in timer.totals()
+
+
+def test_timed_iter_yields_everything_and_records_stage() -> None:
+    timer = StageTimer()
+    assert list(timed_iter(range(5), timer, "produce")) == [0, 1, 2, 3, 4]
+    assert "produce" in timer.totals()
+
+
+def test_ingest_metrics_render_prometheus_and_jsonl(tmp_path) -> None:
+    metrics = IngestMetrics(wall_s=2.0, stages={"upsert_games": 1.5}, rows=100, http_retries=1)
+
+    assert metrics.as_dict()["rows_per_s"] == 50.0
+    assert metrics.as_dict()["stage_other_s"] == 0.5
+
+    text = metrics.prometheus({"league": "mlb", "season": 2024})
+    assert (
+        'cityscape_ingest_stage_seconds{league="mlb",season="2024",stage="upsert_games"} 1.5'
+        in text
+    )
+    assert 'cityscape_ingest_http_retries{league="mlb",season="2024"} 1' in text
+
+    path = tmp_path / "metrics.jsonl"
+    append_jsonl(path, metrics.as_dict())
+    append_jsonl(path, metrics.as_dict())
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["rows_per_s"] for line in lines] == [50.0, 50.0]
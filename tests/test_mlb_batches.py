@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import copy
+from types import SimpleNamespace
+from typing import Any
+
+from cityscape.automations.ingest.mlb import game_row
+from cityscape.integrations.mlb.batches import iter_game_batches
+from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.utils import db
+from cityscape.utils.db import MLB_GAMES, _column_digests, row_digest, upsert_columns
+
+SCHEDULE = {
+    "dates": [
+        {
+            "date": "2024-03-28",
+            "games": [
+                {
+                    "gamePk": 1,
+                    "officialDate": "2024-03-28",
+                    "gameType": "R",
+                    "status": {"detailedState": "Final"},
+                    "teams": {
+                        "home": {"team": {"id": 147, "name": "Yankees"}, "score": 3},
+                        "away": {"team": {"id": 111, "name": "Red Sox ⚾"}, "score": 0},
+                    },
+                },
+                {"gamePk": 2, "status": {}, "teams": {"home": {}, "away": {"team": {"id": 5}}}},
+            ],
+        },
+        {"date": "2024-03-29", "games": [{"gamePk": 3, "officialDate": "not a date"}]},
+    ]
+}
+
+
+def _batches(**kwargs: Any) -> list:
+    return list(iter_game_batches([copy.deepcopy(SCHEDULE)], season=2024, **kwargs))
+
+
+def test_batches_read_back_as_the_parsed_games() -> None:
+    games = list(MlbStatsApi._iter_parsed_games(copy.deepcopy(SCHEDULE), season=2024))
+    batches = _batches(batch_size=2)
+
+    assert [len(b) for b in batches] == [2, 1]
+    assert [g for b in batches for g in b] == games
+    assert batches[0].columns()["home_score"] == [3, None]
+
+
+def test_batch_digests_match_row_digests() -> None:
+    games = list(MlbStatsApi._iter_parsed_games(copy.deepcopy(SCHEDULE), season=2024))
+    (batch,) = _batches()
+    assert _column_digests(MLB_GAMES, batch.columns()) == [
+        row_digest(game_row(g), MLB_GAMES.columns) for g in games
+    ]
+
+    # Projected raw payloads are hashed as stored.
+    (batch,) = _batches(raw_keys=["gamePk", "teams.home.score"])
+    assert batch.raw_bytes_after < batch.raw_bytes_before
+    assert _column_digests(MLB_GAMES, batch.columns()) == [
+        row_digest(game_row(g), MLB_GAMES.columns) for g in batch
+    ]
+
+
+def test_upsert_columns_keeps_the_last_row_per_key(monkeypatch) -> None:
+    executed: list[list[list[Any]]] = []
+
+    class _Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            pass
+
+        def execute(self, sql: str, params: list[list[Any]]) -> None:
+            executed.append(params)
+
+        def fetchall(self) -> list[tuple[bool]]:
+            return [(True,)] * len(executed[-1][0])
+
+    monkeypatch.setattr(db, "_prepared_upsert", lambda conn, target: "execute upsert")
+    (batch,) = _batches()
+    columns = {c: [*values, values[0]] for c, values in batch.columns().items()}
+    columns["status"][-1] = "Suspended"
+
+    counts = upsert_columns(SimpleNamespace(cursor=_Cursor), MLB_GAMES, columns)
+
+    (params,) = executed
+    status = params[MLB_GAMES.write_columns.index("status")]
+    raw = params[MLB_GAMES.write_columns.index("raw")]
+    assert params[0] == [2, 3, 1] and status == [None, None, "Suspended"]
+    assert isinstance(raw[0], str)
+    assert counts.inserted == 3
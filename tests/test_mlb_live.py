@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, date, datetime
+from typing import Any
+
+import httpx
+
+from cityscape.automations.ingest.mlb_live import _watch, changed_games, poll_delay
+from cityscape.integrations.http import AsyncHttpClient, HttpClient
+from cityscape.integrations.mlb.statsapi import MLB_STATSAPI_BASE_URL, MlbGame, MlbStatsApi
+
+NOW = datetime(2024, 6, 1, 16, 0, tzinfo=UTC)
+
+
+def _raw(pk: int, state: str, start: str = "2024-06-01T23:05:00Z", home: int = 0) -> dict:
+    return {
+        "gamePk": pk,
+        "officialDate": "2024-06-01",
+        "gameDate": start,
+        "status": {"abstractGameState": state, "detailedState": state},
+        "teams": {"home": {"team": {"id": 1}, "score": home}, "away": {"team": {"id": 2}}},
+    }
+
+
+def _game(pk: int, state: str, start: str = "2024-06-01T23:05:00Z", home: int = 0) -> MlbGame:
+    return MlbGame(
+        game_id=pk,
+        season=2024,
+        game_date=date(2024, 6, 1),
+        game_type="R",
+        status=state,
+        home_team_id=1,
+        away_team_id=2,
+        home_score=home,
+        away_score=None,
+        raw=_raw(pk, state, start, home),
+    )
+
+
+def test_poll_delay_follows_game_state() -> None:
+    assert poll_delay([_game(1, "Live"), _game(2, "Preview")], now=NOW) == 10.0
+    # First pitch at 23:05, so sleep until 22:55 but no longer than idle_s.
+    assert poll_delay([_game(1, "Preview")], now=NOW) == 900.0
+    assert poll_delay([_game(1, "Preview")], now=NOW, idle_s=86_400) == 6.0 * 3600 + 55 * 60
+    assert poll_delay([_game(1, "Preview", "2024-06-01T16:05:00Z")], now=NOW) == 60.0
+    # Overdue (rain delay before the first pitch): keep checking at the pre-game pace.
+    assert poll_delay([_game(1, "Preview", "2024-06-01T15:05:00Z")], now=NOW) == 60.0
+    assert poll_delay([_game(1, "Final"), _game(2, "Preview", "")], now=NOW) == 60.0
+
+
+def test_changed_games_only_reports_status_and_score_changes() -> None:
+    seen: dict[int, Any] = {}
+    assert [g.game_id for g in changed_games([_game(1, "Live"), _game(2, "Live")], seen)] == [1, 2]
+    assert changed_games([_game(1, "Live"), _game(2, "Live")], seen) == []
+    assert [
+        g.game_id for g in changed_games([_game(1, "Live", home=1), _game(2, "Live")], seen)
+    ] == [1]
+
+
+def test_watch_writes_changes_until_all_games_are_final() -> None:
+    polls = [
+        [_raw(1, "Live"), _raw(2, "Preview", "2000-01-01T00:00:00Z")],
+        [_raw(1, "Live"), _raw(2, "Preview", "2000-01-01T00:00:00Z")],
+        [_raw(1, "Live", home=2), _raw(2, "Live")],
+        [_raw(1, "Final", home=2), _raw(2, "Final")],
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        games = polls.pop(0) if len(polls) > 1 else polls[0]
+        return httpx.Response(200, json={"dates": [{"date": "2024-06-01", "games": games}]})
+
+    transport = httpx.MockTransport(handler)
+    api = MlbStatsApi(
+        http=HttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=transport),
+        async_http=AsyncHttpClient(base_url=MLB_STATSAPI_BASE_URL, transport=transport),
+    )
+    writes: list[list[int]] = []
+    failures = [RuntimeError("connection lost")]
+
+    async def write(game_rows: list[dict[str, Any]], feed_rows: list[dict[str, Any]]) -> None:
+        if failures:
+            raise failures.pop()
+        writes.append([r["game_id"] for r in game_rows])
+
+    async def run():
+        try:
+            return await _watch(
+                api,
+                write,
+                game_date=date(2024, 6, 1),
+                season=2024,
+                game_types="R",
+                feeds=False,
+                final_feeds=set(),
+                feed_priors={},
+                live_s=0.0,
+                pregame_s=0.0,
+                idle_s=0.0,
+                deadline=time.monotonic() + 10,
+                stop=asyncio.Event(),
+                max_concurrency=2,
+            )
+        finally:
+            await api.aclose()
+
+    result = asyncio.run(run())
+
+    # The first write fails and is retried on the next poll; unchanged polls write nothing.
+    assert writes == [[1, 2], [1, 2], [1, 2]]
+    assert (result.stopped, result.polls, result.games_written) == ("all_final", 4, 6)
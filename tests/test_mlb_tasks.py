@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import httpx
+import psycopg2
+from prefect.states import Failed
+
+from cityscape.automations.prefect.mlb_tasks import (
+    _retry_db,
+    _retry_network,
+    transform_mlb_games,
+)
+from cityscape.utils.db import MLB_GAMES, MLB_GAMES_ARCHIVE
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://statsapi.mlb.com/api/v1/schedule")
+    return httpx.HTTPStatusError("", request=request, response=httpx.Response(code))
+
+
+def test_retry_policies_split_network_and_database_failures() -> None:
+    assert _retry_network(None, None, Failed(data=httpx.ConnectTimeout("timed out")))
+    assert _retry_network(None, None, Failed(data=_status_error(503)))
+    assert not _retry_network(None, None, Failed(data=_status_error(404)))
+
+    assert _retry_db(None, None, Failed(data=psycopg2.OperationalError("connection lost")))
+    assert _retry_db(None, None, Failed(data=psycopg2.extensions.TransactionRollbackError()))
+    assert not _retry_db(None, None, Failed(data=psycopg2.IntegrityError("duplicate key")))
+    assert not _retry_db(None, None, Failed(data=ValueError("bad rows")))
+
+
+def test_transform_splits_a_schedule_response_into_load_chunks() -> None:
+    games = [
+        {"gamePk": pk, "officialDate": "2024-04-01", "gameType": "R", "venue": {"id": 1}}
+        for pk in range(5)
+    ]
+    payload = {"dates": [{"games": games[:3]}, {"games": games[3:]}]}
+
+    parsed = transform_mlb_games.fn(
+        payload, season=2024, batch_size=2, raw_keys=("gamePk",), archive=True
+    )
+
+    targets = [chunk.target for chunk in parsed.chunks]
+    assert targets == [MLB_GAMES, MLB_GAMES_ARCHIVE] * 3
+    assert [len(c) for c in parsed.chunks if c.target == MLB_GAMES] == [2, 2, 1]
+    assert parsed.raw_bytes.rows == 5
+    assert parsed.raw_bytes.after < parsed.raw_bytes.before
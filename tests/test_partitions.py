@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from cityscape.utils.db import MLB_GAMES
+from cityscape.utils.partitions import partition_name
+
+
+def test_partition_name_is_schema_qualified_per_season() -> None:
+    assert partition_name("raw.mlb_games", 2024) == "raw.mlb_games_2024"
+    assert partition_name("mlb_games", 2024) == "public.mlb_games_2024"
+
+
+def test_partition_name_rejects_non_integer_values() -> None:
+    with pytest.raises(TypeError):
+        partition_name("raw.mlb_games", "2024; drop table raw.mlb_games")  # type: ignore[arg-type]
+
+
+def test_upsert_counts_inserts_without_xmax() -> None:
+    # Partitioned tables cannot return system columns such as xmax.
+    target = replace(MLB_GAMES, table="raw.mlb_games_2024_reload")
+    sql = target.prepare_sql(dict.fromkeys(target.write_columns, "text"))
+    assert "xmax" not in sql
+    assert (
+        "prior.game_id = raw.mlb_games_2024_reload.game_id "
+        "and prior.season = raw.mlb_games_2024_reload.season" in sql
+    )
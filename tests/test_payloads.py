@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+
+from cityscape.integrations.mlb.batches import iter_game_batches
+from cityscape.utils.payloads import compress_json, decompress_json, project
+
+GAME = {
+    "gamePk": 1,
+    "status": {"detailedState": "Final", "startTimeTBD": False},
+    "teams": {"home": {"team": {"id": 147, "link": "/x"}, "score": 3}},
+    "content": {"link": "/api/v1/game/1/content"},
+}
+
+
+def test_project_keeps_nested_paths_only() -> None:
+    keys = ["gamePk", "status.detailedState", "teams.home.team.id", "missing.key"]
+    assert project(GAME, keys) == {
+        "gamePk": 1,
+        "status": {"detailedState": "Final"},
+        "teams": {"home": {"team": {"id": 147}}},
+    }
+
+
+def test_compress_round_trip() -> None:
+    assert decompress_json(compress_json(GAME)) == GAME
+
+
+def test_archive_retention_projects_and_archives() -> None:
+    (batch,) = iter_game_batches(
+        [{"dates": [{"games": [GAME]}]}], season=2024, raw_keys=["gamePk"], archive=True
+    )
+
+    assert json.loads(batch.columns()["raw"][0]) == {"gamePk": 1}
+    assert decompress_json(batch.archive_columns()["payload"][0]) == GAME
+    assert batch.raw_bytes_after < batch.raw_bytes_before
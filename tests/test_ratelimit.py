@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cityscape.integrations.ratelimit import CircuitOpenError, RateLimiter
+
+
+def test_token_bucket_admits_a_burst_then_paces() -> None:
+    limiter = RateLimiter(rate_per_s=10, burst=2, max_concurrency=8)
+
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() == 0.0
+    wait = limiter.try_acquire()
+    assert wait is not None and 0 < wait <= 0.1
+
+
+def test_concurrency_slots_and_aimd() -> None:
+    limiter = RateLimiter(rate_per_s=1000, initial_concurrency=2, max_concurrency=4)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.try_acquire() is None  # both slots taken
+
+    limiter.release("throttled")
+    assert limiter.concurrency == 1
+    limiter.release("ok")
+    assert limiter.concurrency == 2  # additive increase: +1/limit
+    assert limiter.in_flight == 0
+
+
+def test_retry_after_pauses_every_caller() -> None:
+    limiter = RateLimiter(rate_per_s=1000)
+    limiter.acquire()
+    limiter.release("throttled", retry_after_s=5)
+
+    wait = limiter.try_acquire()
+    assert wait is not None and 4 < wait <= 5
+
+
+def test_circuit_opens_then_lets_one_probe_through() -> None:
+    limiter = RateLimiter(rate_per_s=1000, min_concurrency=2, failure_threshold=2, reset_s=0.05)
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release("failed")
+
+    with pytest.raises(CircuitOpenError):
+        limiter.acquire()
+
+    time.sleep(0.06)
+    limiter.acquire()  # the probe
+    with pytest.raises(CircuitOpenError):
+        limiter.try_acquire()
+    limiter.release("ok")
+    assert limiter.try_acquire() == 0.0
+
+
+def test_state_file_is_shared_between_limiters(tmp_path) -> None:
+    path = tmp_path / "limits.sqlite"
+    a = RateLimiter(rate_per_s=1000, name="statsapi", state_path=path)
+    b = RateLimiter(rate_per_s=1000, name="statsapi", state_path=path)
+    other = RateLimiter(rate_per_s=1000, name="elsewhere", state_path=path)
+
+    a.acquire()
+    a.release("throttled", retry_after_s=30)
+
+    wait = b.try_acquire()
+    assert wait is not None and wait > 29
+    assert other.try_acquire() == 0.0
+
+
+def test_async_acquire_and_release_keep_sqlite_work_off_the_event_loop(tmp_path) -> None:
+    limiter = RateLimiter(rate_per_s=1000, name="statsapi", state_path=tmp_path / "limits.sqlite")
+    threads: list[threading.Thread] = []
+    transaction = limiter._shared.transaction
+
+    def _recording():
+        threads.append(threading.current_thread())
+        return transaction()
+
+    limiter._shared.transaction = _recording  # type: ignore[method-assign]
+
+    async def _round_trip() -> None:
+        await limiter.aacquire()
+        assert limiter.in_flight == 1
+        await limiter.arelease("throttled", retry_after_s=30)
+
+    asyncio.run(_round_trip())
+
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    assert limiter.in_flight == 0
+    wait = limiter.try_acquire()
+    assert wait is not None and wait > 29
+
+
+def test_shared_state_is_written_without_the_local_lock() -> None:
+    limiter = RateLimiter(rate_per_s=1000)
+    transaction = limiter._shared.transaction
+    lock_free: list[bool] = []
+
+    def _probing():
+        free = limiter._lock.acquire(blocking=False)
+        if free:
+            limiter._lock.release()
+        lock_free.append(free)
+        return transaction()
+
+    limiter._shared.transaction = _probing  # type: ignore[method-assign]
+    assert limiter.try_acquire() == 0.0
+    limiter.release("ok")
+
+    assert lock_free == [True, True]
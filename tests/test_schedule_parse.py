@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+from cityscape.integrations.mlb.schedule import (
+    game_fields,
+    iter_schedule_games,
+    parse_date,
+    team_fields,
+)
+from cityscape.integrations.mlb.statsapi import MlbStatsApi
+from cityscape.utils.payloads import loads_json
+
+
+def test_game_fields_tolerate_missing_and_malformed_parts() -> None:
+    game = {
+        "gamePk": "7",
+        "officialDate": "2024-04-01",
+        "gameType": "R",
+        "status": {"detailedState": "Final"},
+        "teams": {"home": {"team": {"id": "147"}, "score": "3"}, "away": {"score": 0}},
+    }
+    assert game_fields(game) == (7, date(2024, 4, 1), "R", "Final", 147, None, 3, 0)
+    assert game_fields(
+        {"gamePk": 8, "officialDate": "2024-02-30", "gameType": 1, "status": "x", "teams": []}
+    ) == (8, None, None, None, None, None, None, None)
+    team = {"id": 1, "name": None, "league": {"id": "103"}, "division": []}
+    assert team_fields(team) == (1, "", None, 103, None)
+
+
+def test_iter_schedule_games_leaves_the_payload_intact() -> None:
+    payload = {"dates": [{"games": [{"gamePk": 1}, "x"]}, None, {"games": [{"gamePk": 2}]}]}
+    before = json.dumps(payload)
+    assert [g["gamePk"] for g in iter_schedule_games(payload)] == [1, 2]
+    assert [g["gamePk"] for g in iter_schedule_games(payload)] == [1, 2]
+    assert json.dumps(payload) == before
+
+
+def test_parse_date_caches_each_string() -> None:
+    assert parse_date("2024-04-01") is parse_date("2024-04-01")
+    assert parse_date("") is None and parse_date(None) is None and parse_date("04/01") is None
+
+
+def test_schedule_decodes_from_bytes_like_json() -> None:
+    body = json.dumps(
+        {"dates": [{"games": [{"gamePk": 1, "officialDate": "2024-04-01", "x": 1.5e300}]}]}
+    ).encode()
+    assert loads_json(body) == json.loads(body)
+    # Values orjson rejects still decode.
+    fallback = loads_json(b'{"big": 123456789012345678901234567890, "nan": NaN}')
+    assert fallback["big"] == 123456789012345678901234567890
+
+    (game,) = MlbStatsApi._iter_parsed_games(loads_json(body), season=2024)
+    assert (game.game_id, game.game_date, game.raw["x"]) == (1, date(2024, 4, 1), 1.5e300)
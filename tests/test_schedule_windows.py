@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from cityscape.integrations.http import AsyncHttpClient, HttpClient
+from cityscape.integrations.leagues import schedule_windows
+from cityscape.integrations.mlb.statsapi import (
+    MLB_STATSAPI_BASE_URL,
+    MlbStatsApi,
+    ScheduleFetchError,
+)
+
+SEASON = {"seasons": [{"seasonStartDate": "2024-03-20", "seasonEndDate": "2024-05-10"}]}
+
+
+def _game(pk: int, day: str, state: str = "Final") -> dict:
+    return {"gamePk": pk, "officialDate": day, "status": {"detailedState": state}}
+
+
+def _schedule(start: str, end: str) -> dict:
+    games = [
+        _game(1, "2024-03-28"),
+        _game(2, "2024-04-02", "Postponed"),
+        _game(3, "2024-04-15"),
+        _game(2, "2024-05-01"),  # makeup date of the postponed game
+    ]
+    return {
+        "dates": [
+            {"date": g["officialDate"], "games": [g]}
+            for g in games
+            if start <= g["officialDate"] <= end
+        ]
+    }
+
+
+def _api(fail_starts: dict[str, int] | None = None) -> tuple[MlbStatsApi, list[str]]:
+    fail_starts = dict(fail_starts or {})
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if request.url.path.endswith("/seasons"):
+            return httpx.Response(200, json=SEASON)
+        calls.append(params["startDate"])
+        if fail_starts.get(params["startDate"], 0) > 0:
+            fail_starts[params["startDate"]] -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, json=_schedule(params["startDate"], params["endDate"]))
+
+    http = HttpClient(
+        base_url=MLB_STATSAPI_BASE_URL, retries=0, transport=httpx.MockTransport(handler)
+    )
+    async_http = AsyncHttpClient(
+        base_url=MLB_STATSAPI_BASE_URL, retries=0, transport=httpx.MockTransport(handler)
+    )
+    return MlbStatsApi(http=http, async_http=async_http), calls
+
+
+def test_schedule_windows_cover_range() -> None:
+    assert schedule_windows(date(2024, 3, 20), date(2024, 5, 10), "month") == [
+        (date(2024, 3, 20), date(2024, 3, 31)),
+        (date(2024, 4, 1), date(2024, 4, 30)),
+        (date(2024, 5, 1), date(2024, 5, 10)),
+    ]
+    weeks = schedule_windows(date(2024, 3, 1), date(2024, 3, 20), "week")
+    assert weeks[0] == (date(2024, 3, 1), date(2024, 3, 7))
+    assert weeks[-1] == (date(2024, 3, 15), date(2024, 3, 20))
+
+
+def test_windowed_list_games_merges_in_order_and_dedupes() -> None:
+    api, _ = _api()
+    games = api.list_games(season=2024, window="month")
+
+    assert [g.game_id for g in games] == [1, 3, 2]
+    assert games[-1].status == "Final"
+    assert games[-1].game_date == date(2024, 5, 1)
+
+
+def test_failed_window_is_retried_alone(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr("cityscape.integrations.mlb.statsapi.time.sleep", sleeps.append)
+    api, calls = _api(fail_starts={"2024-04-01": 1})
+    games = api.list_games(season=2024, window="month", window_retries=1)
+
+    assert len(games) == 3
+    assert len(sleeps) == 1
+    assert calls.count("2024-04-01") == 2
+    assert calls.count("2024-03-20") == calls.count("2024-05-01") == 1
+
+
+def test_window_failures_are_reported_together() -> None:
+    api, _ = _api(fail_starts={"2024-04-01": 5, "2024-05-01": 5})
+    with pytest.raises(ScheduleFetchError) as info:
+        api.list_games(season=2024, window="month", window_retries=1)
+    assert sorted(s for s, _ in info.value.failures) == [date(2024, 4, 1), date(2024, 5, 1)]
+
+
+def test_async_and_streaming_windows_agree() -> None:
+    api, _ = _api()
+
+    async def run() -> list:
+        try:
+            return await api.alist_games(season=2024, window="week", max_concurrency=3)
+        finally:
+            await api.aclose()
+
+    assert [g.game_id for g in asyncio.run(run())] == [1, 3, 2]
+    streamed = api.iter_games(season=2024, window="week", max_concurrency=2)
+    assert [g.game_id for g in streamed] == [1, 2, 3, 2]
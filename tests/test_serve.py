@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from cityscape.serve.cache import ResultCache
+from cityscape.serve.queries import GameQuery, _page_sql, parse_game_query
+
+
+def test_result_cache_evicts_least_recently_used_and_expires() -> None:
+    now = [0.0]
+    cache = ResultCache(max_entries=2, max_bytes=400, ttl_s=10, clock=lambda: now[0])
+    cache.put("a", b"1" * 50)
+    cache.put("b", b"2" * 50)
+    assert cache.get("a") == b"1" * 50
+    cache.put("c", b"3" * 50)  # evicts b, the least recently used
+    assert cache.get("b") is None and cache.get("c") is not None
+
+    cache.put("huge", b"x" * 101)  # over a quarter of max_bytes: not cached
+    assert cache.get("huge") is None
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats().as_dict() == {
+        "hits": 2,
+        "misses": 3,
+        "stores": 3,
+        "evictions": 1,
+        "entries": 1,
+        "size_bytes": 50,
+    }
+    assert cache.drop(lambda key: key == "c") == 1 and cache.stats().entries == 0
+
+
+def _parse(url: str) -> GameQuery:
+    parts = urlsplit(url)
+    return parse_game_query(parts.path, parse_qs(parts.query))
+
+
+def test_routes_parse_into_queries_and_pages_chain_by_cursor() -> None:
+    by_season = _parse("/v1/mlb/seasons/2024/games?limit=2")
+    assert by_season == GameQuery("mlb", season=2024, limit=2)
+    assert _parse("/v1/mlb/teams/147/games?season=2024") == GameQuery(
+        "mlb", season=2024, team_id=147
+    )
+    assert _parse("/v1/nba/games?date=2024-04-01").game_date == date(2024, 4, 1)
+
+    # `next` links round-trip into the following page's query.
+    after = (date(2024, 4, 1), "745001")
+    following = _parse(by_season.url(after=after))
+    assert following == GameQuery("mlb", season=2024, limit=2, after=after)
+    assert _parse(following.url()) == following
+
+    for bad in (
+        "/v1/mlb/games?limit=0",
+        "/v1/mlb/games?date=april",
+        "/v1/mlb/games?cursor=x",
+        "/v1/mlb/teams/yankees/games",
+        "/v1/mlb/games?team=147x",
+    ):
+        with pytest.raises(ValueError):
+            _parse(bad)
+    with pytest.raises(LookupError):
+        _parse("/v1/mlb/players")
+
+
+def test_page_sql_filters_and_fetches_one_row_past_the_page() -> None:
+    query = GameQuery("mlb", season=2024, team_id=147, limit=50, after=(None, "9"))
+    _, args = _page_sql("core.core_mlb__games", query)
+    # home_team_id/away_team_id are varchar in every league's models; an int would not compare.
+    assert args == [2024, "147", "147", "9", 51]
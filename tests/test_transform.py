@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+
+from cityscape.automations.transform.dbt import ChangeSet, build_changes, dbt_build_args
+from cityscape.utils.db import UpsertCounts
+
+
+def test_change_set_keeps_only_seasons_with_changed_rows() -> None:
+    unchanged = ChangeSet.of("mlb", 2023, [UpsertCounts(unchanged=30)])
+    assert not unchanged
+
+    changes = (
+        unchanged
+        | ChangeSet.of("mlb", 2024, [UpsertCounts(unchanged=30), UpsertCounts(updated=2)])
+        | ChangeSet.of("nba", 2024, [UpsertCounts(inserted=1)])
+        | ChangeSet.of("mlb", 2025, [UpsertCounts(inserted=5)])
+    )
+    assert changes.as_dict() == {"mlb": [2024, 2025], "nba": [2024]}
+
+
+def test_build_args_select_incremental_models_by_league_tag_and_season_vars() -> None:
+    args = dbt_build_args(["nba", "mlb"], {2025, 2024})
+    assert args[:4] == [
+        "build",
+        "--select",
+        "tag:mlb,config.materialized:incremental",
+        "tag:nba,config.materialized:incremental",
+    ]
+    assert args[4] == "--vars" and json.loads(args[5]) == {"seasons": [2024, 2025]}
+
+
+def test_nothing_changed_skips_dbt() -> None:
+    result = build_changes(ChangeSet.of("mlb", 2024, [UpsertCounts(unchanged=10)]))
+    assert result.as_dict()["status"] == "skipped" and result.invocations == ()